@@ -1,7 +1,7 @@
 """
 API для работы со статьями
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, func
 from typing import Optional
@@ -20,6 +20,9 @@ from app.schemas.article import (
     ArticleListResponse,
 )
 from app.api.deps import get_current_user, get_current_user_optional as get_optional_user
+from app.services.response_cache import ARTICLES_TAG, CachedResponse, article_tag, cached_json_response, response_cache
+from app.services.search_index import ARTICLE_DOC, schedule_delete, schedule_index
+from app.services.view_counter import ARTICLE_VIEWS, view_counter
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +63,7 @@ def generate_slug(title: str) -> str:
 
 @router.get("", response_model=ArticleListResponse)
 def get_articles(
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
@@ -75,11 +79,21 @@ def get_articles(
     - search: поиск по заголовку
     - published_only: показывать только опубликованные (для гостей всегда True)
     """
+    # Публичный список (только опубликованные) одинаков для всех - кешируем
+    public_only = published_only or not current_user or current_user.role == UserRole.USER
+    if public_only:
+        cache_key = response_cache.make_key(
+            "articles:list", {"page": page, "per_page": per_page, "search": search}, [ARTICLES_TAG]
+        )
+        cached = response_cache.get(cache_key)
+        if cached:
+            return cached_json_response(cached, request)
+    
     # Базовый запрос
     query = db.query(Article).options(joinedload(Article.author))
     
     # Фильтр по статусу публикации
-    if published_only or not current_user or current_user.role == UserRole.USER:
+    if public_only:
         query = query.filter(Article.is_published == True)
     
     # Поиск
@@ -99,24 +113,42 @@ def get_articles(
     # Формирование ответа
     total_pages = (total + per_page - 1) // per_page
     
-    return {
+    payload = {
         'articles': articles,
         'total': total,
         'page': page,
         'per_page': per_page,
         'total_pages': total_pages,
     }
+    
+    if not public_only:
+        return payload
+    
+    body = ArticleListResponse.model_validate(payload, from_attributes=True).model_dump(mode='json')
+    return cached_json_response(response_cache.set(cache_key, body), request)
 
 
 @router.get("/{slug}", response_model=ArticleResponse)
 def get_article(
     slug: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """
     Получить статью по slug
     """
+    cache_key = response_cache.make_key("articles:detail", {"slug": slug}, [article_tag(slug)])
+    cached = response_cache.get(cache_key)
+    if cached:
+        # В кеше тело без views: просмотры = сохраненные в БД + накопленные в Redis
+        article_id = cached.body['id']
+        stored = db.query(Article.views).filter(Article.id == article_id).first()
+        if stored:
+            pending_views = view_counter.hit(ARTICLE_VIEWS, article_id)
+            body = {**cached.body, 'views': (stored.views or 0) + pending_views}
+            return cached_json_response(CachedResponse(body=body, etag=cached.etag), request)
+    
     article = db.query(Article).options(
         joinedload(Article.author)
     ).filter(Article.slug == slug).first()
@@ -129,16 +161,25 @@ def get_article(
         if not current_user or current_user.role == UserRole.USER:
             raise HTTPException(status_code=404, detail="Стаття не знайдена")
     
-    # Увеличиваем счетчик просмотров
-    article.views += 1
-    db.commit()
+    # Просмотр учитывается в Redis, в БД переносится задачей flush_view_counters_task
+    pending_views = view_counter.hit(ARTICLE_VIEWS, article.id)
     
-    return article
+    body = ArticleResponse.model_validate(article).model_dump(mode='json')
+    views = (article.views or 0) + pending_views
+    
+    if not article.is_published:
+        return {**body, 'views': views}
+    
+    # В кеше только опубликованные статьи (доступны всем), views не кешируется
+    body.pop('views', None)
+    entry = response_cache.set(cache_key, body)
+    return cached_json_response(CachedResponse(body={**body, 'views': views}, etag=entry.etag), request)
 
 
 @router.post("", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED)
 def create_article(
     article_data: ArticleCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -185,6 +226,9 @@ def create_article(
         joinedload(Article.author)
     ).filter(Article.id == new_article.id).first()
     
+    response_cache.invalidate(ARTICLES_TAG)
+    background_tasks.add_task(schedule_index, ARTICLE_DOC, [new_article.id])
+    
     logger.info(f"✅ Article created: {new_article.slug} by user_id={current_user.id}")
     
     return new_article
@@ -194,6 +238,7 @@ def create_article(
 def update_article(
     article_id: int,
     article_data: ArticleUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -214,6 +259,8 @@ def update_article(
             detail="Ви можете редагувати тільки свої статті"
         )
     
+    old_slug = article.slug
+    
     # Обновление полей
     if article_data.title is not None:
         article.title = article_data.title
@@ -255,6 +302,9 @@ def update_article(
         joinedload(Article.author)
     ).filter(Article.id == article.id).first()
     
+    response_cache.invalidate(ARTICLES_TAG, article_tag(old_slug), article_tag(article.slug))
+    background_tasks.add_task(schedule_index, ARTICLE_DOC, [article.id])
+    
     logger.info(f"✅ Article updated: {article.slug} by user_id={current_user.id}")
     
     return article
@@ -263,6 +313,7 @@ def update_article(
 @router.delete("/{article_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_article(
     article_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -281,8 +332,12 @@ def delete_article(
     if not article:
         raise HTTPException(status_code=404, detail="Стаття не знайдена")
     
-    logger.info(f"🗑️ Article deleted: {article.slug} by user_id={current_user.id}")
+    slug = article.slug
+    logger.info(f"🗑️ Article deleted: {slug} by user_id={current_user.id}")
     
     db.delete(article)
     db.commit()
+    
+    response_cache.invalidate(ARTICLES_TAG, article_tag(slug))
+    background_tasks.add_task(schedule_delete, ARTICLE_DOC, [article_id])
 
@@ -1,15 +1,19 @@
 """
 API endpoints для календаря бухгалтерских отчетов
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from datetime import date
 from typing import Optional
 import logging
 
 from app.schemas.calendar import (
     CalendarResponse,
+    CalendarMonthResponse,
     AvailablePeriodsResponse
 )
 from app.services.calendar_service import calendar_service
+from app.services.calendar_repository import calendar_repository
+from app.services.response_cache import cached_json_response, response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -17,17 +21,30 @@ router = APIRouter(prefix="/api/calendar", tags=["calendar"])
 
 
 @router.get("/", response_model=CalendarResponse)
-async def get_calendar():
+async def get_calendar(
+    request: Request,
+    date_from: Optional[date] = Query(None, alias="from", description="Начальная дата (YYYY-MM-DD), включительно"),
+    date_to: Optional[date] = Query(None, alias="to", description="Конечная дата (YYYY-MM-DD), включительно"),
+    type: Optional[str] = Query(None, description="Тип отчета (Статистика, Сплата, ДПС, ...)"),
+    who: Optional[str] = Query(None, description="Категория плательщика (ФОП 1 група, Юридичні особи, ...)"),
+):
     """
-    Получить все события календаря бухгалтерских отчетов
+    Получить события календаря бухгалтерских отчетов
+    
+    **Параметры (опциональные):**
+    - `from` / `to`: диапазон дат
+    - `type`: тип отчета
+    - `who`: категория плательщика
     
     **Возвращает:**
-    - Список всех событий календаря до конца 2025 года
+    - Без фильтров - все события календаря в порядке файла
+    - С фильтрами - только подходящие события по возрастанию даты
     - Поле `who` теперь массив категорий
+    - Заголовок ETag; при совпадении If-None-Match - 304 Not Modified
     
     **Пример запроса:**
     ```
-    GET /api/calendar/
+    GET /api/calendar/?from=2025-11-01&to=2025-11-30&who=ФОП 1 група
     ```
     
     **Пример ответа:**
@@ -46,15 +63,37 @@ async def get_calendar():
     ```
     """
     try:
-        logger.info("Fetching all calendar events")
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(status_code=400, detail="Параметр from не може бути пізніше to")
         
-        events = calendar_service.get_all_calendar_events()
+        # Ключ зависит от версии файла: после обновления данных ETag меняется
+        cache_key = response_cache.make_key("calendar:events", {
+            "version": calendar_service.get_data_version(),
+            "from": date_from,
+            "to": date_to,
+            "type": type,
+            "who": who,
+        })
+        cached = await response_cache.aget(cache_key)
+        if cached:
+            return cached_json_response(cached, request)
+        
+        if date_from or date_to or type or who:
+            logger.info(f"Fetching calendar events: from={date_from}, to={date_to}, type={type}, who={who}")
+            events = calendar_repository.find_events(date_from, date_to, who=who, type=type)
+        else:
+            logger.info("Fetching all calendar events")
+            events = calendar_service.get_all_calendar_events()
         
-        return CalendarResponse(
+        body = CalendarResponse(
             events=events,
             total=len(events)
-        )
+        ).model_dump(mode='json')
+        
+        return cached_json_response(await response_cache.aset(cache_key, body), request)
         
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         logger.warning(f"Calendar file not found: {e}")
         raise HTTPException(
@@ -75,13 +114,64 @@ async def get_calendar():
         )
 
 
+@router.get("/months/{year}/{month}", response_model=CalendarMonthResponse)
+async def get_calendar_month(
+    request: Request,
+    year: int = Path(..., ge=2020, le=2100, description="Год"),
+    month: int = Path(..., ge=1, le=12, description="Месяц (1-12)"),
+):
+    """
+    Получить события одного месяца
+    
+    События берутся из индекса по месяцам, без просмотра всего календаря.
+    
+    **Пример запроса:**
+    ```
+    GET /api/calendar/months/2025/11
+    ```
+    """
+    try:
+        cache_key = response_cache.make_key("calendar:month", {
+            "version": calendar_service.get_data_version(),
+            "year": year,
+            "month": month,
+        })
+        cached = await response_cache.aget(cache_key)
+        if cached:
+            return cached_json_response(cached, request)
+        
+        events = calendar_repository.events_in_month(year, month)
+        
+        body = CalendarMonthResponse(
+            year=year,
+            month=month,
+            events=events,
+            total=len(events)
+        ).model_dump(mode='json')
+        
+        return cached_json_response(await response_cache.aset(cache_key, body), request)
+        
+    except FileNotFoundError as e:
+        logger.warning(f"Calendar file not found: {e}")
+        raise HTTPException(
+            status_code=404,
+            detail="Файл календаря не знайдено"
+        )
+    except ValueError as e:
+        logger.error(f"Invalid calendar data: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Помилка завантаження календаря: {str(e)}"
+        )
+
+
 @router.get("/available-months", response_model=AvailablePeriodsResponse)
 async def get_available_months():
     """
     Получить список доступных месяцев/годов в календаре
     
     **Возвращает:**
-    - Список объектов с полями `month` и `year`
+    - Список объектов с полями `month` и `year` (месяцы, в которых есть события)
     - Отсортирован по дате (от старых к новым)
     
     **Пример ответа:**
@@ -1,12 +1,17 @@
 """
 API для форума
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, or_
-from typing import List, Optional
+from sqlalchemy import Float, and_, cast, func, desc, literal, null, or_, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
+import base64
+import html
+import json
 import logging
+import re
 
 from app.db.database import get_db
 from app.models.user import User
@@ -27,6 +32,7 @@ from app.schemas.forum import (
     ForumPostCreate,
     ForumPostUpdate,
     ForumPostResponse,
+    ForumPostPageResponse,
     ForumLikeToggleResponse,
     ForumThreadAuthor,
     ForumPostAuthor,
@@ -34,9 +40,30 @@ from app.schemas.forum import (
 )
 from app.api.deps import get_current_user, get_current_user_optional
 from app.core.deps import get_current_moderator
+from app.services.forum_service import forum_service
+from app.services.response_cache import FORUM_CATEGORIES_TAG, cached_json_response, response_cache
+from app.services.search_index import POST_DOC, THREAD_DOC, UKRAINIAN_STOPWORDS, schedule_delete, schedule_index
+from app.services.view_counter import THREAD_VIEWS, view_counter
 
 router = APIRouter(prefix="/api/forum", tags=["forum"])
 
+# Ответов на каждый комментарий в первой странице GET /threads/{id}
+THREAD_INLINE_REPLIES = 3
+
+# Полнотекстовый поиск: конфигурация должна совпадать с триггерами search_vector
+FORUM_SEARCH_CONFIG = "simple"
+# ts_headline выделяет совпадения маркерами (символы Private Use Area): после
+# HTML-экранирования текста комментария они заменяются на <b>/</b>
+SEARCH_HEADLINE_START = "\ue000"
+SEARCH_HEADLINE_STOP = "\ue001"
+SEARCH_HEADLINE_OPTIONS = (
+    f"StartSel={SEARCH_HEADLINE_START}, StopSel={SEARCH_HEADLINE_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+)
+SEARCH_TERM_RE = re.compile(r"\w+")
+SEARCH_MAX_TERMS = 8
+SEARCH_MIN_TERM_LENGTH = 3
+SEARCH_STOPWORDS = frozenset(UKRAINIAN_STOPWORDS)
+
 
 # ========== Вспомогательные функции ==========
 
@@ -52,54 +79,286 @@ def get_blocked_user_ids(current_user_id: Optional[int], db: Session) -> List[in
     return [blocked_id[0] for blocked_id in blocked_ids]
 
 
-def build_post_tree(posts: List[ForumPost], parent_id: Optional[int], current_user_id: Optional[int], db: Session) -> List[dict]:
-    """Рекурсивно строим дерево комментариев"""
-    result = []
+def get_post_likes(db: Session, current_user_id: Optional[int], *criteria) -> Tuple[Dict[int, int], Set[int]]:
+    """
+    Лайки комментариев двумя агрегирующими запросами
+    
+    Args:
+        db: Сессия БД
+        current_user_id: ID текущего пользователя (None - аноним)
+        criteria: Условия на ForumPost/ForumLike (топик или список комментариев)
+    
+    Returns:
+        ({post_id: likes_count}, {post_id, лайкнутые текущим пользователем})
+    """
+    likes_count = dict(
+        db.query(ForumLike.post_id, func.count(ForumLike.id))
+        .join(ForumPost, ForumPost.id == ForumLike.post_id)
+        .filter(*criteria)
+        .group_by(ForumLike.post_id)
+        .all()
+    )
+    
+    liked = set()
+    if current_user_id:
+        liked = {
+            post_id for (post_id,) in
+            db.query(ForumLike.post_id)
+            .join(ForumPost, ForumPost.id == ForumLike.post_id)
+            .filter(*criteria, ForumLike.user_id == current_user_id)
+            .all()
+        }
     
+    return likes_count, liked
+
+
+def get_replies_count(db: Session, post_ids: List[int]) -> Dict[int, int]:
+    """Количество прямых ответов на комментарии (индекс ix_forum_posts_parent)"""
+    if not post_ids:
+        return {}
+    
+    return dict(
+        db.query(ForumPost.parent_id, func.count(ForumPost.id))
+        .filter(ForumPost.parent_id.in_(post_ids))
+        .group_by(ForumPost.parent_id)
+        .all()
+    )
+
+
+def post_to_dict(post: ForumPost, likes_count: Dict[int, int], liked: Set[int]) -> dict:
+    """Комментарий в формате ForumPostResponse (без replies)"""
+    return {
+        "id": post.id,
+        "thread_id": post.thread_id,
+        "user_id": post.user_id,
+        "parent_id": post.parent_id,
+        "content": post.content,
+        "created_at": post.created_at,
+        "updated_at": post.updated_at,
+        "edited_at": post.edited_at,
+        "author": {
+            "id": post.user.id,
+            "full_name": post.user.full_name,
+        } if post.user else None,
+        "likes_count": likes_count.get(post.id, 0),
+        "is_liked_by_user": post.id in liked,
+        "replies": [],
+    }
+
+
+def build_post_tree(posts: List[ForumPost], likes_count: Dict[int, int], liked: Set[int]) -> List[dict]:
+    """
+    Строим дерево комментариев за один проход, O(n)
+    
+    Args:
+        posts: Комментарии топика, отсортированные по created_at
+        likes_count: Количество лайков по post_id
+        liked: post_id, лайкнутые текущим пользователем
+    
+    Returns:
+        Комментарии верхнего уровня с вложенными replies (порядок сохраняется)
+    """
+    nodes = {post.id: post_to_dict(post, likes_count, liked) for post in posts}
+    
+    roots = []
     for post in posts:
-        if post.parent_id == parent_id:
-            # Получаем количество лайков
-            likes_count = len(post.likes)
-            
-            # Проверяем, лайкнул ли текущий пользователь
-            is_liked = False
-            if current_user_id:
-                is_liked = any(like.user_id == current_user_id for like in post.likes)
-            
-            # Рекурсивно получаем дочерние комментарии
-            replies = build_post_tree(posts, post.id, current_user_id, db)
-            
-            post_dict = {
-                "id": post.id,
-                "thread_id": post.thread_id,
-                "user_id": post.user_id,
-                "parent_id": post.parent_id,
-                "content": post.content,
-                "created_at": post.created_at,
-                "updated_at": post.updated_at,
-                "edited_at": post.edited_at,
-                "author": {
-                    "id": post.user.id,
-                    "full_name": post.user.full_name,
-                } if post.user else None,
-                "likes_count": likes_count,
-                "is_liked": is_liked,
-                "replies": replies,
-            }
-            result.append(post_dict)
-    
-    return result
+        node = nodes[post.id]
+        if post.parent_id is None:
+            roots.append(node)
+        elif post.parent_id in nodes:
+            nodes[post.parent_id]["replies"].append(node)
+        # Ответы на отсутствующий комментарий не отображаются
+    
+    for node in nodes.values():
+        node["replies_count"] = len(node["replies"])
+    
+    return roots
+
+
+def encode_post_cursor(post: ForumPost) -> str:
+    """Непрозрачный курсор на позицию (created_at, id) последнего комментария страницы"""
+    data = {
+        "c": post.created_at.isoformat() if post.created_at else None,
+        "id": post.id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def after_post_cursor(cursor: str):
+    """Условие "после курсора" для сортировки created_at ASC, id ASC"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(data["c"]) if data["c"] else None
+        post_id = int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    if created_at is None:
+        return ForumPost.id > post_id
+    
+    return tuple_(ForumPost.created_at, ForumPost.id) > tuple_(created_at, post_id)
+
+
+def get_posts_page(db: Session, query, cursor: Optional[str], limit: int) -> Tuple[List[ForumPost], Optional[str]]:
+    """
+    Страница комментариев по курсору в порядке created_at, id
+    
+    Returns:
+        (комментарии страницы, курсор следующей страницы или None)
+    """
+    if cursor:
+        query = query.filter(after_post_cursor(cursor))
+    
+    posts = (
+        query.options(joinedload(ForumPost.user))
+        .order_by(ForumPost.created_at, ForumPost.id)
+        .limit(limit + 1)
+        .all()
+    )
+    
+    next_cursor = encode_post_cursor(posts[limit - 1]) if len(posts) > limit else None
+    return posts[:limit], next_cursor
+
+
+def build_tsquery(q: str) -> str:
+    """
+    tsquery из пользовательского запроса: слова через AND, каждое как префикс
+    
+    Префиксы частично компенсируют отсутствие морфологии для украинского
+    (конфигурация 'simple' не приводит слова к основе). Стоп-слова и слова
+    короче SEARCH_MIN_TERM_LENGTH отбрасываются: префиксы "на:*", "3:*"
+    совпадают почти со всем. Если остались только короткие слова
+    (например "ЄП"), они ищутся точно, без префикса.
+    """
+    words = [w for w in SEARCH_TERM_RE.findall(q.lower()) if w not in SEARCH_STOPWORDS]
+    terms = [f"{w}:*" for w in words if len(w) >= SEARCH_MIN_TERM_LENGTH]
+    if not terms:
+        terms = words
+    return " & ".join(terms[:SEARCH_MAX_TERMS])
+
+
+def render_headline(headline: Optional[str]) -> Optional[str]:
+    """HTML-экранированный фрагмент ts_headline с подсветкой <b>...</b>"""
+    if headline is None:
+        return None
+    return (
+        html.escape(headline)
+        .replace(SEARCH_HEADLINE_START, "<b>")
+        .replace(SEARCH_HEADLINE_STOP, "</b>")
+    )
+
+
+def encode_search_cursor(row) -> str:
+    """Непрозрачный курсор на позицию (rank, type, id) последнего результата страницы"""
+    data = {"r": row.rank, "t": row.type, "id": row.id}
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str, int]:
+    """Разобрать курсор из encode_search_cursor()"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(data["r"]), str(data["t"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_thread_posts_page(
+    db: Session,
+    thread_id: int,
+    cursor: Optional[str],
+    limit: int,
+    replies_limit: int,
+    current_user_id: Optional[int],
+) -> dict:
+    """
+    Страница комментариев верхнего уровня топика с первыми ответами
+
+    Returns:
+        {"items": деревья комментариев, "next_cursor": курсор или None}
+    """
+    # Комментарии верхнего уровня (индекс ix_forum_posts_thread_created)
+    posts, next_cursor = get_posts_page(
+        db,
+        db.query(ForumPost).filter(ForumPost.thread_id == thread_id, ForumPost.parent_id.is_(None)),
+        cursor,
+        limit,
+    )
+    post_ids = [post.id for post in posts]
+    
+    # Первые replies_limit ответов каждого комментария (индекс ix_forum_posts_parent)
+    replies = []
+    if post_ids and replies_limit:
+        row_number = func.row_number().over(
+            partition_by=ForumPost.parent_id,
+            order_by=(ForumPost.created_at, ForumPost.id)
+        ).label("row_number")
+        ranked = (
+            db.query(ForumPost.id.label("id"), row_number)
+            .filter(ForumPost.parent_id.in_(post_ids))
+            .subquery()
+        )
+        replies = (
+            db.query(ForumPost)
+            .options(joinedload(ForumPost.user))
+            .join(ranked, ranked.c.id == ForumPost.id)
+            .filter(ranked.c.row_number <= replies_limit)
+            .order_by(ForumPost.created_at, ForumPost.id)
+            .all()
+        )
+    
+    all_ids = post_ids + [reply.id for reply in replies]
+    replies_count = get_replies_count(db, all_ids)
+    likes_count, liked = get_post_likes(db, current_user_id, ForumPost.id.in_(all_ids)) if all_ids else ({}, set())
+    
+    items = {}
+    for post in posts:
+        items[post.id] = post_to_dict(post, likes_count, liked)
+        items[post.id]["replies_count"] = replies_count.get(post.id, 0)
+    for reply in replies:
+        node = post_to_dict(reply, likes_count, liked)
+        node["replies_count"] = replies_count.get(reply.id, 0)
+        items[reply.parent_id]["replies"].append(node)
+    
+    return {
+        "items": list(items.values()),
+        "next_cursor": next_cursor,
+    }
+
+
+def get_post_subtree_ids(db: Session, post_id: int) -> List[int]:
+    """
+    ID комментария и всех вложенных ответов (рекурсивный CTE)
+
+    Нужно до удаления: каскад удаляет ответы из БД, а из поискового
+    индекса их убираем по этому списку.
+    """
+    subtree = select(ForumPost.id).where(ForumPost.id == post_id).cte("subtree", recursive=True)
+    subtree = subtree.union_all(
+        select(ForumPost.id).where(ForumPost.parent_id == subtree.c.id)
+    )
+    return list(db.execute(select(subtree.c.id)).scalars())
 
 
 # ========== Categories Endpoints ==========
 
 @router.get("/categories", response_model=List[ForumCategoryResponse])
 def get_categories(
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Получить список всех категорий форума
+    
+    Ответ кешируется (сбрасывается при создании/удалении топиков), отдается с ETag.
     """
+    cache_key = response_cache.make_key("forum:categories", tags=[FORUM_CATEGORIES_TAG])
+    cached = response_cache.get(cache_key)
+    if cached:
+        return cached_json_response(cached, request)
+    
     categories = db.query(ForumCategory).order_by(ForumCategory.order, ForumCategory.name).all()
     
     # Добавляем количество топиков для каждой категории
@@ -110,7 +369,8 @@ def get_categories(
         category_dict["threads_count"] = threads_count
         result.append(category_dict)
     
-    return result
+    body = [ForumCategoryResponse.model_validate(item).model_dump(mode='json') for item in result]
+    return cached_json_response(response_cache.set(cache_key, body), request)
 
 
 # ========== Threads Endpoints ==========
@@ -137,38 +397,14 @@ def get_threads(
     
     # Сортировка
     if sort == ThreadSortType.NEW:
-        query = query.order_by(desc(ForumThread.is_pinned), desc(ForumThread.created_at))
+        query = query.order_by(desc(ForumThread.is_pinned), desc(ForumThread.created_at), desc(ForumThread.id))
     elif sort == ThreadSortType.HOT:
-        # Горячие - много комментариев за последнее время
-        posts_count_subquery = (
-            db.query(
-                ForumPost.thread_id,
-                func.count(ForumPost.id).label("posts_count")
-            )
-            .group_by(ForumPost.thread_id)
-            .subquery()
-        )
-        query = (
-            query
-            .outerjoin(posts_count_subquery, ForumThread.id == posts_count_subquery.c.thread_id)
-            .order_by(desc(ForumThread.is_pinned), desc(posts_count_subquery.c.posts_count))
-        )
+        # Горячие - больше всего комментариев (индекс ix_forum_threads_hot),
+        # id - уникальный tie-breaker, чтобы страницы не пересекались
+        query = query.order_by(desc(ForumThread.is_pinned), desc(ForumThread.posts_count), desc(ForumThread.id))
     elif sort == ThreadSortType.UNANSWERED:
-        # Топики без ответов
-        posts_count_subquery = (
-            db.query(
-                ForumPost.thread_id,
-                func.count(ForumPost.id).label("posts_count")
-            )
-            .group_by(ForumPost.thread_id)
-            .subquery()
-        )
-        query = (
-            query
-            .outerjoin(posts_count_subquery, ForumThread.id == posts_count_subquery.c.thread_id)
-            .filter(or_(posts_count_subquery.c.posts_count == None, posts_count_subquery.c.posts_count == 0))
-            .order_by(desc(ForumThread.created_at))
-        )
+        # Топики без ответов (индекс ix_forum_threads_posts_count_created)
+        query = query.filter(ForumThread.posts_count == 0).order_by(desc(ForumThread.created_at), desc(ForumThread.id))
     
     # Подсчет общего количества
     total = query.count()
@@ -176,12 +412,9 @@ def get_threads(
     # Pagination
     threads = query.offset(offset).limit(limit).all()
     
-    # Формируем ответ с дополнительными данными
+    # Формируем ответ (счетчики денормализованы в forum_threads)
     items = []
     for thread in threads:
-        posts_count = db.query(func.count(ForumPost.id)).filter(ForumPost.thread_id == thread.id).scalar() or 0
-        last_post = db.query(ForumPost).filter(ForumPost.thread_id == thread.id).order_by(desc(ForumPost.created_at)).first()
-        
         item = {
             "id": thread.id,
             "category_id": thread.category_id,
@@ -195,8 +428,9 @@ def get_threads(
                 "full_name": thread.user.full_name,
                 "email": thread.user.email,
             } if thread.user else None,
-            "posts_count": posts_count,
-            "last_post_at": last_post.created_at if last_post else None,
+            "posts_count": thread.posts_count,
+            "likes_count": thread.likes_count,
+            "last_post_at": thread.last_post_at,
         }
         items.append(item)
     
@@ -211,11 +445,21 @@ def get_threads(
 @router.get("/threads/{thread_id}", response_model=ForumThreadResponse)
 def get_thread(
     thread_id: int,
+    include_posts: bool = Query(True, description="Включить комментарии"),
+    posts_limit: Optional[int] = Query(
+        None, ge=1, le=100,
+        description="Вернуть только первую страницу комментариев этого размера (по умолчанию - все)"
+    ),
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """
     Получить детали топика со всеми комментариями (древовидная структура)
+    
+    С posts_limit возвращаются только первые posts_limit комментариев
+    верхнего уровня с первыми ответами (как GET /threads/{thread_id}/posts),
+    следующие страницы - по posts_next_cursor через GET /threads/{thread_id}/posts.
+    При include_posts=false возвращается только топик.
     """
     thread = db.query(ForumThread).options(
         joinedload(ForumThread.user),
@@ -225,22 +469,22 @@ def get_thread(
     if not thread:
         raise HTTPException(status_code=404, detail="Топик не найден")
     
-    # Увеличиваем счетчик просмотров
-    thread.views += 1
-    db.commit()
-    
-    # Получаем все комментарии с автором и лайками
-    posts = db.query(ForumPost).options(
-        joinedload(ForumPost.user),
-        joinedload(ForumPost.likes)
-    ).filter(ForumPost.thread_id == thread_id).order_by(ForumPost.created_at).all()
-    
-    # Строим дерево комментариев
-    current_user_id = current_user.id if current_user else None
-    posts_tree = build_post_tree(posts, None, current_user_id, db)
-    
-    # Подсчет лайков для всего топика
-    total_likes = db.query(func.count(ForumLike.id)).join(ForumPost).filter(ForumPost.thread_id == thread_id).scalar() or 0
+    # Просмотр учитывается в Redis, в БД переносится задачей flush_view_counters_task
+    views = (thread.views or 0) + view_counter.hit(THREAD_VIEWS, thread.id)
+    
+    posts_page = {"items": [], "next_cursor": None}
+    if include_posts:
+        current_user_id = current_user.id if current_user else None
+        if posts_limit:
+            posts_page = get_thread_posts_page(db, thread_id, None, posts_limit, THREAD_INLINE_REPLIES, current_user_id)
+        else:
+            # Получаем все комментарии с автором (лайки - отдельными агрегатами)
+            posts = db.query(ForumPost).options(
+                joinedload(ForumPost.user)
+            ).filter(ForumPost.thread_id == thread_id).order_by(ForumPost.created_at, ForumPost.id).all()
+            
+            likes_count, liked = get_post_likes(db, current_user_id, ForumPost.thread_id == thread_id)
+            posts_page["items"] = build_post_tree(posts, likes_count, liked)
     
     return {
         "id": thread.id,
@@ -248,7 +492,7 @@ def get_thread(
         "user_id": thread.user_id,
         "title": thread.title,
         "content": thread.content,
-        "views": thread.views,
+        "views": views,
         "is_pinned": thread.is_pinned,
         "is_closed": thread.is_closed,
         "created_at": thread.created_at,
@@ -259,15 +503,80 @@ def get_thread(
             "email": thread.user.email,
         } if thread.user else None,
         "category_name": thread.category.name if thread.category else None,
-        "posts_count": len(posts),
-        "likes_count": total_likes,
-        "posts": posts_tree,
+        "posts_count": thread.posts_count,
+        "likes_count": thread.likes_count,
+        "posts": posts_page["items"],
+        "posts_next_cursor": posts_page["next_cursor"],
+    }
+
+
+@router.get("/threads/{thread_id}/posts", response_model=ForumPostPageResponse)
+def get_thread_posts(
+    thread_id: int,
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor предыдущей страницы"),
+    limit: int = Query(20, ge=1, le=100),
+    replies_limit: int = Query(3, ge=0, le=20, description="Сколько первых ответов вернуть для каждого комментария"),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Комментарии верхнего уровня топика постранично (курсор по created_at, id)
+    
+    Каждый комментарий содержит первые replies_limit прямых ответов и
+    replies_count. Остальные ответы - GET /posts/{post_id}/replies.
+    Количество запросов не зависит от размера топика.
+    """
+    if not db.query(ForumThread.id).filter(ForumThread.id == thread_id).first():
+        raise HTTPException(status_code=404, detail="Топик не найден")
+    
+    current_user_id = current_user.id if current_user else None
+    return get_thread_posts_page(db, thread_id, cursor, limit, replies_limit, current_user_id)
+
+
+@router.get("/posts/{post_id}/replies", response_model=ForumPostPageResponse)
+def get_post_replies(
+    post_id: int,
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor предыдущей страницы"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Прямые ответы на комментарий постранично (курсор по created_at, id)
+    
+    У каждого ответа есть replies_count для дальнейшей подгрузки.
+    """
+    if not db.query(ForumPost.id).filter(ForumPost.id == post_id).first():
+        raise HTTPException(status_code=404, detail="Комментарий не найден")
+    
+    replies, next_cursor = get_posts_page(
+        db,
+        db.query(ForumPost).filter(ForumPost.parent_id == post_id),
+        cursor,
+        limit,
+    )
+    reply_ids = [reply.id for reply in replies]
+    
+    replies_count = get_replies_count(db, reply_ids)
+    current_user_id = current_user.id if current_user else None
+    likes_count, liked = get_post_likes(db, current_user_id, ForumPost.id.in_(reply_ids)) if reply_ids else ({}, set())
+    
+    items = []
+    for reply in replies:
+        node = post_to_dict(reply, likes_count, liked)
+        node["replies_count"] = replies_count.get(reply.id, 0)
+        items.append(node)
+    
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
     }
 
 
 @router.post("/threads", response_model=ForumThreadResponse, status_code=status.HTTP_201_CREATED)
 async def create_thread(
     thread_data: ForumThreadCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -326,6 +635,10 @@ async def create_thread(
     moderation_log.content_id = new_thread.id
     db.commit()
     
+    # Изменилось количество топиков в категории
+    response_cache.invalidate(FORUM_CATEGORIES_TAG)
+    background_tasks.add_task(schedule_index, THREAD_DOC, [new_thread.id])
+    
     # Загружаем связи
     new_thread = db.query(ForumThread).options(
         joinedload(ForumThread.user),
@@ -358,6 +671,7 @@ async def create_thread(
 def update_thread(
     thread_id: int,
     thread_data: ForumThreadUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -382,6 +696,7 @@ def update_thread(
     thread.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(thread)
+    background_tasks.add_task(schedule_index, THREAD_DOC, [thread.id])
     
     # Загружаем связи
     thread = db.query(ForumThread).options(
@@ -389,9 +704,6 @@ def update_thread(
         joinedload(ForumThread.category)
     ).filter(ForumThread.id == thread_id).first()
     
-    posts_count = db.query(func.count(ForumPost.id)).filter(ForumPost.thread_id == thread_id).scalar() or 0
-    likes_count = db.query(func.count(ForumLike.id)).join(ForumPost).filter(ForumPost.thread_id == thread_id).scalar() or 0
-    
     return {
         "id": thread.id,
         "category_id": thread.category_id,
@@ -409,14 +721,15 @@ def update_thread(
             "email": thread.user.email,
         },
         "category_name": thread.category.name,
-        "posts_count": posts_count,
-        "likes_count": likes_count,
+        "posts_count": thread.posts_count,
+        "likes_count": thread.likes_count,
     }
 
 
 @router.delete("/threads/{thread_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_thread(
     thread_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -434,6 +747,9 @@ def delete_thread(
     
     db.delete(thread)
     db.commit()
+    
+    response_cache.invalidate(FORUM_CATEGORIES_TAG)
+    background_tasks.add_task(schedule_delete, THREAD_DOC, [thread_id])
 
 
 # ========== Posts Endpoints ==========
@@ -441,6 +757,7 @@ def delete_thread(
 @router.post("/posts", response_model=ForumPostResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(
     post_data: ForumPostCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -506,8 +823,9 @@ async def create_post(
     
     db.add(new_post)
     
-    # 6. Обновляем время последнего обновления топика
+    # 6. Обновляем время последнего обновления топика и счетчики (в той же транзакции)
     thread.updated_at = datetime.utcnow()
+    forum_service.post_created(db, thread.id)
     
     db.commit()
     db.refresh(new_post)
@@ -515,6 +833,7 @@ async def create_post(
     # 7. Обновляем moderation_log с content_id
     moderation_log.content_id = new_post.id
     db.commit()
+    background_tasks.add_task(schedule_index, POST_DOC, [new_post.id])
     
     # Явно строим ответ
     return {
@@ -541,6 +860,7 @@ async def create_post(
 def update_post(
     post_id: int,
     post_data: ForumPostUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -563,6 +883,7 @@ def update_post(
     
     db.commit()
     db.refresh(post)
+    background_tasks.add_task(schedule_index, POST_DOC, [post.id])
     
     likes_count = len(post.likes) if post.likes else 0
     is_liked = any(like.user_id == current_user.id for like in post.likes) if post.likes else False
@@ -591,6 +912,7 @@ def update_post(
 @router.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_post(
     post_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -606,8 +928,13 @@ def delete_post(
     if post.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Вы можете удалять только свои комментарии")
     
+    thread_id = post.thread_id
+    post_ids = get_post_subtree_ids(db, post_id)
     db.delete(post)
+    db.flush()
+    forum_service.refresh_thread_counters(db, [thread_id])
     db.commit()
+    background_tasks.add_task(schedule_delete, POST_DOC, post_ids)
 
 
 # ========== Likes Endpoints ==========
@@ -635,8 +962,13 @@ def toggle_like(
     ).first()
     
     if existing_like:
-        # Удаляем лайк
-        db.delete(existing_like)
+        # Удаляем лайк; счетчик уменьшаем, только если строку удалили мы,
+        # а не параллельный запрос
+        deleted = db.query(ForumLike).filter(
+            ForumLike.id == existing_like.id
+        ).delete(synchronize_session=False)
+        if deleted:
+            forum_service.like_toggled(db, post.thread_id, -1)
         db.commit()
         liked = False
     else:
@@ -648,6 +980,8 @@ def toggle_like(
         db.add(new_like)
         
         try:
+            db.flush()
+            forum_service.like_toggled(db, post.thread_id, 1)
             db.commit()
             liked = True
         except IntegrityError:
@@ -674,65 +1008,106 @@ def toggle_like(
 @router.get("/search")
 def search_forum(
     q: str = Query(..., min_length=2, description="Поисковый запрос"),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor предыдущей страницы"),
+    limit: int = Query(20, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
     """
-    Поиск по топикам и комментариям
-    Простой поиск через SQL LIKE (для полноценного поиска нужен Elasticsearch)
-    """
-    search_pattern = f"%{q}%"
+    Полнотекстовый поиск по топикам и комментариям
     
-    # Поиск в топиках
-    threads = db.query(ForumThread).options(joinedload(ForumThread.user)).filter(
-        or_(
-            ForumThread.title.ilike(search_pattern),
-            ForumThread.content.ilike(search_pattern)
+    Поиск по search_vector (GIN индексы, заполняются триггерами), каждое слово
+    запроса ищется как префикс. Результаты ранжируются по ts_rank, фрагмент с
+    подсветкой (<b>...</b>, остальной текст HTML-экранирован) - в поле headline.
+    Пагинация по курсору.
+    """
+    ts_query_text = build_tsquery(q)
+    if not ts_query_text:
+        return {"items": [], "total": 0, "next_cursor": None}
+    
+    config = cast(FORUM_SEARCH_CONFIG, REGCONFIG)
+    ts_query = func.to_tsquery(config, ts_query_text)
+    
+    # Топики и комментарии одним ранжированным списком
+    threads = (
+        select(
+            literal("thread").label("type"),
+            ForumThread.id.label("id"),
+            null().label("thread_id"),
+            ForumThread.title.label("title"),
+            ForumThread.content.label("content"),
+            ForumThread.created_at.label("created_at"),
+            ForumThread.user_id.label("user_id"),
+            cast(func.ts_rank(ForumThread.search_vector, ts_query), Float).label("rank"),
         )
-    ).limit(10).all()
-    
-    # Поиск в комментариях
-    posts = db.query(ForumPost).options(
-        joinedload(ForumPost.user),
-        joinedload(ForumPost.thread)
-    ).filter(
-        ForumPost.content.ilike(search_pattern)
-    ).limit(10).all()
+        .where(ForumThread.search_vector.op("@@")(ts_query))
+    )
+    posts = (
+        select(
+            literal("post").label("type"),
+            ForumPost.id.label("id"),
+            ForumPost.thread_id.label("thread_id"),
+            ForumThread.title.label("title"),
+            ForumPost.content.label("content"),
+            ForumPost.created_at.label("created_at"),
+            ForumPost.user_id.label("user_id"),
+            cast(func.ts_rank(ForumPost.search_vector, ts_query), Float).label("rank"),
+        )
+        .join(ForumThread, ForumThread.id == ForumPost.thread_id)
+        .where(ForumPost.search_vector.op("@@")(ts_query))
+    )
+    matches = union_all(threads, posts).subquery()
+    
+    # Сортировка: rank DESC, type, id (курсор - позиция последнего результата,
+    # rank приведен к double precision, чтобы точно совпадать после JSON)
+    page = select(matches)
+    if cursor:
+        rank, result_type, result_id = decode_search_cursor(cursor)
+        page = page.where(or_(
+            matches.c.rank < rank,
+            and_(matches.c.rank == rank, tuple_(matches.c.type, matches.c.id) > tuple_(result_type, result_id))
+        ))
+    page = page.order_by(desc(matches.c.rank), matches.c.type, matches.c.id).limit(limit + 1).subquery()
+    
+    # ts_headline считается только для строк страницы
+    rows = db.execute(
+        select(
+            page,
+            func.ts_headline(config, page.c.content, ts_query, SEARCH_HEADLINE_OPTIONS).label("headline"),
+        )
+        .order_by(desc(page.c.rank), page.c.type, page.c.id)
+    ).all()
     
-    results = []
+    next_cursor = encode_search_cursor(rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
     
-    # Добавляем топики
-    for thread in threads:
-        results.append({
-            "type": "thread",
-            "id": thread.id,
-            "title": thread.title,
-            "content": thread.content[:200] + "..." if len(thread.content) > 200 else thread.content,
-            "thread_id": None,
-            "created_at": thread.created_at,
-            "author": {
-                "id": thread.user.id,
-                "full_name": thread.user.full_name,
-            } if thread.user else None,
-        })
+    # Авторы одним запросом
+    user_ids = {row.user_id for row in rows}
+    authors = {
+        user.id: user for user in db.query(User).filter(User.id.in_(user_ids)).all()
+    } if user_ids else {}
     
-    # Добавляем комментарии
-    for post in posts:
+    results = []
+    for row in rows:
+        author = authors.get(row.user_id)
         results.append({
-            "type": "post",
-            "id": post.id,
-            "title": post.thread.title if post.thread else None,
-            "content": post.content[:200] + "..." if len(post.content) > 200 else post.content,
-            "thread_id": post.thread_id,
-            "created_at": post.created_at,
+            "type": row.type,
+            "id": row.id,
+            "title": row.title,
+            "content": row.content[:200] + "..." if len(row.content) > 200 else row.content,
+            "headline": render_headline(row.headline),
+            "rank": row.rank,
+            "thread_id": row.thread_id,
+            "created_at": row.created_at,
             "author": {
-                "id": post.user.id,
-                "full_name": post.user.full_name,
-            } if post.user else None,
+                "id": author.id,
+                "full_name": author.full_name,
+            } if author else None,
         })
     
     return {
         "items": results,
         "total": len(results),
+        "next_cursor": next_cursor,
     }
 
 
@@ -741,6 +1116,7 @@ def search_forum(
 @router.delete("/threads/{thread_id}/moderate", status_code=status.HTTP_200_OK)
 def moderate_delete_thread(
     thread_id: int,
+    background_tasks: BackgroundTasks,
     ban_user: bool = Query(False, description="Ban the thread author"),
     moderator: User = Depends(get_current_moderator),
     db: Session = Depends(get_db)
@@ -773,6 +1149,8 @@ def moderate_delete_thread(
             logger.warning(f"Moderator {moderator.id} banned user {author_id}")
     
     db.commit()
+    response_cache.invalidate(FORUM_CATEGORIES_TAG)
+    background_tasks.add_task(schedule_delete, THREAD_DOC, [thread_id])
     
     logger.info(f"Moderator {moderator.id} deleted thread {thread_id} ('{thread_title}')")
     
@@ -786,6 +1164,7 @@ def moderate_delete_thread(
 @router.delete("/posts/{post_id}/moderate", status_code=status.HTTP_200_OK)
 def moderate_delete_post(
     post_id: int,
+    background_tasks: BackgroundTasks,
     ban_user: bool = Query(False, description="Ban the post author"),
     moderator: User = Depends(get_current_moderator),
     db: Session = Depends(get_db)
@@ -805,9 +1184,13 @@ def moderate_delete_post(
         )
     
     author_id = post.user_id
+    thread_id = post.thread_id
+    post_ids = get_post_subtree_ids(db, post_id)
     
     # Удаляем комментарий (cascade удалит все вложенные ответы)
     db.delete(post)
+    db.flush()
+    forum_service.refresh_thread_counters(db, [thread_id])
     
     # Опционально баним автора
     if ban_user:
@@ -817,6 +1200,7 @@ def moderate_delete_post(
             logger.warning(f"Moderator {moderator.id} banned user {author_id}")
     
     db.commit()
+    background_tasks.add_task(schedule_delete, POST_DOC, post_ids)
     
     logger.info(f"Moderator {moderator.id} deleted post {post_id}")
     
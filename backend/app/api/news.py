@@ -1,92 +1,112 @@
 """
 News API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.db.database import get_db
-from app.models.news import News
-from app.services.minfin_crawler import crawl_minfin
-from app.services.tax_gov_ua_crawler import crawl_tax_gov_ua
-from app.services.liga_net_crawler import crawl_liga_net
-from app.services.buhgalter911_crawler import crawl_buhgalter911
-from app.services.news_filter import filter_relevant_news
-from app.crawlers.tax_gov_ua_playwright import crawl_tax_gov_ua as crawl_tax_gov_ua_playwright
-from app.crawlers.diia_gov_ua_playwright import crawl_diia_gov_ua as crawl_diia_gov_ua_playwright
-from app.crawlers.dtkt_crawler import crawl_dtkt
+from sqlalchemy import and_, desc, func, or_, select, tuple_
+from app.core.config import settings
+from app.db.database import get_db, get_async_db
+from app.models.news import News, NewsCategoryCount
+from app.services.news_ingestion import NEWS_SOURCE_ADAPTERS, ingest_news_source
+from app.services.classification_cache import classification_cache
+from app.services.response_cache import NEWS_TAG, cached_json_response, response_cache
 from typing import List, Optional
 from datetime import datetime
+import base64
+import hashlib
+import json
+import redis
 
 router = APIRouter()
 
+# Redis client
+redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
-@router.post("/crawl/minfin")
-async def crawl_minfin_news(db: Session = Depends(get_db)):
+
+def encode_cursor(item: News) -> str:
+    """Непрозрачный курсор на позицию (published_at, id) последней новости страницы"""
+    data = {
+        "p": item.published_at.isoformat() if item.published_at else None,
+        "id": item.id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
     """
-    Запустить краулер для minfin.com.ua
+    Разобрать курсор из encode_cursor()
     
-    Парсит новости с /ua/articles/ и /ua/news/
-    Фильтрует через OpenAI API
-    Сохраняет в БД
+    Returns:
+        (published_at или None, id)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        published_at = datetime.fromisoformat(data["p"]) if data["p"] else None
+        return published_at, int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_cursor(cursor: str):
+    """
+    Условие "после курсора" для сортировки published_at DESC, id DESC
+    
+    В PostgreSQL при DESC значения NULL идут первыми.
+    """
+    published_at, news_id = decode_cursor(cursor)
+    
+    if published_at is None:
+        return or_(
+            and_(News.published_at.is_(None), News.id < news_id),
+            News.published_at.isnot(None)
+        )
+    
+    return tuple_(News.published_at, News.id) < tuple_(published_at, news_id)
+
+
+async def get_cached_total(db: AsyncSession, query, category: Optional[str], target_audience: Optional[str]) -> int:
     """
-    print("🕷️ Starting Minfin crawler...")
+    Количество новостей для комбинации фильтров с кешированием в Redis
+    
+    Значение может отставать от БД не более чем на NEWS_COUNT_CACHE_TTL секунд.
+    """
+    data = f"{category or ''}:{target_audience or ''}"
+    cache_key = f"news_count:{hashlib.md5(data.encode()).hexdigest()}"
     
     try:
-        # Шаг 1: Парсинг
-        articles = await crawl_minfin()
-        
-        if not articles:
-            return {
-                "status": "success",
-                "message": "No new articles found",
-                "parsed": 0,
-                "filtered": 0,
-                "saved": 0
-            }
-        
-        # Шаг 2: Фильтрация через OpenAI
-        articles_dict = [a.to_dict() for a in articles]
-        filtered_articles = await filter_relevant_news(articles_dict)
-        
-        # Шаг 3: Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_articles:
-            # Проверяем, нет ли уже такой статьи
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                print(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Создаем новую запись
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article['source'],
-                content=article.get('summary', article['title']),  # Используем summary как content
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],  # JSON array
-                target_audience=article.get('target_audience', []),
-                published_at=datetime.utcnow(),  # У Minfin нет даты, используем текущую
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            print(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
+        cached = await run_in_threadpool(redis_client.get, cache_key)
+        if cached is not None:
+            return int(cached)
+    except Exception as cache_error:
+        print(f"Cache read error (continuing without cache): {cache_error}")
+    
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    
+    try:
+        await run_in_threadpool(redis_client.setex, cache_key, settings.NEWS_COUNT_CACHE_TTL, total)
+    except Exception as cache_error:
+        print(f"Cache write error (continuing): {cache_error}")
+    
+    return total
+
+
+async def run_crawler(source_key: str, db: Session) -> dict:
+    """
+    Запустить pipeline загрузки новостей источника и вернуть статистику
+    """
+    source_name = NEWS_SOURCE_ADAPTERS[source_key].source
+    print(f"🕷️ Starting {source_name} crawler...")
+    
+    try:
+        result = await ingest_news_source(source_key, db)
         
-        result = {
-            "status": "success",
-            "message": f"Crawler finished successfully",
-            "parsed": len(articles),
-            "filtered": len(filtered_articles),
-            "saved": saved_count,
-            "skipped": skipped_count
-        }
+        if result["status"] == "warning":
+            result["message"] = "No articles found"
+        else:
+            result["message"] = f"{source_name} crawler finished successfully"
         
         print(f"✅ Crawler finished: {result}")
         return result
@@ -95,10 +115,22 @@ async def crawl_minfin_news(db: Session = Depends(get_db)):
         print(f"❌ Crawler error: {e}")
         import traceback
         traceback.print_exc()
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/crawl/minfin")
+async def crawl_minfin_news(db: Session = Depends(get_db)):
+    """
+    Запустить краулер для minfin.com.ua
+    
+    Парсит новости с /ua/articles/ и /ua/news/
+    Фильтрует через OpenAI API
+    Сохраняет в БД
+    """
+    return await run_crawler("minfin", db)
+
+
 @router.post("/crawl/tax-gov-ua")
 async def crawl_tax_gov_ua_news(db: Session = Depends(get_db)):
     """
@@ -108,76 +140,7 @@ async def crawl_tax_gov_ua_news(db: Session = Depends(get_db)):
     Фильтрует через OpenAI API
     Сохраняет в БД
     """
-    try:
-        print("🕷️ Starting Tax.gov.ua crawler...")
-        
-        # Шаг 1: Парсинг новостей
-        articles = await crawl_tax_gov_ua()
-        print(f"📰 Crawled {len(articles)} articles")
-        
-        if not articles:
-            return {
-                "status": "warning",
-                "message": "No articles found",
-                "parsed": 0,
-                "filtered": 0,
-                "saved": 0,
-                "skipped": 0
-            }
-        
-        # Шаг 2: Фильтрация через OpenAI
-        articles_dict = [a.to_dict() for a in articles]
-        filtered_articles = await filter_relevant_news(articles_dict)
-        
-        # Шаг 3: Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_articles:
-            # Проверяем, нет ли уже такой статьи
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                print(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Создаем новую запись
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article['source'],
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=datetime.utcnow(),
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            print(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            "status": "success",
-            "message": f"Crawler finished successfully",
-            "parsed": len(articles),
-            "filtered": len(filtered_articles),
-            "saved": saved_count,
-            "skipped": skipped_count
-        }
-        
-        print(f"✅ Crawler finished: {result}")
-        return result
-        
-    except Exception as e:
-        print(f"❌ Crawler error: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_crawler("tax_gov_ua", db)
 
 
 @router.post("/crawl/liga-net")
@@ -189,76 +152,7 @@ async def crawl_liga_net_news(db: Session = Depends(get_db)):
     Фильтрует через OpenAI API
     Сохраняет в БД
     """
-    try:
-        print("🕷️ Starting Liga.net crawler...")
-        
-        # Шаг 1: Парсинг новостей
-        articles = await crawl_liga_net()
-        print(f"📰 Crawled {len(articles)} articles")
-        
-        if not articles:
-            return {
-                "status": "warning",
-                "message": "No articles found",
-                "parsed": 0,
-                "filtered": 0,
-                "saved": 0,
-                "skipped": 0
-            }
-        
-        # Шаг 2: Фильтрация через OpenAI
-        articles_dict = [a.to_dict() for a in articles]
-        filtered_articles = await filter_relevant_news(articles_dict)
-        
-        # Шаг 3: Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_articles:
-            # Проверяем, нет ли уже такой статьи
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                print(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Создаем новую запись
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article['source'],
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', article.get('categories', ['загальне'])[0] if isinstance(article.get('categories'), list) else 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=datetime.utcnow(),
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            print(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            "status": "success",
-            "message": f"Crawler finished successfully",
-            "parsed": len(articles),
-            "filtered": len(filtered_articles),
-            "saved": saved_count,
-            "skipped": skipped_count
-        }
-        
-        print(f"✅ Crawler finished: {result}")
-        return result
-        
-    except Exception as e:
-        print(f"❌ Crawler error: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_crawler("liga_net", db)
 
 
 @router.post("/crawl/tax-gov-ua-playwright")
@@ -271,85 +165,7 @@ async def crawl_tax_gov_ua_playwright_news(db: Session = Depends(get_db)):
     Фильтрует через OpenAI API
     Сохраняет в БД
     """
-    try:
-        print("🕷️ Starting Tax.gov.ua Playwright crawler...")
-        
-        # Шаг 1: Парсинг новостей через Playwright
-        articles = await crawl_tax_gov_ua_playwright()
-        print(f"📰 Crawled {len(articles)} articles with Playwright")
-        
-        if not articles:
-            return {
-                "status": "warning",
-                "message": "No articles found",
-                "parsed": 0,
-                "filtered": 0,
-                "saved": 0,
-                "skipped": 0
-            }
-        
-        # Шаг 2: Фильтрация через OpenAI
-        filtered_articles = await filter_relevant_news(articles)
-        print(f"✅ Filtered {len(filtered_articles)} relevant articles")
-        
-        # Шаг 3: Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_articles:
-            # Проверяем, нет ли уже такой статьи
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                print(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создаем новую запись
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', 'tax.gov.ua'),
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at,
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            print(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            "status": "success",
-            "message": f"Playwright crawler finished successfully",
-            "parsed": len(articles),
-            "filtered": len(filtered_articles),
-            "saved": saved_count,
-            "skipped": skipped_count
-        }
-        
-        print(f"✅ Playwright crawler finished: {result}")
-        return result
-        
-    except Exception as e:
-        print(f"❌ Playwright crawler error: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_crawler("tax_gov_ua_playwright", db)
 
 
 @router.post("/crawl/diia-gov-ua-playwright")
@@ -362,85 +178,7 @@ async def crawl_diia_gov_ua_playwright_news(db: Session = Depends(get_db)):
     Фильтрует через OpenAI API
     Сохраняет в БД
     """
-    try:
-        print("🕷️ Starting Diia.gov.ua Playwright crawler...")
-        
-        # Шаг 1: Парсинг новостей через Playwright
-        articles = await crawl_diia_gov_ua_playwright()
-        print(f"📰 Crawled {len(articles)} articles from Diia with Playwright")
-        
-        if not articles:
-            return {
-                "status": "warning",
-                "message": "No articles found",
-                "parsed": 0,
-                "filtered": 0,
-                "saved": 0,
-                "skipped": 0
-            }
-        
-        # Шаг 2: Фильтрация через OpenAI
-        filtered_articles = await filter_relevant_news(articles)
-        print(f"✅ Filtered {len(filtered_articles)} relevant articles for business/FOP")
-        
-        # Шаг 3: Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_articles:
-            # Проверяем, нет ли уже такой статьи
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                print(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создаем новую запись
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', 'diia.gov.ua'),
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at,
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            print(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            "status": "success",
-            "message": f"Diia Playwright crawler finished successfully",
-            "parsed": len(articles),
-            "filtered": len(filtered_articles),
-            "saved": saved_count,
-            "skipped": skipped_count
-        }
-        
-        print(f"✅ Diia Playwright crawler finished: {result}")
-        return result
-        
-    except Exception as e:
-        print(f"❌ Diia Playwright crawler error: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_crawler("diia_gov_ua_playwright", db)
 
 
 @router.post("/crawl/dtkt")
@@ -452,85 +190,7 @@ async def crawl_dtkt_news(db: Session = Depends(get_db)):
     Фильтрует через OpenAI API
     Сохраняет в БД
     """
-    try:
-        print("🕷️ Starting dtkt.ua crawler...")
-        
-        # Шаг 1: Парсинг новостей
-        articles = await crawl_dtkt()
-        print(f"📰 Crawled {len(articles)} articles from dtkt.ua")
-        
-        if not articles:
-            return {
-                "status": "warning",
-                "message": "No articles found",
-                "parsed": 0,
-                "filtered": 0,
-                "saved": 0,
-                "skipped": 0
-            }
-        
-        # Шаг 2: Фильтрация через OpenAI
-        filtered_articles = await filter_relevant_news(articles)
-        print(f"✅ Filtered {len(filtered_articles)} relevant articles")
-        
-        # Шаг 3: Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_articles:
-            # Проверяем, нет ли уже такой статьи
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                print(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создаем новую запись
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', 'dtkt.ua'),
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at,
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            print(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            "status": "success",
-            "message": f"dtkt.ua crawler finished successfully",
-            "parsed": len(articles),
-            "filtered": len(filtered_articles),
-            "saved": saved_count,
-            "skipped": skipped_count
-        }
-        
-        print(f"✅ dtkt.ua crawler finished: {result}")
-        return result
-        
-    except Exception as e:
-        print(f"❌ dtkt.ua crawler error: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_crawler("dtkt", db)
 
 
 @router.post("/crawl/buhgalter911")
@@ -542,85 +202,19 @@ async def crawl_buhgalter911_news(db: Session = Depends(get_db)):
     Фильтрует через OpenAI API
     Сохраняет в БД
     """
-    try:
-        print("🕷️ Starting Buhgalter911.com crawler...")
-        
-        # Шаг 1: Парсинг новостей
-        articles = await crawl_buhgalter911()
-        print(f"📰 Crawled {len(articles)} articles")
-        
-        if not articles:
-            return {
-                "status": "warning",
-                "message": "No articles found",
-                "parsed": 0,
-                "filtered": 0,
-                "saved": 0,
-                "skipped": 0
-            }
-        
-        # Шаг 2: Фильтрация через OpenAI
-        articles_dict = [a.to_dict() for a in articles]
-        filtered_articles = await filter_relevant_news(articles_dict)
-        
-        # Шаг 3: Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_articles:
-            # Проверяем, нет ли уже такой статьи
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                print(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Создаем новую запись
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article['source'],
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', article.get('categories', ['загальне'])[0] if isinstance(article.get('categories'), list) else 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=datetime.utcnow(),
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            print(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            "status": "success",
-            "message": f"Crawler finished successfully",
-            "parsed": len(articles),
-            "filtered": len(filtered_articles),
-            "saved": saved_count,
-            "skipped": skipped_count
-        }
-        
-        print(f"✅ Crawler finished: {result}")
-        return result
-        
-    except Exception as e:
-        print(f"❌ Crawler error: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_crawler("buhgalter911", db)
 
 
 @router.get("/")
 async def get_news(
+    request: Request,
     category: Optional[str] = Query(None, description="Категория новостей"),
     target_audience: Optional[str] = Query(None, description="Целевая аудитория (ФОП, ЮО, бухгалтери)"),
     limit: int = Query(20, ge=1, le=100, description="Количество новостей"),
     offset: int = Query(0, ge=0, description="Смещение для пагинации"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor из предыдущего ответа)"),
+    include_total: bool = Query(True, description="Вернуть общее количество (кешируется)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Получить список новостей с фильтрацией
@@ -628,29 +222,51 @@ async def get_news(
     - **category**: Фильтр по категории (податки, звітність, законодавство, ЄСВ, зарплата, бухоблік)
     - **target_audience**: Фильтр по аудитории (ФОП, ЮО, бухгалтери)
     - **limit**: Количество новостей (по умолчанию 20)
-    - **offset**: Смещение для пагинации
+    - **offset**: Смещение для пагинации (игнорируется, если передан cursor)
+    - **cursor**: Keyset пагинация по (published_at, id) - стоимость страницы не зависит от глубины
+    - **include_total**: Вернуть total (значение из кеша, может немного отставать)
     """
-    query = db.query(News).filter(News.is_published == True)
+    cache_key = await response_cache.amake_key("news:list", {
+        "category": category,
+        "target_audience": target_audience,
+        "limit": limit,
+        "offset": 0 if cursor else offset,
+        "cursor": cursor,
+        "include_total": include_total,
+    }, [NEWS_TAG])
+    cached = await response_cache.aget(cache_key)
+    if cached:
+        return cached_json_response(cached, request)
+    
+    query = select(News).where(News.is_published == True)
     
     if category:
-        # PostgreSQL JSON array contains
-        query = query.filter(News.categories.contains([category]))
+        # JSONB @> (GIN индекс)
+        query = query.where(News.categories.contains([category]))
     
     if target_audience:
-        # PostgreSQL JSON array contains
-        query = query.filter(News.target_audience.contains([target_audience]))
+        # JSONB @> (GIN индекс)
+        query = query.where(News.target_audience.contains([target_audience]))
     
-    # Сортируем по дате публикации (новые первые)
-    query = query.order_by(desc(News.published_at))
+    total = await get_cached_total(db, query, category, target_audience) if include_total else None
     
-    # Пагинация
-    total = query.count()
-    news_items = query.offset(offset).limit(limit).all()
+    # Пагинация: по курсору или по смещению
+    if cursor:
+        query = query.where(after_cursor(cursor))
+        offset = 0
+    else:
+        query = query.offset(offset)
     
-    return {
+    # Сортируем по дате публикации (новые первые), id - для однозначного порядка
+    news_items = (
+        await db.scalars(query.order_by(desc(News.published_at), desc(News.id)).limit(limit))
+    ).all()
+    
+    payload = {
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": encode_cursor(news_items[-1]) if len(news_items) == limit else None,
         "items": [
             {
                 "id": item.id,
@@ -666,80 +282,91 @@ async def get_news(
             for item in news_items
         ]
     }
+    
+    return cached_json_response(await response_cache.aset(cache_key, payload), request)
+
+
+async def get_category_counts(db: AsyncSession, limit: Optional[int] = None) -> List[tuple]:
+    """
+    Категории опубликованных новостей с количеством, по убыванию количества
+    """
+    query = (
+        select(NewsCategoryCount.category, NewsCategoryCount.count)
+        .where(NewsCategoryCount.count > 0)
+        .order_by(desc(NewsCategoryCount.count))
+        .limit(limit)
+    )
+    return (await db.execute(query)).all()
 
 
 @router.get("/categories")
-async def get_categories(db: Session = Depends(get_db)):
+async def get_categories(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Получить список всех категорий новостей
     """
-    # Получаем все новости
-    news_items = db.query(News).filter(News.is_published == True).all()
-    
-    # Подсчитываем категории вручную, так как это JSON поле
-    category_counts = {}
-    for item in news_items:
-        if item.categories:
-            for cat in item.categories:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-    
-    # Сортируем по количеству
-    sorted_categories = sorted(
-        category_counts.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )
+    cache_key = await response_cache.amake_key("news:categories", tags=[NEWS_TAG])
+    cached = await response_cache.aget(cache_key)
+    if cached:
+        return cached_json_response(cached, request)
     
-    return {
+    # Счетчики поддерживаются при загрузке новостей (news_category_counts)
+    sorted_categories = await get_category_counts(db)
+    
+    payload = {
         "categories": [
             {"name": cat, "count": count}
             for cat, count in sorted_categories
         ]
     }
+    
+    return cached_json_response(await response_cache.aset(cache_key, payload), request)
 
 
 @router.get("/stats")
-async def news_stats(db: Session = Depends(get_db)):
+async def news_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Статистика по новостям
-    """
-    from sqlalchemy import func
-    
-    total_news = db.query(News).count()
-    published_news = db.query(News).filter(News.is_published == True).count()
     
-    # По источникам
-    by_source = (
-        db.query(News.source, func.count(News.id).label('count'))
-        .group_by(News.source)
-        .all()
-    )
+    Агрегаты кешируются (сбрасываются при загрузке новостей вместе с тегом news),
+    статистика кеша классификации читается из Redis на каждый запрос.
+    """
+    cache_key = await response_cache.amake_key("news:stats", tags=[NEWS_TAG])
+    cached = await response_cache.aget(cache_key)
     
-    # По категориям (вручную, так как это JSON)
-    news_items = db.query(News).filter(News.is_published == True).all()
-    category_counts = {}
-    for item in news_items:
-        if item.categories:
-            for cat in item.categories:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-    
-    # Топ-10 категорий
-    top_categories = sorted(
-        category_counts.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:10]
+    if cached:
+        payload = cached.body
+    else:
+        # Количество по источникам и итоги - одним проходом по таблице
+        by_source = (
+            await db.execute(
+                select(
+                    News.source,
+                    func.count(News.id).label('count'),
+                    func.count(News.id).filter(News.is_published == True).label('published'),
+                )
+                .group_by(News.source)
+            )
+        ).all()
+        
+        # Топ-10 категорий (news_category_counts)
+        top_categories = await get_category_counts(db, limit=10)
+        
+        payload = {
+            "total_news": sum(row.count for row in by_source),
+            "published_news": sum(row.published for row in by_source),
+            "by_source": [
+                {"source": row.source, "count": row.count}
+                for row in by_source
+            ],
+            "top_categories": [
+                {"category": cat, "count": count}
+                for cat, count in top_categories
+            ],
+        }
+        await response_cache.aset(cache_key, payload)
     
     return {
-        "total_news": total_news,
-        "published_news": published_news,
-        "by_source": [
-            {"source": source, "count": count}
-            for source, count in by_source
-        ],
-        "top_categories": [
-            {"category": cat, "count": count}
-            for cat, count in top_categories
-        ]
+        **payload,
+        "classification_cache": await run_in_threadpool(classification_cache.stats)
     }
 
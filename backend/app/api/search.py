@@ -1,17 +1,24 @@
 """
 Search API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.schemas.search import SearchRequest, SearchResponse, SearchResult
+from app.db.database import get_db, get_async_db
+from app.schemas.search import SearchRequest, SearchResponse, SearchResult, InternalSearchResponse
 from app.services.google_parser import search_multiple_sources
+from app.services.search_index import search_index
 from app.models.search_log import SearchLog
 from app.core.config import settings
 import redis
 import json
 import hashlib
-from typing import List
+import logging
+from elasticsearch import ApiError, TransportError
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -29,7 +36,7 @@ def get_cache_key(query: str, sources: List[str]) -> str:
 async def search(
     search_request: SearchRequest,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Поиск по выбранным источникам с кешированием
@@ -55,7 +62,7 @@ async def search(
     cache_key = get_cache_key(query, sources)
     
     try:
-        cached_results = redis_client.get(cache_key)
+        cached_results = await run_in_threadpool(redis_client.get, cache_key)
         
         if cached_results:
             # Возвращаем из кеша
@@ -92,7 +99,8 @@ async def search(
     if results:
         try:
             results_json = [r.model_dump() for r in results]
-            redis_client.setex(
+            await run_in_threadpool(
+                redis_client.setex,
                 cache_key,
                 3600,  # 1 час
                 json.dumps(results_json, ensure_ascii=False)
@@ -111,12 +119,12 @@ async def search(
             user_agent=request.headers.get("user-agent"),
         )
         db.add(search_log)
-        db.commit()
+        await db.commit()
         print(f"Logged search to database")
     except Exception as e:
         # Логирование не должно ломать основной запрос
         print(f"Error logging search: {e}")
-        db.rollback()
+        await db.rollback()
     
     return SearchResponse(
         query=query,
@@ -127,8 +135,46 @@ async def search(
     )
 
 
+@router.get("/internal", response_model=InternalSearchResponse)
+def search_internal(
+    q: str = Query(..., min_length=2, max_length=200, description="Поисковый запрос"),
+    type: Optional[List[str]] = Query(None, description="Типы: news, article, thread, post, tax_requisite"),
+    source: Optional[List[str]] = Query(None, description="Источники новостей"),
+    category: Optional[List[str]] = Query(None, description="Категории"),
+    region: Optional[List[str]] = Query(None, description="Области (реквизиты)"),
+    page: int = Query(1, ge=1, le=50),
+    page_size: int = Query(20, ge=1, le=50),
+):
+    """
+    Поиск по собственному контенту (Elasticsearch)
+    
+    Новости, статьи, форум и податкові реквізити в одном ранжированном списке
+    с фасетами по типу, источнику, категории и области. Фильтр по фасету
+    не сужает значения этого же фасета.
+    
+    Returns:
+        InternalSearchResponse с результатами и фасетами
+    """
+    query = q.strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    
+    try:
+        result = search_index.search(
+            query,
+            filters={'type': type, 'source': source, 'category': category, 'region': region},
+            size=page_size,
+            offset=(page - 1) * page_size,
+        )
+    except (ApiError, TransportError) as e:
+        logger.error(f"❌ Internal search failed: {e}")
+        raise HTTPException(status_code=503, detail="Search is temporarily unavailable")
+    
+    return {'query': query, 'page': page, 'page_size': page_size, **result}
+
+
 @router.get("/stats")
-async def search_stats(db: Session = Depends(get_db)):
+def search_stats(db: Session = Depends(get_db)):
     """
     Статистика поисковых запросов
     
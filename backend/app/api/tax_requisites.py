@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Header, Query, status
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import os
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
 from app.models.tax_requisite import TaxRequisite, TaxRequisiteType
 from app.schemas.tax_requisite import (
     TaxRequisiteResponse,
@@ -17,6 +19,7 @@ from app.services.tax_requisite_parser import (
     parse_esv_xls, parse_esv_xls_simple, parse_tax_xls_simple,
     is_xls_file
 )
+from app.services.search_index import TAX_REQUISITE_DOC, schedule_reindex_type
 
 
 router = APIRouter(prefix="/api/tax-requisites", tags=["tax-requisites"])
@@ -24,6 +27,7 @@ router = APIRouter(prefix="/api/tax-requisites", tags=["tax-requisites"])
 
 @router.post("/upload-esv", response_model=UploadResponse)
 async def upload_esv_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="CSV або XLSX файл з реквізитами ЄСВ"),
     region: str = Form(..., description="Область (наприклад: Київ)"),
     x_admin_password: str = Header(..., description="Пароль адміністратора"),
@@ -94,6 +98,7 @@ async def upload_esv_file(
         ]
         db.bulk_save_objects(db_requisites)
         db.commit()
+        background_tasks.add_task(schedule_reindex_type, TAX_REQUISITE_DOC)
         
         return UploadResponse(
             success=True,
@@ -113,6 +118,7 @@ async def upload_esv_file(
 
 @router.post("/upload-tax", response_model=UploadResponse)
 async def upload_tax_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="CSV або XLSX файл з реквізитами для податків"),
     region: str = Form(..., description="Область (наприклад: Київ)"),
     x_admin_password: str = Header(..., description="Пароль адміністратора"),
@@ -186,6 +192,7 @@ async def upload_tax_file(
         ]
         db.bulk_save_objects(db_requisites)
         db.commit()
+        background_tasks.add_task(schedule_reindex_type, TAX_REQUISITE_DOC)
         
         return UploadResponse(
             success=True,
@@ -204,7 +211,8 @@ async def upload_tax_file(
 
 
 @router.delete("", response_model=DeleteResponse)
-async def delete_all_requisites(
+def delete_all_requisites(
+    background_tasks: BackgroundTasks,
     x_admin_password: str = Header(..., description="Пароль адміністратора"),
     db: Session = Depends(get_db)
 ):
@@ -235,6 +243,7 @@ async def delete_all_requisites(
         # Видалення всіх записів
         db.query(TaxRequisite).delete()
         db.commit()
+        background_tasks.add_task(schedule_reindex_type, TAX_REQUISITE_DOC)
         
         return DeleteResponse(
             success=True,
@@ -257,7 +266,7 @@ async def get_requisites(
     type: Optional[TaxRequisiteType] = Query(None, description="Тип податку/збору"),
     limit: int = Query(50, ge=1, le=100, description="Кількість результатів"),
     offset: int = Query(0, ge=0, description="Зміщення для пагінації"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Отримання податкових реквізитів з фільтрацією
@@ -277,12 +286,10 @@ async def get_requisites(
     - Це дозволяє бачити як місцеві реквізити (ПДФО, ЄП), так і обласні (ЄСВ, ВЗ)
     """
     try:
-        from sqlalchemy import or_, and_
-        
         # Базовий запит: реквізити для міста/села АБО реквізити області
         # Військовий збір (military_employees, military_fop) зберігається з district як назвою області,
         # тому для них шукаємо тільки по region
-        query = db.query(TaxRequisite).filter(
+        query = select(TaxRequisite).where(
             or_(
                 # Реквізити для конкретного міста/села
                 TaxRequisite.district == district,
@@ -298,13 +305,13 @@ async def get_requisites(
         
         # Фільтр по типу якщо вказано
         if type:
-            query = query.filter(TaxRequisite.type == type)
+            query = query.where(TaxRequisite.type == type)
         
         # Підрахунок загальної кількості
-        total = query.count()
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
         
         # Отримання результатів з пагінацією
-        requisites = query.offset(offset).limit(limit).all()
+        requisites = (await db.scalars(query.offset(offset).limit(limit))).all()
         
         return TaxRequisiteListResponse(
             items=[TaxRequisiteResponse.model_validate(r) for r in requisites],
@@ -321,26 +328,24 @@ async def get_requisites(
 
 
 @router.get("/districts", response_model=List[str])
-async def get_districts(region: Optional[str] = Query(None, description="Фільтр по області")):
+async def get_districts(
+    region: Optional[str] = Query(None, description="Фільтр по області"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Отримання списку доступних міст/сел
     
     Опціонально можна вказати область для фільтрації
     """
     try:
-        from app.db.database import SessionLocal
-        db = SessionLocal()
-        try:
-            query = db.query(TaxRequisite.district).filter(TaxRequisite.district.isnot(None)).distinct()
-            
-            # Фільтр по області якщо вказано
-            if region:
-                query = query.filter(TaxRequisite.region == region)
-            
-            districts = query.order_by(TaxRequisite.district).all()
-            return [d[0] for d in districts]
-        finally:
-            db.close()
+        query = select(TaxRequisite.district).where(TaxRequisite.district.isnot(None)).distinct()
+        
+        # Фільтр по області якщо вказано
+        if region:
+            query = query.where(TaxRequisite.region == region)
+        
+        districts = await db.scalars(query.order_by(TaxRequisite.district))
+        return list(districts)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -349,38 +354,35 @@ async def get_districts(region: Optional[str] = Query(None, description="Філ
 
 
 @router.get("/regions-with-districts")
-async def get_regions_with_districts():
+async def get_regions_with_districts(db: AsyncSession = Depends(get_async_db)):
     """
     Отримання структури: область -> [міста/села]
     
     Повертає словник де ключ - область, значення - список міст/сел
     """
     try:
-        from app.db.database import SessionLocal
-        db = SessionLocal()
-        try:
-            # Отримати всі унікальні пари (region, district)
-            results = db.query(
+        # Отримати всі унікальні пари (region, district)
+        results = await db.execute(
+            select(
                 TaxRequisite.region,
                 TaxRequisite.district
-            ).filter(
+            ).where(
                 TaxRequisite.district.isnot(None)
             ).distinct().order_by(
                 TaxRequisite.region,
                 TaxRequisite.district
-            ).all()
-            
-            # Згрупувати по регіонах
-            regions_dict = {}
-            for region, district in results:
-                if region not in regions_dict:
-                    regions_dict[region] = []
-                if district not in regions_dict[region]:
-                    regions_dict[region].append(district)
-            
-            return regions_dict
-        finally:
-            db.close()
+            )
+        )
+        
+        # Згрупувати по регіонах
+        regions_dict = {}
+        for region, district in results:
+            if region not in regions_dict:
+                regions_dict[region] = []
+            if district not in regions_dict[region]:
+                regions_dict[region].append(district)
+        
+        return regions_dict
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -11,7 +11,7 @@ celery_app = Celery(
     "buhassistant",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=['app.tasks.crawler_tasks', 'app.tasks.notification_tasks']
+    include=['app.tasks.crawler_tasks', 'app.tasks.notification_tasks', 'app.tasks.forum_tasks', 'app.tasks.view_tasks', 'app.tasks.search_tasks']
 )
 
 # Конфигурация Celery
@@ -22,7 +22,11 @@ celery_app.conf.update(
     timezone='Europe/Kyiv',
     enable_utc=True,
     task_track_started=True,
-    task_time_limit=4 * 60 * 60,  # 4 часа максимум на задачу (для задач с рандомной задержкой до 2 часов)
+    task_time_limit=4 * 60 * 60,  # 4 часа максимум на задачу (полный обход новостей)
+    # Задачи с countdown (рассылка новостей, до 2 часов) не должны переотправляться
+    # брокером до наступления ETA: visibility_timeout Redis больше максимальной задержки
+    broker_transport_options={'visibility_timeout': 3 * 60 * 60},
+    result_backend_transport_options={'visibility_timeout': 3 * 60 * 60},
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
 )
@@ -36,6 +40,34 @@ celery_app.conf.beat_schedule = {
         'options': {'queue': 'crawler'}
     },
     
+    # Пересчет счетчиков категорий новостей: каждый день в 3:00 (Киев)
+    'refresh-news-category-counts-daily': {
+        'task': 'refresh_news_category_counts_task',
+        'schedule': crontab(minute=0, hour=3),
+        'options': {'queue': 'crawler'}
+    },
+    
+    # Пересчет счетчиков топиков форума: каждый день в 4:00 (Киев)
+    'refresh-forum-thread-counters-daily': {
+        'task': 'refresh_forum_thread_counters_task',
+        'schedule': crontab(minute=0, hour=4),
+        'options': {'queue': 'default'}
+    },
+    
+    # Перенос просмотров (топики, статьи) из Redis в БД: каждые 5 минут
+    'flush-view-counters': {
+        'task': 'flush_view_counters_task',
+        'schedule': crontab(minute='*/5'),
+        'options': {'queue': 'default'}
+    },
+    
+    # Полная переиндексация поиска по контенту: каждый день в 5:00 (Киев)
+    'reindex-search-daily': {
+        'task': 'reindex_search_task',
+        'schedule': crontab(minute=0, hour=5),
+        'options': {'queue': 'default'}
+    },
+    
     # Push-уведомления о дедлайнах: каждый день в 9:00 (Киев)
     'send-deadline-notifications-daily': {
         'task': 'send_deadline_notifications',
@@ -43,15 +75,22 @@ celery_app.conf.beat_schedule = {
         'options': {'queue': 'notifications'}
     },
     
+    # Проверка квитанций Expo и очистка недействительных токенов: каждые 30 минут
+    'check-push-receipts': {
+        'task': 'check_push_receipts',
+        'schedule': crontab(minute='*/30'),
+        'options': {'queue': 'notifications'}
+    },
+    
     # Push-уведомления о новостях: каждый день 2 раза (12:00-14:00 и 18:00-20:00) (Киев)
     'send-news-notifications-noon': {
-        'task': 'send_news_notifications',
-        'schedule': crontab(minute=0, hour=12),  # 12:00 каждый день, рандомная задержка 0-120 мин
+        'task': 'schedule_news_notifications',
+        'schedule': crontab(minute=0, hour=12),  # 12:00 каждый день, отправка через 0-120 мин (countdown)
         'options': {'queue': 'notifications'}
     },
     'send-news-notifications-evening': {
-        'task': 'send_news_notifications',
-        'schedule': crontab(minute=0, hour=18),  # 18:00 каждый день, рандомная задержка 0-120 мин
+        'task': 'schedule_news_notifications',
+        'schedule': crontab(minute=0, hour=18),  # 18:00 каждый день, отправка через 0-120 мин (countdown)
         'options': {'queue': 'notifications'}
     },
     
@@ -74,8 +113,17 @@ celery_app.conf.task_routes = {
     'crawl_buhplatforma_task': {'queue': 'crawler'},
     'crawl_7eminar_task': {'queue': 'crawler'},
     'crawl_all_news_sources_task': {'queue': 'crawler'},
+    'refresh_news_category_counts_task': {'queue': 'crawler'},
     'send_deadline_notifications': {'queue': 'notifications'},
+    'schedule_news_notifications': {'queue': 'notifications'},
     'send_news_notifications': {'queue': 'notifications'},
+    'check_push_receipts': {'queue': 'notifications'},
+    'refresh_forum_thread_counters_task': {'queue': 'default'},
+    'flush_view_counters_task': {'queue': 'default'},
+    'index_search_documents_task': {'queue': 'default'},
+    'delete_search_documents_task': {'queue': 'default'},
+    'reindex_search_type_task': {'queue': 'default'},
+    'reindex_search_task': {'queue': 'default'},
     'test_celery_task': {'queue': 'default'},
 }
 
@@ -18,9 +18,17 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_TTL: int = 3600  # Кеш публичных ответов в Redis (секунды), сбрасывается по тегам
+    RESPONSE_CACHE_LOCAL_TTL: int = 5  # Время жизни записи в in-process LRU (секунды)
+    RESPONSE_CACHE_LOCAL_SIZE: int = 512  # Максимум записей в in-process LRU
     
     # Elasticsearch
     ELASTICSEARCH_URL: str = "http://localhost:9200"
+    ELASTICSEARCH_INDEX: str = "buhassistant_content"  # Алиас индекса поиска по контенту
+    ELASTICSEARCH_TIMEOUT: int = 30  # Таймаут запросов (секунды)
+    ELASTICSEARCH_BULK_SIZE: int = 500  # Документов в одном bulk запросе
+    ELASTICSEARCH_UKRAINIAN_PLUGIN: bool = False  # Установлен плагин analysis-ukrainian (морфология)
+    SEARCH_INDEX_SYNC_ENABLED: bool = True  # Синхронизировать индекс при изменении контента (Celery)
     
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -40,9 +48,26 @@ class Settings(BaseSettings):
     
     # OpenAI
     OPENAI_API_KEY: str = ""
-    
+    NEWS_CLASSIFY_CHUNK_SIZE: int = 20  # Заголовков в одном запросе классификации
+    NEWS_CLASSIFY_CONCURRENCY: int = 4  # Одновременных запросов к OpenAI
+    NEWS_CLASSIFY_MAX_RETRIES: int = 3  # Попыток на один чанк
+    NEWS_CLASSIFY_RETRY_BACKOFF: float = 2.0  # Базовая задержка между попытками (секунды)
+    NEWS_CLASSIFY_CACHE_TTL: int = 30 * 24 * 3600  # Время жизни вердикта в кеше (секунды)
+
+    # News crawler
+    NEWS_CRAWL_SOURCE_TIMEOUT: int = 600  # Бюджет времени на один источник при полном обходе (секунды)
+    NEWS_INGEST_BATCH_SIZE: int = 50  # Размер батча статей для классификации и сохранения
+    NEWS_COUNT_CACHE_TTL: int = 300  # Время жизни кешированного total ленты новостей (секунды)
+
     # Expo Push Notifications
     EXPO_ACCESS_TOKEN: str = ""
+    PUSH_CHUNK_SIZE: int = 100  # Сообщений в одном запросе к Expo (лимит API - 100)
+    PUSH_FANOUT_BATCH_SIZE: int = 1000  # Строк, читаемых из БД за раз при рассылке
+    PUSH_SEND_CONCURRENCY: int = 4  # Одновременных запросов к Expo
+    PUSH_SEND_MAX_RETRIES: int = 3  # Попыток на один чанк
+    PUSH_SEND_RETRY_BACKOFF: float = 1.0  # Базовая задержка между попытками (секунды)
+    PUSH_RECEIPT_DELAY: int = 15 * 60  # Через сколько проверять квитанции (секунды)
+    PUSH_RECEIPT_TTL: int = 24 * 3600  # Сколько Expo хранит квитанции (секунды)
     
     # Email (SMTP)
     SMTP_SERVER: str = "smtp.gmail.com"
@@ -0,0 +1,130 @@
+"""
+Общий Playwright браузер для краулеров
+
+Один процесс Chromium на процесс воркера (или API), для каждого источника
+создается отдельный контекст браузера. Запуск Chromium выполняется один раз,
+а не при каждом обходе каждого источника.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, Route
+
+logger = logging.getLogger(__name__)
+
+# Тяжелые ресурсы, не нужные для парсинга списка новостей
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+]
+
+
+async def _block_heavy_resources(route: Route):
+    """Отменить загрузку изображений, шрифтов и медиа"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """
+    Долгоживущий Chromium с отдельным контекстом на каждую страницу
+
+    Браузер привязан к event loop, в котором был запущен. В другом loop
+    (например, при следующем asyncio.run) пул можно использовать только
+    после close() в исходном loop, иначе - RuntimeError.
+    """
+
+    def __init__(self):
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get_browser(self) -> Browser:
+        """Получить запущенный браузер, запустив его при первом обращении"""
+        loop = asyncio.get_running_loop()
+
+        if self._loop is not loop:
+            # Браузер другого loop нельзя ни использовать, ни закрыть из этого:
+            # молча забытый, он оставил бы процесс Chromium
+            if self._browser is not None or self._playwright is not None:
+                raise RuntimeError(
+                    "BrowserPool уже запущен в другом event loop; вызовите close() "
+                    "в том loop перед использованием в новом"
+                )
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                await self._shutdown()
+                logger.info("Запуск общего Playwright браузера...")
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+                logger.info("Общий Playwright браузер запущен")
+
+        return self._browser
+
+    async def new_page(self, timeout: int = 30000) -> Page:
+        """
+        Открыть страницу в новом контексте браузера
+
+        Args:
+            timeout: Timeout операций страницы (мс)
+
+        Returns:
+            Страница; закрывать через release_page()
+        """
+        browser = await self.get_browser()
+
+        context = await browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={'width': 1920, 'height': 1080},
+            locale='uk-UA',
+        )
+        await context.route('**/*', _block_heavy_resources)
+
+        page = await context.new_page()
+        page.set_default_timeout(timeout)
+        return page
+
+    async def release_page(self, page: Page):
+        """Закрыть страницу вместе с ее контекстом (браузер остается запущенным)"""
+        context: BrowserContext = page.context
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть контекст браузера: {e}")
+
+    async def close(self):
+        """Остановить браузер (при завершении процесса)"""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        async with self._lock:
+            await self._shutdown()
+        logger.info("Общий Playwright браузер закрыт")
+
+    async def _shutdown(self):
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.warning(f"Ошибка при закрытии браузера: {e}")
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+
+
+# Общий пул процесса
+browser_pool = BrowserPool()
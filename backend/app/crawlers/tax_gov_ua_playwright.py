@@ -6,10 +6,11 @@
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import Page
 import logging
 
 from app.core.config import settings
+from app.crawlers.browser_pool import BrowserPool, browser_pool
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +22,12 @@ SOURCE_NAME = "tax.gov.ua"
 class TaxGovUaPlaywrightCrawler:
     """Краулер для tax.gov.ua с использованием Playwright"""
     
-    def __init__(self):
-        self.browser: Optional[Browser] = None
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        """
+        Args:
+            pool: Пул браузера; по умолчанию общий browser_pool процесса
+        """
+        self.pool = pool or browser_pool
         self.page: Optional[Page] = None
     
     async def __aenter__(self):
@@ -35,45 +40,16 @@ class TaxGovUaPlaywrightCrawler:
         await self.close()
     
     async def initialize(self):
-        """Инициализация браузера и страницы"""
-        logger.info("Инициализация Playwright браузера...")
-        
-        self.playwright = await async_playwright().start()
-        
-        # Запускаем Chromium в headless режиме
-        self.browser = await self.playwright.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-            ]
-        )
-        
-        # Создаем контекст браузера с user-agent
-        context = await self.browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080},
-            locale='uk-UA',
-        )
-        
-        self.page = await context.new_page()
-        
-        # Устанавливаем timeout
-        self.page.set_default_timeout(30000)  # 30 секунд
-        
-        logger.info("Playwright браузер инициализирован")
+        """Открытие страницы в отдельном контексте общего браузера"""
+        self.page = await self.pool.new_page(timeout=30000)  # 30 секунд
+        logger.info("Контекст Playwright браузера создан")
     
     async def close(self):
-        """Закрытие браузера"""
+        """Закрытие контекста (браузер остается запущенным для следующих обходов)"""
         if self.page:
-            await self.page.close()
-        if self.browser:
-            await self.browser.close()
-        if hasattr(self, 'playwright'):
-            await self.playwright.stop()
-        logger.info("Playwright браузер закрыт")
+            await self.pool.release_page(self.page)
+            self.page = None
+        logger.info("Контекст Playwright браузера закрыт")
     
     async def parse_news_list(self) -> List[Dict]:
         """
@@ -89,7 +65,8 @@ class TaxGovUaPlaywrightCrawler:
         
         try:
             # Переходим на страницу новостей
-            response = await self.page.goto(TAX_GOV_UA_URL, wait_until='networkidle')
+            # Не ждем networkidle: достаточно DOM и появления списка новостей
+            response = await self.page.goto(TAX_GOV_UA_URL, wait_until='domcontentloaded')
             
             if not response or response.status != 200:
                 logger.error(f"Ошибка загрузки страницы: {response.status if response else 'No response'}")
@@ -176,7 +153,7 @@ class TaxGovUaPlaywrightCrawler:
         try:
             logger.info(f"Парсинг статьи: {url}")
             
-            await self.page.goto(url, wait_until='networkidle')
+            await self.page.goto(url, wait_until='domcontentloaded')
             
             # Извлекаем контент статьи
             article_data = await self.page.evaluate('''() => {
@@ -265,14 +242,17 @@ class TaxGovUaPlaywrightCrawler:
         return None
 
 
-async def crawl_tax_gov_ua() -> List[Dict]:
+async def crawl_tax_gov_ua(pool: Optional[BrowserPool] = None) -> List[Dict]:
     """
     Основная функция для парсинга tax.gov.ua
     
+    Args:
+        pool: Пул браузера; по умолчанию общий browser_pool процесса
+    
     Returns:
         List[Dict]: Список новостей
     """
-    async with TaxGovUaPlaywrightCrawler() as crawler:
+    async with TaxGovUaPlaywrightCrawler(pool) as crawler:
         news_items = await crawler.parse_news_list()
         
         # Парсим даты
@@ -291,6 +271,7 @@ async def crawl_tax_gov_ua() -> List[Dict]:
 if __name__ == "__main__":
     async def main():
         news = await crawl_tax_gov_ua()
+        await browser_pool.close()
         print(f"\nНайдено новостей: {len(news)}")
         for i, item in enumerate(news[:5], 1):
             print(f"\n{i}. {item['title']}")
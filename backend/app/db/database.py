@@ -2,6 +2,8 @@
 Настройка подключения к базе данных
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -17,6 +19,18 @@ engine = create_engine(
 # Создаем фабрику сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный движок (asyncpg) для async endpoints FastAPI:
+# запросы не блокируют event loop uvicorn
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+)
+
+# Фабрика асинхронных сессий
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Базовый класс для моделей
 Base = declarative_base()
 
@@ -32,3 +46,12 @@ def get_db():
     finally:
         db.close()
 
+
+
+# Dependency для получения асинхронной сессии БД
+async def get_async_db():
+    """
+    Получить асинхронную сессию БД для использования в async endpoints
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
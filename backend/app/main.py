@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.core.config import settings
+from app.crawlers.browser_pool import browser_pool
 from app.api import health, search, news, calendar, auth, consultation, profile, push, forum, reports, blocks, articles, uploads, media, tax_requisites
 
 # Создаем приложение FastAPI
@@ -69,6 +70,7 @@ async def shutdown_event():
     """
     Событие при остановке приложения
     """
+    await browser_pool.close()
     print(f"🛑 {settings.APP_NAME} остановлен")
 
 
@@ -2,12 +2,12 @@
 Модели базы данных
 """
 from app.models.user import User
-from app.models.news import News
+from app.models.news import News, NewsCategoryCount
 from app.models.forum import ForumCategory, ForumThread, ForumPost, ForumLike
 from app.models.search_log import SearchLog
 from app.models.notification import NotificationSettings
 from app.models.report import ContentReport, UserBlock
-from app.models.push_token import AnonymousPushToken
+from app.models.push_token import AnonymousPushToken, PushTicketRecord
 from app.models.moderation import ModerationLog
 from app.models.article import Article
 from app.models.tax_requisite import TaxRequisite, TaxRequisiteType
@@ -15,6 +15,7 @@ from app.models.tax_requisite import TaxRequisite, TaxRequisiteType
 __all__ = [
     "User",
     "News",
+    "NewsCategoryCount",
     "ForumCategory",
     "ForumThread",
     "ForumPost",
@@ -24,6 +25,7 @@ __all__ = [
     "ContentReport",
     "UserBlock",
     "AnonymousPushToken",
+    "PushTicketRecord",
     "ModerationLog",
     "Article",
     "TaxRequisite",
@@ -2,7 +2,8 @@
 Модели для форума BuhAssistant
 """
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
@@ -40,6 +41,14 @@ class ForumThread(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Денормализованные счетчики (обновляются вместе с постами/лайками, см. forum_service)
+    posts_count = Column(Integer, nullable=False, default=0, server_default='0')
+    last_post_at = Column(DateTime(timezone=True), nullable=True)
+    likes_count = Column(Integer, nullable=False, default=0, server_default='0')
+    
+    # Полнотекстовый индекс title (вес A) + content (вес B), заполняется триггером в БД
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    
     # Relationships
     category = relationship("ForumCategory", back_populates="threads")
     user = relationship("User", back_populates="forum_threads")
@@ -49,6 +58,9 @@ class ForumThread(Base):
     __table_args__ = (
         Index('ix_forum_threads_category_created', 'category_id', 'created_at'),
         Index('ix_forum_threads_user', 'user_id'),
+        Index('ix_forum_threads_hot', 'is_pinned', 'posts_count', 'id'),
+        Index('ix_forum_threads_posts_count_created', 'posts_count', 'created_at', 'id'),
+        Index('ix_forum_threads_search_vector', 'search_vector', postgresql_using='gin'),
     )
     
     def __repr__(self):
@@ -68,6 +80,9 @@ class ForumPost(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     edited_at = Column(DateTime(timezone=True), nullable=True)  # Время последнего редактирования
     
+    # Полнотекстовый индекс content, заполняется триггером в БД
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    
     # Relationships
     thread = relationship("ForumThread", back_populates="posts")
     user = relationship("User", back_populates="forum_posts")
@@ -79,6 +94,7 @@ class ForumPost(Base):
         Index('ix_forum_posts_thread_created', 'thread_id', 'created_at'),
         Index('ix_forum_posts_user', 'user_id'),
         Index('ix_forum_posts_parent', 'parent_id'),
+        Index('ix_forum_posts_search_vector', 'search_vector', postgresql_using='gin'),
     )
     
     def __repr__(self):
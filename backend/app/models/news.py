@@ -1,7 +1,8 @@
 """
 Модель новостей
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.db.database import Base
 import enum
@@ -39,9 +40,10 @@ class News(Base):
     source = Column(String, nullable=False, index=True)  # Домен источника
     
     # Категоризация (через OpenAI)
-    categories = Column(JSON, default=[])  # Список категорий [NewsCategory]
-    tags = Column(JSON, default=[])  # Дополнительные теги
-    target_audience = Column(JSON, default=[])  # Целевая аудитория
+    # JSONB: фильтр .contains() выполняется как @> по GIN индексу
+    categories = Column(JSONB, default=[])  # Список категорий [NewsCategory]
+    tags = Column(JSONB, default=[])  # Дополнительные теги
+    target_audience = Column(JSONB, default=[])  # Целевая аудитория
     priority = Column(SQLEnum(NewsPriority), default=NewsPriority.NORMAL)
     
     # Дата публикации (с исходного сайта)
@@ -59,6 +61,29 @@ class News(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index('ix_news_published_published_at', 'is_published', published_at.desc(), id.desc()),
+        Index('ix_news_categories_gin', 'categories', postgresql_using='gin', postgresql_ops={'categories': 'jsonb_path_ops'}),
+        Index('ix_news_target_audience_gin', 'target_audience', postgresql_using='gin', postgresql_ops={'target_audience': 'jsonb_path_ops'}),
+    )
+
     def __repr__(self):
         return f"<News(id={self.id}, title={self.title[:50]})>"
 
+
+class NewsCategoryCount(Base):
+    """
+    Количество опубликованных новостей по категориям
+
+    Обновляется инкрементально при загрузке новостей (NewsService.bulk_ingest)
+    и пересчитывается целиком задачей refresh_news_category_counts_task.
+    """
+    __tablename__ = "news_category_counts"
+
+    category = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<NewsCategoryCount(category={self.category}, count={self.count})>"
+
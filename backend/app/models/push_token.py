@@ -28,3 +28,19 @@ class AnonymousPushToken(Base):
     def __repr__(self):
         return f"<AnonymousPushToken(id={self.id}, platform={self.platform}, token={self.token[:20]}...)>"
 
+
+
+class PushTicketRecord(Base):
+    """
+    Тикет Expo, ожидающий проверки квитанции (receipt).
+    Квитанции проверяются задачей check_push_receipts, после чего запись удаляется.
+    """
+    __tablename__ = "push_tickets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    ticket_id = Column(String, unique=True, nullable=False)
+    push_token = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<PushTicketRecord(id={self.id}, ticket_id={self.ticket_id})>"
@@ -44,6 +44,31 @@ class CalendarResponse(BaseModel):
         }
 
 
+class CalendarMonthResponse(BaseModel):
+    """События одного месяца"""
+    year: int = Field(..., ge=2020, le=2100)
+    month: int = Field(..., ge=1, le=12)
+    events: List[CalendarEvent] = Field(default_factory=list, description="События месяца по возрастанию даты")
+    total: int = Field(..., description="Количество событий")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "year": 2025,
+                "month": 11,
+                "total": 1,
+                "events": [
+                    {
+                        "date": "03.11.25",
+                        "type": "Статистика",
+                        "title": "Звіт про збирання врожаю сільськогосподарських культур",
+                        "who": ["Агро підприємства", "Фермери"]
+                    }
+                ]
+            }
+        }
+
+
 class AvailablePeriod(BaseModel):
     """Доступный период в календаре"""
     month: int = Field(..., ge=1, le=12)
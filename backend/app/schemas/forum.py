@@ -72,7 +72,8 @@ class ForumThreadResponse(BaseModel):
     category_name: Optional[str] = None
     posts_count: Optional[int] = 0
     likes_count: Optional[int] = 0
-    posts: List['ForumPostResponse'] = []  # Список комментариев с вложенностью
+    posts: List['ForumPostResponse'] = []  # Список комментариев с вложенностью (с posts_limit - первая страница)
+    posts_next_cursor: Optional[str] = None  # Только с posts_limit: GET /threads/{id}/posts?cursor=
     
     class Config:
         from_attributes = True
@@ -91,6 +92,7 @@ class ForumThreadListItem(BaseModel):
     # Дополнительные данные
     author: Optional[ForumThreadAuthor] = None
     posts_count: Optional[int] = 0
+    likes_count: Optional[int] = 0
     last_post_at: Optional[datetime] = None
     
     class Config:
@@ -141,11 +143,18 @@ class ForumPostResponse(BaseModel):
     likes_count: Optional[int] = 0
     is_liked_by_user: Optional[bool] = False  # Лайкнул ли текущий пользователь
     replies: Optional[List['ForumPostResponse']] = []  # Вложенные ответы
+    replies_count: Optional[int] = 0  # Всего прямых ответов (replies может быть неполным)
     
     class Config:
         from_attributes = True
 
 
+class ForumPostPageResponse(BaseModel):
+    """Страница комментариев (курсорная пагинация)"""
+    items: List[ForumPostResponse]
+    next_cursor: Optional[str] = None  # None - больше страниц нет
+
+
 # Обновляем модели для поддержки forward references
 ForumPostResponse.model_rebuild()
 ForumThreadResponse.model_rebuild()
@@ -181,6 +190,8 @@ class ForumSearchResult(BaseModel):
     id: int
     title: Optional[str]  # Для thread
     content: str
+    headline: Optional[str] = None  # Фрагмент с подсветкой совпадений (<b>...</b>)
+    rank: Optional[float] = None  # Релевантность (ts_rank)
     thread_id: Optional[int]  # Для post
     created_at: datetime
     author: Optional[ForumPostAuthor]
@@ -189,5 +200,6 @@ class ForumSearchResult(BaseModel):
 class ForumSearchResponse(BaseModel):
     """Ответ поиска"""
     items: List[ForumSearchResult]
-    total: int
+    total: int  # Количество результатов на странице
+    next_cursor: Optional[str] = None  # None - больше страниц нет
 
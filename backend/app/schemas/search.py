@@ -2,7 +2,8 @@
 Pydantic схемы для Search API
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
+from datetime import datetime
 from enum import Enum
 
 
@@ -55,3 +56,34 @@ class SearchResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class InternalSearchItem(BaseModel):
+    """Документ из поиска по собственному контенту"""
+    type: str  # news, article, thread, post, tax_requisite
+    id: int
+    title: Optional[str] = None  # HTML-экранирован, с подсветкой <b>
+    snippet: Optional[str] = None  # Фрагменты текста (HTML-экранированы) с подсветкой <b>
+    url: Optional[str] = None
+    source: Optional[str] = None
+    categories: List[str] = []
+    region: Optional[str] = None
+    thread_id: Optional[int] = None
+    published_at: Optional[datetime] = None
+    score: float
+
+
+class FacetValue(BaseModel):
+    """Значение фасета и количество документов"""
+    value: str
+    count: int
+
+
+class InternalSearchResponse(BaseModel):
+    """Ответ поиска по собственному контенту"""
+    query: str
+    total: int
+    items: List[InternalSearchItem]
+    facets: Dict[str, List[FacetValue]]  # type, source, category, region
+    page: int
+    page_size: int
@@ -0,0 +1,196 @@
+"""
+Хранилище календаря бухгалтерских отчетов в памяти
+
+all.json загружается один раз и перечитывается только при изменении файла
+(mtime/размер). Даты разбираются при загрузке, события индексируются по дате
+(отсортированный список + bisect), по категории `who` и по месяцам.
+"""
+import json
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.calendar import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+# Путь к директории с календарными данными
+CALENDAR_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "calendar"
+
+# Форматы дат в календаре: DD.MM.YY и DD.MM.YYYY
+DATE_FORMATS = ("%d.%m.%y", "%d.%m.%Y")
+
+
+def parse_event_date(value: str) -> Optional[date]:
+    """Разобрать дату события или вернуть None"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def normalize_who(value: str) -> str:
+    """Ключ индекса категории `who` (без учета регистра и пробелов по краям)"""
+    return value.strip().casefold()
+
+
+@dataclass
+class DateIndex:
+    """События, отсортированные по дате, с параллельным списком дат для bisect"""
+    dates: List[date] = field(default_factory=list)
+    events: List[CalendarEvent] = field(default_factory=list)
+
+    def between(self, start: date, end: date) -> List[CalendarEvent]:
+        return self.events[bisect_left(self.dates, start):bisect_right(self.dates, end)]
+
+
+@dataclass
+class CalendarSnapshot:
+    """Загруженное состояние all.json"""
+    version: Tuple[int, int]
+    events: List[CalendarEvent]
+    by_date: DateIndex
+    by_who: Dict[str, DateIndex]
+    by_month: Dict[Tuple[int, int], List[CalendarEvent]]
+
+
+class CalendarRepository:
+    """Календарь в памяти с перезагрузкой по mtime и индексами по дате, `who` и месяцам"""
+
+    def __init__(self, path: Path = None):
+        self.path = path or CALENDAR_DATA_DIR / "all.json"
+        self._snapshot: Optional[CalendarSnapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        """Версия данных (mtime и размер файла), меняется при обновлении all.json"""
+        mtime_ns, size = self._current().version
+        return f"{mtime_ns}-{size}"
+
+    def all_events(self) -> List[CalendarEvent]:
+        """Все события в порядке файла"""
+        return self._current().events
+
+    def events_between(self, start: date, end: date, who: Optional[str] = None) -> List[CalendarEvent]:
+        """
+        События с датой в диапазоне [start, end] по возрастанию даты
+
+        Args:
+            start: Начальная дата (включительно)
+            end: Конечная дата (включительно)
+            who: Категория плательщика (точное совпадение без учета регистра)
+        """
+        snapshot = self._current()
+
+        if who is None:
+            return snapshot.by_date.between(start, end)
+
+        index = snapshot.by_who.get(normalize_who(who))
+        return index.between(start, end) if index else []
+
+    def find_events(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        who: Optional[str] = None,
+        type: Optional[str] = None,
+    ) -> List[CalendarEvent]:
+        """
+        События с фильтрами по диапазону дат, категории `who` и типу
+
+        Диапазон и `who` выбираются по индексам, тип фильтруется на выбранном срезе.
+        """
+        events = self.events_between(start or date.min, end or date.max, who)
+        if type:
+            type_key = type.strip().casefold()
+            events = [event for event in events if event.type.casefold() == type_key]
+        return events
+
+    def events_on(self, day: date, who: Optional[str] = None) -> List[CalendarEvent]:
+        """События на конкретную дату"""
+        return self.events_between(day, day, who)
+
+    def events_in_month(self, year: int, month: int) -> List[CalendarEvent]:
+        """События месяца по возрастанию даты"""
+        return self._current().by_month.get((year, month), [])
+
+    def periods(self) -> List[Tuple[int, int]]:
+        """Месяцы (год, месяц), в которых есть события, по возрастанию"""
+        return sorted(self._current().by_month)
+
+    def event_dates(self) -> List[date]:
+        """Отсортированные даты всех событий"""
+        return self._current().by_date.dates
+
+    def _current(self) -> CalendarSnapshot:
+        """
+        Актуальный снимок календаря, перечитывает файл при изменении
+
+        Raises:
+            FileNotFoundError: Если файл календаря не найден
+            ValueError: Если файл поврежден или содержит неверные данные
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            logger.warning(f"Calendar file not found: {self.path}")
+            raise FileNotFoundError(f"Файл календаря {self.path.name} не знайдено")
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = self._load(version)
+            return self._snapshot
+
+    def _load(self, version: Tuple[int, int]) -> CalendarSnapshot:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            events = [CalendarEvent(**event) for event in data]
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in {self.path.name}: {e}")
+            raise ValueError("Помилка читання файлу календаря: неправильний формат")
+        except Exception as e:
+            logger.error(f"Error loading calendar {self.path.name}: {e}")
+            raise ValueError(f"Помилка завантаження календаря: {str(e)}")
+
+        dated = []
+        for event in events:
+            event_date = parse_event_date(event.date)
+            if event_date is None:
+                logger.warning(f"Error parsing event date: {event.date}")
+                continue
+            dated.append((event_date, event))
+
+        # Стабильная сортировка: события одной даты остаются в порядке файла
+        dated.sort(key=lambda item: item[0])
+
+        by_date = DateIndex()
+        by_who: Dict[str, DateIndex] = {}
+        by_month: Dict[Tuple[int, int], List[CalendarEvent]] = {}
+        for event_date, event in dated:
+            by_date.dates.append(event_date)
+            by_date.events.append(event)
+            by_month.setdefault((event_date.year, event_date.month), []).append(event)
+            for who in {normalize_who(w) for w in event.who}:
+                index = by_who.setdefault(who, DateIndex())
+                index.dates.append(event_date)
+                index.events.append(event)
+
+        logger.info(f"Loaded {len(events)} events from {self.path.name}")
+        return CalendarSnapshot(version=version, events=events, by_date=by_date, by_who=by_who, by_month=by_month)
+
+
+# Общий экземпляр для API и Celery задач
+calendar_repository = CalendarRepository()
@@ -0,0 +1,141 @@
+"""
+Кеш результатов классификации новостей OpenAI
+
+Одна и та же новость часто публикуется на нескольких сайтах (minfin, liga.net,
+buhgalter911, dtkt), поэтому вердикт кешируется по хешу нормализованного
+заголовка и повторно не запрашивается у OpenAI.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Поля вердикта, которые сохраняются в кеше
+VERDICT_FIELDS = ('is_relevant', 'target_audience', 'category', 'summary')
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]+', re.UNICODE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_title(title: str) -> str:
+    """Заголовок без регистра, пунктуации (кавычки, тире) и лишних пробелов"""
+    title = _PUNCTUATION_RE.sub(' ', title.lower())
+    return _WHITESPACE_RE.sub(' ', title).strip()
+
+
+class ClassificationCache:
+    """
+    Кеш вердиктов классификации в Redis
+
+    Ключ: news_cls:{model}:{sha256(нормализованный заголовок)}
+    Значение: JSON с полями вердикта и моделью, TTL - NEWS_CLASSIFY_CACHE_TTL.
+    Ошибки Redis не прерывают загрузку новостей - запрос считается промахом.
+    """
+
+    KEY_PREFIX = 'news_cls'
+    STATS_KEY = 'news_cls:stats'
+
+    def __init__(self, redis_url: str = None, ttl: int = None):
+        self.redis = redis.from_url(redis_url or settings.REDIS_URL, decode_responses=True)
+        self.ttl = ttl or settings.NEWS_CLASSIFY_CACHE_TTL
+
+    def make_key(self, title: str, model: str) -> str:
+        digest = hashlib.sha256(normalize_title(title).encode()).hexdigest()
+        return f"{self.KEY_PREFIX}:{model}:{digest}"
+
+    def get_many(self, titles: List[str], model: str) -> List[Optional[Dict]]:
+        """
+        Получить вердикты для заголовков одним MGET
+
+        Returns:
+            Список той же длины: вердикт или None при промахе
+        """
+        if not titles:
+            return []
+
+        try:
+            values = self.redis.mget([self.make_key(title, model) for title in titles])
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Classification cache unavailable: {e}")
+            return [None] * len(titles)
+
+        verdicts = []
+        for value in values:
+            verdict = json.loads(value) if value else None
+            # Вердикт другой модели не используем
+            if verdict and verdict.get('model') != model:
+                verdict = None
+            verdicts.append(verdict)
+
+        hits = sum(1 for verdict in verdicts if verdict)
+        self._count(hits, len(titles) - hits)
+        return verdicts
+
+    def set_many(self, verdicts: Dict[str, Dict], model: str) -> None:
+        """
+        Сохранить вердикты
+
+        Args:
+            verdicts: {заголовок: результат классификации}
+            model: Модель, выполнившая классификацию
+        """
+        if not verdicts:
+            return
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for title, result in verdicts.items():
+                value = {field: result.get(field) for field in VERDICT_FIELDS}
+                value['model'] = model
+                pipe.setex(self.make_key(title, model), self.ttl, json.dumps(value, ensure_ascii=False))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to store classification verdicts: {e}")
+
+    async def aget_many(self, titles: List[str], model: str) -> List[Optional[Dict]]:
+        """get_many() для async кода: Redis в потоке, не блокирует event loop"""
+        return await asyncio.to_thread(self.get_many, titles, model)
+
+    async def aset_many(self, verdicts: Dict[str, Dict], model: str) -> None:
+        """set_many() для async кода"""
+        await asyncio.to_thread(self.set_many, verdicts, model)
+
+    def _count(self, hits: int, misses: int) -> None:
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if hits:
+                pipe.hincrby(self.STATS_KEY, 'hits', hits)
+            if misses:
+                pipe.hincrby(self.STATS_KEY, 'misses', misses)
+            pipe.execute()
+        except redis.RedisError:
+            pass
+
+    def stats(self) -> Dict:
+        """Счетчики попаданий: hits, misses, hit_rate"""
+        try:
+            counters = self.redis.hgetall(self.STATS_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Classification cache unavailable: {e}")
+            counters = {}
+
+        hits = int(counters.get('hits', 0))
+        misses = int(counters.get('misses', 0))
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+        }
+
+
+# Экземпляр кеша для использования
+classification_cache = ClassificationCache()
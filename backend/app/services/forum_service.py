@@ -0,0 +1,112 @@
+"""
+Сервис денормализованных счетчиков форума
+"""
+from typing import Iterable, Optional
+import logging
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.forum import ForumLike, ForumPost, ForumThread
+
+logger = logging.getLogger(__name__)
+
+
+class ForumService:
+    """
+    Счетчики топиков: posts_count, last_post_at, likes_count
+
+    Методы не коммитят: изменения счетчиков попадают в транзакцию
+    вызывающего кода вместе с самим постом/лайком.
+    """
+
+    @staticmethod
+    def post_created(db: Session, thread_id: int) -> None:
+        """Атомарно учесть новый комментарий в топике"""
+        db.execute(
+            update(ForumThread)
+            .where(ForumThread.id == thread_id)
+            .values(
+                posts_count=ForumThread.posts_count + 1,
+                last_post_at=func.now(),
+                # Счетчики - не редактирование топика: onupdate не применяем
+                updated_at=ForumThread.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def like_toggled(db: Session, thread_id: int, delta: int) -> None:
+        """Атомарно изменить количество лайков топика на delta (+1/-1)"""
+        db.execute(
+            update(ForumThread)
+            .where(ForumThread.id == thread_id)
+            .values(
+                likes_count=ForumThread.likes_count + delta,
+                updated_at=ForumThread.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def refresh_thread_counters(db: Session, thread_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Пересчитать счетчики по таблицам постов и лайков
+
+        Используется после удаления комментариев (вместе с ними удаляются
+        лайки и, в зависимости от каскада, ответы) и задачей восстановления.
+
+        Args:
+            db: Сессия БД
+            thread_ids: Топики для пересчета (None - все)
+
+        Returns:
+            Количество обновленных топиков
+        """
+        posts_count = (
+            select(func.count(ForumPost.id))
+            .where(ForumPost.thread_id == ForumThread.id)
+            .scalar_subquery()
+        )
+        last_post_at = (
+            select(func.max(ForumPost.created_at))
+            .where(ForumPost.thread_id == ForumThread.id)
+            .scalar_subquery()
+        )
+        likes_count = (
+            select(func.count(ForumLike.id))
+            .join(ForumPost, ForumPost.id == ForumLike.post_id)
+            .where(ForumPost.thread_id == ForumThread.id)
+            .scalar_subquery()
+        )
+
+        # Обновляем только разошедшиеся топики, чтобы не переписывать
+        # каждую строку при каждом запуске задачи восстановления
+        stmt = (
+            update(ForumThread)
+            .where(
+                or_(
+                    ForumThread.posts_count.is_distinct_from(posts_count),
+                    ForumThread.likes_count.is_distinct_from(likes_count),
+                    ForumThread.last_post_at.is_distinct_from(last_post_at),
+                )
+            )
+            .values(
+                posts_count=posts_count,
+                last_post_at=last_post_at,
+                likes_count=likes_count,
+                updated_at=ForumThread.updated_at,
+            )
+        )
+        if thread_ids is not None:
+            thread_ids = list(set(thread_ids))
+            if not thread_ids:
+                return 0
+            stmt = stmt.where(ForumThread.id.in_(thread_ids))
+
+        result = db.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+
+
+# Экземпляр сервиса для использования
+forum_service = ForumService()
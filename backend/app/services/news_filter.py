@@ -1,48 +1,40 @@
 """
 Сервис для фильтрации новостей через OpenAI API
 """
+import asyncio
+import json
+from typing import List, Dict, Optional
+
 import openai
-from typing import List, Dict
+
 from app.core.config import settings
+from app.services.classification_cache import classification_cache
 
 
-async def filter_relevant_news(articles: List[Dict]) -> List[Dict]:
-    """
-    Фильтрация новостей через OpenAI API
-    
-    Args:
-        articles: Список статей с полями title, url, source
-    
-    Returns:
-        Список релевантных статей с добавленными полями:
-        - is_relevant: bool
-        - target_audience: List[str] (ФОП, ЮО, бухгалтери)
-        - category: str (податки, звітність, законодавство, тощо)
-        - summary: str (короткий опис)
-    """
-    api_key = settings.OPENAI_API_KEY
-    
-    if not api_key:
-        print("⚠️ OpenAI API Key not configured, skipping filtering")
-        # Возвращаем все статьи как релевантные
-        return [
-            {
-                **article,
-                'is_relevant': True,
-                'target_audience': ['ФОП', 'ЮО', 'бухгалтери'],
-                'category': 'загальне',
-                'summary': article['title']
-            }
-            for article in articles
-        ]
-    
-    # Формируем запрос для OpenAI
+NEWS_FILTER_MODEL = "gpt-4o-mini"  # Более дешевая модель
+
+SYSTEM_PROMPT = "Ти - експерт з бухгалтерського обліку та оподаткування в Україні. Відповідай тільки у форматі JSON."
+
+
+def _fallback_relevant(article: Dict) -> Dict:
+    """Статья без классификации считается релевантной для всех аудиторий"""
+    return {
+        **article,
+        'is_relevant': True,
+        'target_audience': ['ФОП', 'ЮО', 'бухгалтери'],
+        'category': 'загальне',
+        'summary': article['title']
+    }
+
+
+def _build_prompt(articles: List[Dict]) -> str:
+    """Промпт классификации для одного чанка статей (нумерация с 1)"""
     articles_text = "\n".join([
         f"{i+1}. {article['title']}"
         for i, article in enumerate(articles)
     ])
     
-    prompt = f"""Ти - експерт з бухгалтерського обліку та оподаткування в Україні.
+    return f"""Ти - експерт з бухгалтерського обліку та оподаткування в Україні.
 
 Проаналізуй наступні новини та визнач, які з них будуть корисні для нашої аудиторії:
 - ФОП (фізичні особи-підприємці)
@@ -75,100 +67,174 @@ async def filter_relevant_news(articles: List[Dict]) -> List[Dict]:
 
 Поверни масив JSON об'єктів, по одному для кожної новини."""
 
-    try:
-        client = openai.AsyncOpenAI(api_key=api_key)
-        
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",  # Более дешевая модель
-            messages=[
+
+def _extract_results(result_text: str) -> List[Dict]:
+    """Достать массив результатов из JSON ответа OpenAI"""
+    parsed = json.loads(result_text)
+    
+    # OpenAI может обернуть в объект с ключом "news" или "results"
+    if isinstance(parsed, list):
+        return parsed
+    if 'news' in parsed:
+        return parsed['news']
+    if 'results' in parsed:
+        return parsed['results']
+    
+    # Если это объект, пытаемся найти первое поле-массив
+    for value in parsed.values():
+        if isinstance(value, list):
+            return value
+    return []
+
+
+def _enrich(article: Dict, filter_result: Optional[Dict]) -> Dict:
+    """Объединить статью с результатом классификации"""
+    if filter_result:
+        return {
+            **article,
+            'is_relevant': filter_result.get('is_relevant', False),
+            'target_audience': filter_result.get('target_audience', []),
+            'category': filter_result.get('category', 'інше'),
+            'summary': filter_result.get('summary', article['title'])
+        }
+    
+    # Если не нашли, считаем нерелевантной
+    return {
+        **article,
+        'is_relevant': False,
+        'target_audience': [],
+        'category': 'інше',
+        'summary': article['title']
+    }
+
+
+async def _classify_chunk(
+    client: openai.AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    chunk: List[Dict],
+) -> List[Dict]:
+    """
+    Классифицировать один чанк статей с повторами при ошибке
+    
+    Args:
+        client: Клиент OpenAI
+        semaphore: Ограничение числа одновременных запросов
+        chunk: Статьи чанка
+    
+    Returns:
+        Статьи чанка в исходном порядке с полями классификации.
+        Если все попытки неудачны - статьи чанка помечаются релевантными.
+    """
+    max_retries = settings.NEWS_CLASSIFY_MAX_RETRIES
+    
+    for attempt in range(1, max_retries + 1):
+        try:
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model=NEWS_FILTER_MODEL,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": _build_prompt(chunk)}
+                    ],
+                    temperature=0.3,
+                    response_format={"type": "json_object"}
+                )
+            
+            filtered_results = _extract_results(response.choices[0].message.content)
+            
+            # Индекс результатов по номеру статьи
+            by_number = {}
+            for r in filtered_results:
+                if isinstance(r, dict):
+                    by_number.setdefault(r.get('number'), r)
+            
+            enriched = [_enrich(article, by_number.get(i + 1)) for i, article in enumerate(chunk)]
+            
+            # Кешируем только статьи, для которых модель вернула вердикт
+            await classification_cache.aset_many(
                 {
-                    "role": "system",
-                    "content": "Ти - експерт з бухгалтерського обліку та оподаткування в Україні. Відповідай тільки у форматі JSON."
+                    article['title']: result
+                    for i, (article, result) in enumerate(zip(chunk, enriched))
+                    if (i + 1) in by_number
                 },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
-        
-        # Парсим ответ
-        import json
-        result_text = response.choices[0].message.content
-        
-        # OpenAI может обернуть в объект с ключом "news" или "results"
-        parsed = json.loads(result_text)
-        
-        # Находим массив с результатами
-        if 'news' in parsed:
-            filtered_results = parsed['news']
-        elif 'results' in parsed:
-            filtered_results = parsed['results']
-        elif isinstance(parsed, list):
-            filtered_results = parsed
-        else:
-            # Если это объект, пытаемся найти первое поле-массив
-            for value in parsed.values():
-                if isinstance(value, list):
-                    filtered_results = value
-                    break
-            else:
-                filtered_results = []
-        
-        # Объединяем оригинальные статьи с результатами фильтрации
-        enriched_articles = []
-        for article in articles:
-            # Ищем соответствующий результат по номеру
-            article_number = articles.index(article) + 1
-            filter_result = next(
-                (r for r in filtered_results if r.get('number') == article_number),
-                None
+                NEWS_FILTER_MODEL,
             )
-            
-            if filter_result:
-                enriched_article = {
-                    **article,
-                    'is_relevant': filter_result.get('is_relevant', False),
-                    'target_audience': filter_result.get('target_audience', []),
-                    'category': filter_result.get('category', 'інше'),
-                    'summary': filter_result.get('summary', article['title'])
-                }
-            else:
-                # Если не нашли, считаем нерелевантной
-                enriched_article = {
-                    **article,
-                    'is_relevant': False,
-                    'target_audience': [],
-                    'category': 'інше',
-                    'summary': article['title']
-                }
-            
-            enriched_articles.append(enriched_article)
-        
-        # Фильтруем только релевантные
-        relevant_articles = [a for a in enriched_articles if a['is_relevant']]
+            return enriched
         
-        print(f"✅ OpenAI filtered: {len(relevant_articles)}/{len(articles)} relevant articles")
-        return relevant_articles
+        except Exception as e:
+            print(f"❌ OpenAI chunk filtering error (attempt {attempt}/{max_retries}): {e}")
+            if attempt < max_retries:
+                await asyncio.sleep(settings.NEWS_CLASSIFY_RETRY_BACKOFF * 2 ** (attempt - 1))
+    
+    # В случае ошибки возвращаем статьи только этого чанка как релевантные
+    print(f"⚠️ Chunk of {len(chunk)} articles marked relevant without classification")
+    return [_fallback_relevant(article) for article in chunk]
+
+
+async def filter_relevant_news(articles: List[Dict]) -> List[Dict]:
+    """
+    Фильтрация новостей через OpenAI API
+    
+    Заголовки разбиваются на чанки по NEWS_CLASSIFY_CHUNK_SIZE, чанки
+    классифицируются параллельно (не более NEWS_CLASSIFY_CONCURRENCY
+    запросов одновременно). Ошибка затрагивает только свой чанк.
+    Заголовки, уже классифицированные ранее (в т.ч. на других источниках),
+    берутся из classification_cache без запроса к OpenAI.
+    
+    Args:
+        articles: Список статей с полями title, url, source
+    
+    Returns:
+        Список релевантных статей с добавленными полями:
+        - is_relevant: bool
+        - target_audience: List[str] (ФОП, ЮО, бухгалтери)
+        - category: str (податки, звітність, законодавство, тощо)
+        - summary: str (короткий опис)
+    """
+    api_key = settings.OPENAI_API_KEY
+    
+    if not api_key:
+        print("⚠️ OpenAI API Key not configured, skipping filtering")
+        # Возвращаем все статьи как релевантные
+        return [_fallback_relevant(article) for article in articles]
+    
+    if not articles:
+        return []
+    
+    cached = await classification_cache.aget_many([a['title'] for a in articles], NEWS_FILTER_MODEL)
+    enriched_articles = [
+        _enrich(article, verdict)
+        for article, verdict in zip(articles, cached)
+        if verdict
+    ]
+    uncached = [article for article, verdict in zip(articles, cached) if not verdict]
+    
+    chunk_size = settings.NEWS_CLASSIFY_CHUNK_SIZE
+    chunks = [uncached[i:i + chunk_size] for i in range(0, len(uncached), chunk_size)]
+    
+    if chunks:
+        # Повторы выполняются в _classify_chunk, встроенные повторы клиента отключены
+        client = openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+        semaphore = asyncio.Semaphore(settings.NEWS_CLASSIFY_CONCURRENCY)
         
-    except Exception as e:
-        print(f"❌ OpenAI filtering error: {e}")
-        import traceback
-        traceback.print_exc()
+        try:
+            chunk_results = await asyncio.gather(
+                *(_classify_chunk(client, semaphore, chunk) for chunk in chunks)
+            )
+        finally:
+            await client.close()
         
-        # В случае ошибки возвращаем все статьи
-        return [
-            {
-                **article,
-                'is_relevant': True,
-                'target_audience': ['ФОП', 'ЮО', 'бухгалтери'],
-                'category': 'загальне',
-                'summary': article['title']
-            }
-            for article in articles
-        ]
+        for chunk in chunk_results:
+            enriched_articles.extend(chunk)
+    
+    # Фильтруем только релевантные
+    relevant_articles = [a for a in enriched_articles if a['is_relevant']]
+    
+    print(
+        f"✅ OpenAI filtered: {len(relevant_articles)}/{len(articles)} relevant articles "
+        f"({len(articles) - len(uncached)} from cache, {len(chunks)} chunks)"
+    )
+    return relevant_articles
 
 
 class NewsFilterService:
@@ -183,7 +249,6 @@ class NewsFilterService:
         """
         Синхронная обертка для async filter_relevant_news()
         """
-        import asyncio
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
@@ -0,0 +1,279 @@
+"""
+Единый pipeline загрузки новостей из внешних источников
+
+Этапы: fetch → normalize → dedupe → classify (OpenAI) → save
+Используется и HTTP endpoints (/api/news/crawl/*), и Celery задачами краулеров.
+"""
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.news_filter import filter_relevant_news
+from app.services.news_service import news_service
+from app.services.minfin_crawler import crawl_minfin
+from app.services.liga_net_crawler import crawl_liga_net
+from app.services.buhgalter911_crawler import crawl_buhgalter911
+from app.services.tax_gov_ua_crawler import crawl_tax_gov_ua
+from app.crawlers.tax_gov_ua_playwright import crawl_tax_gov_ua as crawl_tax_gov_ua_playwright
+from app.crawlers.diia_gov_ua_playwright import crawl_diia_gov_ua as crawl_diia_gov_ua_playwright
+from app.crawlers.dtkt_crawler import crawl_dtkt
+from app.crawlers.buhplatforma_crawler import crawl_buhplatforma
+from app.crawlers.seveneminar_crawler import crawl_7eminar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY = 'загальне'
+
+
+class NewsSourceAdapter:
+    """
+    Адаптер источника новостей
+
+    Инкапсулирует особенности источника: как получить список статей,
+    откуда брать текст и дату публикации.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        fetch: Callable[[], Awaitable[List]],
+        content_field: str = 'summary',
+    ):
+        """
+        Args:
+            source: Домен источника (значение News.source по умолчанию)
+            fetch: Корутина краулера, возвращающая список dict или объектов с to_dict()
+            content_field: Поле статьи для content/summary (после классификации)
+        """
+        self.source = source
+        self._fetch = fetch
+        self.content_field = content_field
+
+    async def fetch(self) -> List[Dict]:
+        """Получить сырые статьи источника в виде словарей"""
+        items = await self._fetch()
+        return [item.to_dict() if hasattr(item, 'to_dict') else item for item in items]
+
+    def normalize(self, raw: Dict) -> Optional[Dict]:
+        """
+        Привести статью к общему виду
+
+        Returns:
+            Словарь с гарантированными title, url, source, published_at
+            или None, если статья не пригодна для сохранения
+        """
+        title = (raw.get('title') or '').strip()
+        url = (raw.get('url') or '').strip()
+
+        if not title or not url:
+            return None
+
+        return {
+            **raw,
+            'title': title,
+            'url': url,
+            'source': raw.get('source') or self.source,
+            'published_at': self.parse_published_at(raw),
+        }
+
+    @staticmethod
+    def parse_published_at(raw: Dict) -> datetime:
+        """Дата публикации из published_date (ISO) или текущее время"""
+        value = raw.get('published_date')
+        if value:
+            try:
+                return datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                pass
+        return datetime.utcnow()
+
+    def to_news_row(self, article: Dict) -> Dict:
+        """Значения колонок News для классифицированной статьи"""
+        text = article.get(self.content_field) or article.get('summary') or article['title']
+        return {
+            'title': article['title'],
+            'url': article['url'],
+            'source': article['source'],
+            'content': text,
+            'summary': text,
+            'categories': [article.get('category') or DEFAULT_CATEGORY],
+            'target_audience': article.get('target_audience', []),
+            'published_at': article['published_at'],
+        }
+
+
+# Зарегистрированные источники новостей
+NEWS_SOURCE_ADAPTERS: Dict[str, NewsSourceAdapter] = {
+    'minfin': NewsSourceAdapter('minfin.com.ua', crawl_minfin),
+    'liga_net': NewsSourceAdapter('liga.net', crawl_liga_net),
+    'buhgalter911': NewsSourceAdapter('buhgalter911.com', crawl_buhgalter911),
+    'tax_gov_ua': NewsSourceAdapter('tax.gov.ua', crawl_tax_gov_ua),
+    'tax_gov_ua_playwright': NewsSourceAdapter('tax.gov.ua', crawl_tax_gov_ua_playwright),
+    'diia_gov_ua_playwright': NewsSourceAdapter('diia.gov.ua', crawl_diia_gov_ua_playwright),
+    'dtkt': NewsSourceAdapter('dtkt.ua', crawl_dtkt),
+    'buhplatforma': NewsSourceAdapter('buhplatforma.com.ua', crawl_buhplatforma, content_field='description'),
+    '7eminar': NewsSourceAdapter('7eminar.ua', crawl_7eminar, content_field='description'),
+}
+
+
+async def _run_in_thread(func: Callable, *args):
+    """
+    Выполнить синхронный этап с БД в потоке
+
+    При отмене (таймаут источника, разрыв HTTP-запроса) дожидается
+    завершения потока: вызывающий код делает rollback()/close() сессии
+    только после того, как поток перестал ее использовать.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait({future})
+        raise
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    """Накопить время выполнения этапа в timings[stage]"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+class NewsIngestionPipeline:
+    """
+    Pipeline загрузки новостей одного источника
+
+    Статьи после нормализации и удаления дубликатов (внутри обхода и уже
+    сохраненных в БД) проходят классификацию и сохранение батчами
+    по batch_size, каждый батч коммитится отдельно.
+    Запросы к БД (синхронная Session) выполняются в потоке, чтобы
+    не блокировать event loop API и воркера.
+    """
+
+    STAGES = ('fetch', 'normalize', 'dedupe', 'classify', 'save')
+
+    def __init__(self, adapter: NewsSourceAdapter, batch_size: Optional[int] = None):
+        self.adapter = adapter
+        self.batch_size = batch_size or settings.NEWS_INGEST_BATCH_SIZE
+
+    async def run(self, db: Session) -> Dict:
+        """
+        Выполнить загрузку новостей источника
+
+        Args:
+            db: Сессия БД
+
+        Returns:
+            Статистика: parsed, already_known, filtered, saved, skipped и timings по этапам
+        """
+        timings = {stage: 0.0 for stage in self.STAGES}
+
+        with _timed(timings, 'fetch'):
+            raw_articles = await self.adapter.fetch()
+
+        logger.info(f"📰 Crawled {len(raw_articles)} news items from {self.adapter.source}")
+
+        if not raw_articles:
+            return self._result('warning', 0, 0, 0, 0, 0, timings)
+
+        with _timed(timings, 'normalize'):
+            articles = [a for a in (self.adapter.normalize(raw) for raw in raw_articles) if a]
+
+        with _timed(timings, 'dedupe'):
+            articles = self._dedupe_by_url(articles)
+            # Уже сохраненные статьи не отправляем в OpenAI
+            known_urls = await _run_in_thread(
+                news_service.find_existing_urls, db, [a['url'] for a in articles]
+            )
+            articles = [a for a in articles if a['url'] not in known_urls]
+
+        if known_urls:
+            logger.info(
+                f"⏭️ {len(known_urls)} articles from {self.adapter.source} already saved, "
+                f"{len(articles)} sent to classification"
+            )
+
+        filtered_count = 0
+        saved_count = 0
+        skipped_count = 0
+
+        for start in range(0, len(articles), self.batch_size):
+            batch = articles[start:start + self.batch_size]
+
+            with _timed(timings, 'classify'):
+                relevant = await filter_relevant_news(batch)
+            filtered_count += len(relevant)
+
+            if not relevant:
+                continue
+
+            with _timed(timings, 'save'):
+                saved, skipped = await _run_in_thread(self._save_batch, db, relevant)
+            saved_count += saved
+            skipped_count += skipped
+
+        result = self._result(
+            'success', len(raw_articles), len(known_urls), filtered_count, saved_count, skipped_count, timings
+        )
+        logger.info(f"✅ Ingestion finished for {self.adapter.source}: {result}")
+        return result
+
+    @staticmethod
+    def _dedupe_by_url(articles: List[Dict]) -> List[Dict]:
+        """Убрать повторы URL внутри одного обхода (сохраняя порядок)"""
+        unique = {}
+        for article in articles:
+            unique.setdefault(article['url'], article)
+        return list(unique.values())
+
+    def _save_batch(self, db: Session, articles: List[Dict]):
+        """
+        Сохранить батч статей, пропуская уже существующие URL
+
+        Returns:
+            (saved, skipped)
+        """
+        stats = news_service.bulk_ingest(db, [self.adapter.to_news_row(a) for a in articles])
+        return stats['saved'], stats['skipped']
+
+    def _result(
+        self,
+        status: str,
+        parsed: int,
+        already_known: int,
+        filtered: int,
+        saved: int,
+        skipped: int,
+        timings: Dict[str, float],
+    ) -> Dict:
+        return {
+            'status': status,
+            'source': self.adapter.source,
+            'parsed': parsed,
+            'already_known': already_known,  # Уже в БД, классификация не выполнялась
+            'filtered': filtered,
+            'saved': saved,
+            'skipped': skipped,
+            'timings': {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        }
+
+
+async def ingest_news_source(source_key: str, db: Session) -> Dict:
+    """
+    Загрузить новости зарегистрированного источника
+
+    Args:
+        source_key: Ключ из NEWS_SOURCE_ADAPTERS
+        db: Сессия БД
+    """
+    adapter = NEWS_SOURCE_ADAPTERS[source_key]
+    return await NewsIngestionPipeline(adapter).run(db)
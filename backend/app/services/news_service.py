@@ -0,0 +1,158 @@
+"""
+Сервис для массовых операций с новостями
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+import logging
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.news import News, NewsCategoryCount
+from app.services.response_cache import NEWS_TAG, response_cache
+from app.services.search_index import NEWS_DOC, schedule_index
+
+logger = logging.getLogger(__name__)
+
+
+# Агрегация категорий опубликованных новостей на стороне PostgreSQL.
+# UPSERT вместо DELETE + INSERT: строки таблицы не исчезают на время пересчета,
+# категории, которых больше нет, удаляются после (updated_at старше транзакции)
+REFRESH_CATEGORY_COUNTS_SQL = """
+    INSERT INTO news_category_counts (category, count, updated_at)
+    SELECT category, COUNT(DISTINCT news.id), now()
+    FROM news
+    CROSS JOIN LATERAL jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(news.categories::jsonb) = 'array' THEN news.categories::jsonb ELSE '[]'::jsonb END
+    ) AS category
+    WHERE news.is_published IS TRUE
+    GROUP BY category
+    ON CONFLICT (category) DO UPDATE SET count = EXCLUDED.count, updated_at = EXCLUDED.updated_at
+"""
+DELETE_STALE_CATEGORY_COUNTS_SQL = "DELETE FROM news_category_counts WHERE updated_at < now()"
+
+# Advisory lock news_category_counts: загрузки берут его разделяемым (идут
+# параллельно), полный пересчет - эксклюзивным (не пересекается с загрузками)
+CATEGORY_COUNTS_LOCK_ID = 7_302_501
+
+
+class NewsService:
+    """Массовая загрузка новостей без запросов на каждую строку"""
+
+    @staticmethod
+    def find_existing_urls(db: Session, urls: Iterable[str]) -> Set[str]:
+        """
+        Найти уже сохраненные URL одним запросом
+
+        Args:
+            db: Сессия БД
+            urls: URL для проверки
+
+        Returns:
+            Множество URL, которые уже есть в таблице news
+        """
+        urls = list(set(urls))
+        if not urls:
+            return set()
+
+        return {url for (url,) in db.query(News.url).filter(News.url.in_(urls)).all()}
+
+    @staticmethod
+    def bulk_ingest(db: Session, rows: List[Dict]) -> Dict[str, int]:
+        """
+        Сохранить пачку новостей одним INSERT ... ON CONFLICT (url) DO NOTHING
+
+        Дубликаты по URL (как уже сохраненные, так и повторы внутри пачки)
+        пропускаются на стороне PostgreSQL, без предварительных SELECT.
+        Счетчики news_category_counts обновляются в той же транзакции
+        по категориям реально вставленных опубликованных строк.
+
+        Args:
+            db: Сессия БД
+            rows: Значения колонок News (title, url, source, content, ...)
+
+        Returns:
+            {'saved': int, 'skipped': int}
+        """
+        if not rows:
+            return {'saved': 0, 'skipped': 0}
+
+        stmt = (
+            pg_insert(News)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[News.url])
+            .returning(News.id, News.categories, News.is_published)
+        )
+
+        try:
+            db.execute(text("SELECT pg_advisory_xact_lock_shared(:lock_id)"), {'lock_id': CATEGORY_COUNTS_LOCK_ID})
+            inserted = db.execute(stmt).all()
+            # Счетчики - только по опубликованным, как в списке новостей
+            NewsService._increment_category_counts(
+                db,
+                Counter(
+                    cat
+                    for _, categories, is_published in inserted if is_published
+                    for cat in set(categories or [])
+                ),
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        saved = len(inserted)
+        if saved:
+            response_cache.invalidate(NEWS_TAG)
+            schedule_index(NEWS_DOC, [row.id for row in inserted])
+        logger.info(f"💾 Bulk ingest: saved {saved}, skipped {len(rows) - saved}")
+        return {'saved': saved, 'skipped': len(rows) - saved}
+
+    @staticmethod
+    def _increment_category_counts(db: Session, counts: Counter) -> None:
+        """Прибавить количество новых новостей к счетчикам категорий (UPSERT)"""
+        if not counts:
+            return
+
+        # Сортировка задает одинаковый порядок блокировок строк для параллельных загрузок
+        stmt = pg_insert(NewsCategoryCount).values(
+            [{'category': category, 'count': count} for category, count in sorted(counts.items())]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NewsCategoryCount.category],
+            set_={
+                'count': NewsCategoryCount.count + stmt.excluded.count,
+                'updated_at': func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def refresh_category_counts(db: Session) -> int:
+        """
+        Пересчитать news_category_counts целиком по таблице news
+
+        Исправляет расхождения после ручных изменений новостей. Выполняется
+        под эксклюзивным advisory lock: загрузки новостей ждут окончания пересчета.
+
+        Returns:
+            Количество категорий
+        """
+        try:
+            db.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {'lock_id': CATEGORY_COUNTS_LOCK_ID})
+            result = db.execute(text(REFRESH_CATEGORY_COUNTS_SQL))
+            db.execute(text(DELETE_STALE_CATEGORY_COUNTS_SQL))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        response_cache.invalidate(NEWS_TAG)
+
+        logger.info(f"📊 Refreshed news category counts: {result.rowcount} categories")
+        return result.rowcount
+
+
+# Экземпляр сервиса для использования
+news_service = NewsService()
@@ -1,17 +1,26 @@
 """
 Сервис для работы с push-уведомлениями через Expo Push Notification Service
 """
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Iterable, Optional, Any, Tuple
 from exponent_server_sdk import (
     DeviceNotRegisteredError,
     PushClient,
     PushMessage,
     PushServerError,
+    PushTicket,
     PushTicketError,
 )
 from requests.exceptions import ConnectionError, HTTPError
+from sqlalchemy import and_, delete, exists, insert, or_, select, update
 from sqlalchemy.orm import Session
 import logging
+import queue
+import threading
+import time
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +30,7 @@ class PushNotificationService:
     
     def __init__(self):
         self.client = PushClient()
+        self._local = threading.local()
     
     def send_push_notification(
         self,
@@ -127,6 +137,9 @@ class PushNotificationService:
         """
         Отправить несколько push-уведомлений batch-ом
         
+        Сообщения делятся на чанки по PUSH_CHUNK_SIZE (лимит Expo), которые
+        отправляются параллельно (до PUSH_SEND_CONCURRENCY) с повторами.
+        
         Args:
             notifications: Список уведомлений в формате:
                 [
@@ -170,39 +183,208 @@ class PushNotificationService:
             )
             messages.append((message, push_token))
         
-        # Отправляем batch
-        try:
-            if messages:
-                responses = self.client.publish_multiple([msg for msg, _ in messages])
-                
-                # Обрабатываем ответы
-                for (message, push_token), response in zip(messages, responses):
-                    if response.is_success():
-                        logger.info(f"Push notification sent successfully to {push_token}")
-                        results.append({
-                            "success": True,
-                            "push_token": push_token,
-                            "ticket_id": response.id
-                        })
-                    else:
-                        logger.error(f"Push notification failed for {push_token}: {response.message}")
-                        results.append({
-                            "success": False,
-                            "error": response.message,
-                            "push_token": push_token
-                        })
-        except Exception as e:
-            logger.error(f"Error sending batch push notifications: {e}")
-            # Добавляем ошибки для оставшихся сообщений
-            for message, push_token in messages:
+        if not messages:
+            return results
+        
+        # Делим на чанки Expo и отправляем параллельно
+        chunk_size = settings.PUSH_CHUNK_SIZE
+        chunks = [messages[i:i + chunk_size] for i in range(0, len(messages), chunk_size)]
+        
+        if len(chunks) == 1:
+            results.extend(self._send_chunk(chunks[0]))
+        else:
+            workers = min(settings.PUSH_SEND_CONCURRENCY, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for chunk_results in executor.map(self._send_chunk, chunks):
+                    results.extend(chunk_results)
+        
+        return results
+    
+    def _send_chunk(self, chunk: List[Tuple[PushMessage, str]]) -> List[Dict[str, Any]]:
+        """
+        Отправить один чанк (до PUSH_CHUNK_SIZE сообщений) с повторами
+        
+        Повторяются только временные ошибки (сеть, 429, 5xx). Если чанк так и
+        не ушел, неудачными помечаются только его сообщения.
+        """
+        error = None
+        for attempt in range(1, settings.PUSH_SEND_MAX_RETRIES + 1):
+            try:
+                responses = self._get_client().publish_multiple([msg for msg, _ in chunk])
+                break
+            except Exception as e:
+                error = e
+                if not self._is_retryable(e) or attempt == settings.PUSH_SEND_MAX_RETRIES:
+                    logger.error(f"Error sending push chunk ({len(chunk)} messages): {e}")
+                    return [
+                        {"success": False, "error": str(e), "push_token": push_token}
+                        for _, push_token in chunk
+                    ]
+                delay = settings.PUSH_SEND_RETRY_BACKOFF * 2 ** (attempt - 1)
+                logger.warning(f"⚠️ Push chunk failed (attempt {attempt}), retrying in {delay:.1f}s: {error}")
+                time.sleep(delay)
+        
+        # Обрабатываем ответы
+        results = []
+        for (message, push_token), response in zip(chunk, responses):
+            if response.is_success():
                 results.append({
+                    "success": True,
+                    "push_token": push_token,
+                    "ticket_id": response.id
+                })
+            else:
+                logger.error(f"Push notification failed for {push_token}: {response.message}")
+                result = {
                     "success": False,
-                    "error": str(e),
+                    "error": response.message,
                     "push_token": push_token
-                })
+                }
+                if (response.details or {}).get("error") == PushTicket.ERROR_DEVICE_NOT_REGISTERED:
+                    result["should_remove_token"] = True  # Токен устарел, нужно удалить из БД
+                results.append(result)
         
+        logger.info(f"Push chunk sent: {sum(1 for r in results if r['success'])}/{len(chunk)} successful")
         return results
     
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Временная ли ошибка отправки (имеет смысл повторить)"""
+        if isinstance(error, ConnectionError):
+            return True
+        response = getattr(error, "response", None)
+        if isinstance(error, (PushServerError, HTTPError)) and response is not None:
+            return response.status_code == 429 or response.status_code >= 500
+        return False
+    
+    def _get_client(self) -> PushClient:
+        """PushClient текущего потока (requests.Session не делим между потоками)"""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = PushClient()
+        return client
+    
+    def record_tickets(self, db: Session, results: List[Dict[str, Any]]) -> int:
+        """
+        Сохранить тикеты успешных отправок для последующей проверки квитанций
+        
+        Коммит выполняет вызывающая сторона.
+        
+        Returns:
+            Количество сохраненных тикетов
+        """
+        from app.models.push_token import PushTicketRecord
+        
+        rows = [
+            {"ticket_id": r["ticket_id"], "push_token": r["push_token"]}
+            for r in results
+            if r.get("success") and r.get("ticket_id")
+        ]
+        if rows:
+            db.execute(insert(PushTicketRecord), rows)
+        return len(rows)
+    
+    def remove_tokens(self, db: Session, tokens: Iterable[str]) -> int:
+        """
+        Удалить недействительные токены: обнулить User.push_token и удалить
+        строки AnonymousPushToken. Коммит выполняет вызывающая сторона.
+        
+        Returns:
+            Количество токенов
+        """
+        from app.models.user import User
+        from app.models.push_token import AnonymousPushToken
+        
+        tokens = list(set(tokens))
+        if not tokens:
+            return 0
+        
+        db.execute(
+            update(User)
+            .where(User.push_token.in_(tokens))
+            .values(push_token=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            delete(AnonymousPushToken)
+            .where(AnonymousPushToken.token.in_(tokens))
+            .execution_options(synchronize_session=False)
+        )
+        logger.info(f"🧹 Removed {len(tokens)} stale push tokens")
+        return len(tokens)
+    
+    def check_receipts(self, db: Session) -> Dict[str, Any]:
+        """
+        Проверить квитанции сохраненных тикетов и удалить недействительные токены
+        
+        Проверяются тикеты старше PUSH_RECEIPT_DELAY. Тикет удаляется, когда
+        квитанция получена или когда Expo ее уже не хранит (PUSH_RECEIPT_TTL).
+        
+        Returns:
+            Статистика проверки
+        """
+        from app.models.push_token import PushTicketRecord
+        
+        now = datetime.now(timezone.utc)
+        ready_before = now - timedelta(seconds=settings.PUSH_RECEIPT_DELAY)
+        expired_before = now - timedelta(seconds=settings.PUSH_RECEIPT_TTL)
+        batch_size = PushClient.DEFAULT_MAX_RECEIPT_COUNT
+        
+        stats = {"checked": 0, "ok": 0, "errors": 0, "tokens_removed": 0}
+        last_id = 0
+        
+        while True:
+            tickets = db.execute(
+                select(PushTicketRecord.id, PushTicketRecord.ticket_id, PushTicketRecord.push_token)
+                .where(PushTicketRecord.created_at < ready_before, PushTicketRecord.id > last_id)
+                .order_by(PushTicketRecord.id)
+                .limit(batch_size)
+            ).all()
+            if not tickets:
+                break
+            last_id = tickets[-1].id
+            
+            try:
+                receipts = self._get_client().check_receipts_multiple([
+                    PushTicket(push_message=None, status=None, message=None, details=None, id=t.ticket_id)
+                    for t in tickets
+                ])
+            except Exception as e:
+                logger.error(f"Error fetching push receipts: {e}")
+                break
+            
+            token_by_ticket = {t.ticket_id: t.push_token for t in tickets}
+            dead_tokens = set()
+            for receipt in receipts:
+                if receipt.is_success():
+                    stats["ok"] += 1
+                    continue
+                stats["errors"] += 1
+                if (receipt.details or {}).get("error") == PushTicket.ERROR_DEVICE_NOT_REGISTERED:
+                    token = token_by_ticket.get(receipt.id)
+                    if token:
+                        dead_tokens.add(token)
+                else:
+                    logger.warning(f"Push receipt error {receipt.id}: {receipt.message}")
+            
+            stats["checked"] += len(receipts)
+            stats["tokens_removed"] += self.remove_tokens(db, dead_tokens)
+            
+            # Удаляем проверенные тикеты и тикеты без квитанции старше срока хранения
+            received = [r.id for r in receipts]
+            db.execute(
+                delete(PushTicketRecord)
+                .where(or_(
+                    PushTicketRecord.ticket_id.in_(received),
+                    and_(PushTicketRecord.id.in_([t.id for t in tickets]), PushTicketRecord.created_at < expired_before)
+                ))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        
+        logger.info(f"Push receipts checked: {stats}")
+        return stats
+    
     def send_to_users(
         self,
         user_tokens: List[str],
@@ -247,6 +429,105 @@ class PushNotificationService:
             "results": results
         }
     
+    def send_stream(
+        self,
+        db: Session,
+        notifications: Iterable[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Отправить поток уведомлений с постоянным расходом памяти
+        
+        Текущий поток (производитель) читает уведомления и складывает чанки по
+        PUSH_CHUNK_SIZE в ограниченную очередь, PUSH_SEND_CONCURRENCY потоков
+        (потребители) отправляют их в Expo. Результаты не накапливаются:
+        тикеты сразу пишутся в БД, в памяти остаются только счетчики и
+        устаревшие токены. Коммит выполняет вызывающая сторона.
+        
+        Args:
+            db: Database session (используется только в текущем потоке)
+            notifications: Итератор уведомлений в формате send_push_notifications_batch
+        
+        Returns:
+            Статистика отправки
+        """
+        workers = max(1, settings.PUSH_SEND_CONCURRENCY)
+        chunks: "queue.Queue[Optional[List[Tuple[PushMessage, str]]]]" = queue.Queue(maxsize=workers * 2)
+        done: "queue.Queue[List[Dict[str, Any]]]" = queue.Queue()
+        stats = {"total": 0, "success": 0, "failed": 0}
+        tokens_to_remove = set()
+        
+        def consume():
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    return
+                try:
+                    done.put(self._send_chunk(chunk))
+                except Exception as e:
+                    logger.error(f"Error sending push chunk: {e}")
+                    done.put([
+                        {"success": False, "error": str(e), "push_token": push_token}
+                        for _, push_token in chunk
+                    ])
+        
+        def collect(results: List[Dict[str, Any]]):
+            for result in results:
+                stats["total"] += 1
+                if result.get("success"):
+                    stats["success"] += 1
+                else:
+                    stats["failed"] += 1
+                    if result.get("should_remove_token"):
+                        tokens_to_remove.add(result["push_token"])
+            self.record_tickets(db, results)
+        
+        def drain():
+            while True:
+                try:
+                    collect(done.get_nowait())
+                except queue.Empty:
+                    return
+        
+        threads = [threading.Thread(target=consume, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            buffer = []
+            for notif in notifications:
+                push_token = notif.get("push_token")
+                if not PushClient.is_exponent_push_token(push_token):
+                    logger.error(f"Invalid push token format: {push_token}")
+                    collect([{"success": False, "error": "Invalid push token format", "push_token": push_token}])
+                    continue
+                
+                buffer.append((PushMessage(
+                    to=push_token,
+                    title=notif.get("title", ""),
+                    body=notif.get("body", ""),
+                    data=notif.get("data", {}),
+                    sound=notif.get("sound", "default"),
+                    badge=notif.get("badge"),
+                    priority=notif.get("priority", "default")
+                ), push_token))
+                
+                if len(buffer) >= settings.PUSH_CHUNK_SIZE:
+                    chunks.put(buffer)  # блокируется, пока потребители не разгрузят очередь
+                    buffer = []
+                    drain()
+            
+            if buffer:
+                chunks.put(buffer)
+        finally:
+            for _ in threads:
+                chunks.put(None)
+            for thread in threads:
+                thread.join()
+            drain()
+        
+        stats["tokens_removed"] = self.remove_tokens(db, tokens_to_remove)
+        return stats
+    
     def send_news_to_all(
         self,
         db: Session,
@@ -257,6 +538,10 @@ class PushNotificationService:
         """
         Отправить новость ВСЕМ пользователям (зарегистрированным + анонимным)
         
+        Токены читаются серверным курсором (только колонка токена) и сразу
+        уходят в send_stream, поэтому память не растет с числом получателей.
+        Анонимный токен пропускается, если он уже есть у пользователя.
+        
         Args:
             db: Database session
             title: Заголовок новости
@@ -269,53 +554,46 @@ class PushNotificationService:
         from app.models.user import User
         from app.models.push_token import AnonymousPushToken
         
-        all_tokens = []
-        
-        # 1. Получить токены зарегистрированных пользователей
-        registered_users = db.query(User).filter(
-            User.push_token.isnot(None),
-            User.is_active == True
-        ).all()
-        
-        registered_tokens = [user.push_token for user in registered_users]
-        all_tokens.extend(registered_tokens)
-        
-        logger.info(f"Found {len(registered_tokens)} registered users with push tokens")
+        batch_size = settings.PUSH_FANOUT_BATCH_SIZE
+        counts = {"registered_users": 0, "anonymous_users": 0}
         
-        # 2. Получить токены анонимных пользователей (не привязанные к users)
-        anonymous_tokens_query = db.query(AnonymousPushToken).filter(
-            AnonymousPushToken.is_linked_to_user.is_(None)
-        ).all()
+        # 1. Токены зарегистрированных пользователей
+        registered_stmt = (
+            select(User.push_token)
+            .where(User.push_token.isnot(None), User.is_active == True)
+            .distinct()
+            .execution_options(yield_per=batch_size)
+        )
         
-        anonymous_tokens = [token.token for token in anonymous_tokens_query]
-        all_tokens.extend(anonymous_tokens)
+        # 2. Токены анонимных пользователей (не привязанные к users и не совпадающие
+        # с токенами активных пользователей - те уже получены в п.1)
+        anonymous_stmt = (
+            select(AnonymousPushToken.token)
+            .where(
+                AnonymousPushToken.is_linked_to_user.is_(None),
+                ~exists().where(User.push_token == AnonymousPushToken.token, User.is_active == True)
+            )
+            .execution_options(yield_per=batch_size)
+        )
         
-        logger.info(f"Found {len(anonymous_tokens)} anonymous users with push tokens")
+        def notifications():
+            for counter, stmt in (("registered_users", registered_stmt), ("anonymous_users", anonymous_stmt)):
+                for token in db.execute(stmt).scalars():
+                    counts[counter] += 1
+                    yield {"push_token": token, "title": title, "body": body, "data": data or {}}
         
         # 3. Отправить всем
-        if not all_tokens:
-            logger.warning("No push tokens found for news notification")
-            return {
-                "total": 0,
-                "success": 0,
-                "failed": 0,
-                "registered_users": 0,
-                "anonymous_users": 0
-            }
+        results = self.send_stream(db, notifications())
+        db.commit()
         
-        results = self.send_to_users(
-            user_tokens=all_tokens,
-            title=title,
-            body=body,
-            data=data
-        )
+        if not results["total"]:
+            logger.warning("No push tokens found for news notification")
         
         # 4. Добавить статистику по типам пользователей
-        results["registered_users"] = len(registered_tokens)
-        results["anonymous_users"] = len(anonymous_tokens)
+        results.update(counts)
         
         logger.info(f"News push sent: {results['success']}/{results['total']} successful "
-                   f"(Registered: {len(registered_tokens)}, Anonymous: {len(anonymous_tokens)})")
+                   f"(Registered: {counts['registered_users']}, Anonymous: {counts['anonymous_users']})")
         
         return results
     
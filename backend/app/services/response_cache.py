@@ -0,0 +1,278 @@
+"""
+Кеш ответов публичных endpoints (новости, статьи)
+
+Два уровня: короткий in-process LRU перед Redis. Записи помечаются тегами
+и инвалидируются при изменении данных (загрузка новостей, изменение статей)
+через поколения тегов в ключе.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import redis
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Теги кеша
+NEWS_TAG = 'news'
+ARTICLES_TAG = 'articles'
+FORUM_CATEGORIES_TAG = 'forum_categories'
+
+
+def article_tag(slug: str) -> str:
+    """Тег детальной страницы статьи"""
+    return f"article:{slug}"
+
+
+@dataclass
+class CachedResponse:
+    """Тело ответа (JSON-совместимое) и его ETag"""
+    body: Any
+    etag: str
+
+
+class ResponseCache:
+    """
+    Кеш ответов с инвалидацией по тегам
+
+    Redis: resp_cache:gen:{tag} - поколение тега, resp_cache:{key} - JSON
+    {body, etag} с TTL RESPONSE_CACHE_TTL. Поколения тегов входят в ключ
+    записи: invalidate() увеличивает поколение, и старые записи (в Redis и в
+    LRU всех процессов) больше не читаются, а истекают по TTL. Ответ,
+    собранный по данным до изменения, сохраняется под ключом старого
+    поколения и тоже не читается.
+    Поколения, как и тела ответов, хранятся в процессе RESPONSE_CACHE_LOCAL_TTL
+    секунд: попадание в LRU не требует обращения к Redis, а инвалидация из
+    другого процесса видна не позже чем через это время.
+    Если Redis недоступен, ключ не строится (None) и кеш не используется.
+    """
+
+    KEY_PREFIX = 'resp_cache'
+
+    def __init__(self, redis_url: str = None):
+        self.redis = redis.from_url(redis_url or settings.REDIS_URL, decode_responses=True)
+        self.ttl = settings.RESPONSE_CACHE_TTL
+        self.local_ttl = settings.RESPONSE_CACHE_LOCAL_TTL
+        self.local_size = settings.RESPONSE_CACHE_LOCAL_SIZE
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._local_generations: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def make_key(
+        self, route: str, params: Optional[Dict[str, Any]] = None, tags: Iterable[str] = ()
+    ) -> Optional[str]:
+        """
+        Ключ кеша из маршрута, нормализованных параметров и поколений тегов
+
+        Пустые параметры отбрасываются, порядок не важен. Ключ нужно получать
+        до чтения данных из БД: тогда ответ, собранный параллельно с
+        инвалидацией, попадет под ключ устаревшего поколения.
+
+        Args:
+            route: Имя маршрута
+            params: Параметры запроса
+            tags: Теги, по которым запись инвалидируется
+
+        Returns:
+            Ключ или None, если поколения тегов прочитать не удалось
+        """
+        tags = sorted(set(tags))
+        generations = self._get_local_generations(tags)
+        if generations is None:
+            generations = self._generations(tags)
+        if generations is None:
+            return None
+        return self._build_key(route, params, generations)
+
+    @staticmethod
+    def _build_key(route: str, params: Optional[Dict[str, Any]], generations: List[int]) -> str:
+        normalized = {
+            name: value.strip() if isinstance(value, str) else value
+            for name, value in (params or {}).items()
+            if value is not None and value != ''
+        }
+        data = json.dumps(
+            {'params': normalized, 'gen': generations},
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+        return f"{route}:{hashlib.md5(data.encode()).hexdigest()}"
+
+    @staticmethod
+    def make_etag(body: Any) -> str:
+        data = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+        return f'"{hashlib.sha1(data.encode()).hexdigest()}"'
+
+    def get(self, key: Optional[str]) -> Optional[CachedResponse]:
+        """Получить ответ из LRU или Redis"""
+        if key is None:
+            return None
+
+        entry = self._get_local(key)
+        if entry:
+            return entry
+
+        try:
+            value = self.redis.get(f"{self.KEY_PREFIX}:{key}")
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Response cache unavailable: {e}")
+            return None
+
+        if not value:
+            return None
+
+        data = json.loads(value)
+        entry = CachedResponse(body=data['body'], etag=data['etag'])
+        self._set_local(key, entry)
+        return entry
+
+    def set(self, key: Optional[str], body: Any) -> CachedResponse:
+        """
+        Сохранить ответ
+
+        Args:
+            key: Ключ из make_key() (None - только вычислить ETag)
+            body: JSON-совместимое тело ответа
+
+        Returns:
+            Запись с вычисленным ETag
+        """
+        entry = CachedResponse(body=body, etag=self.make_etag(body))
+        if key is None:
+            return entry
+
+        self._set_local(key, entry)
+
+        try:
+            self.redis.setex(
+                f"{self.KEY_PREFIX}:{key}",
+                self.ttl,
+                json.dumps({'body': body, 'etag': entry.etag}, ensure_ascii=False, default=str),
+            )
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to store cached response: {e}")
+
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        """Сделать недействительными все записи, помеченные любым из тегов"""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tag in tags:
+                gen_key = f"{self.KEY_PREFIX}:gen:{tag}"
+                pipe.incr(gen_key)
+                # Поколение живет дольше любой записи со старым поколением
+                pipe.expire(gen_key, 2 * self.ttl)
+            pipe.execute()
+            # Этот процесс видит новое поколение сразу
+            with self._lock:
+                for tag in tags:
+                    self._local_generations.pop(tag, None)
+            logger.info(f"🧹 Response cache invalidated: {', '.join(tags)}")
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Response cache invalidation failed: {e}")
+
+    async def amake_key(
+        self, route: str, params: Optional[Dict[str, Any]] = None, tags: Iterable[str] = ()
+    ) -> Optional[str]:
+        """make_key() для async endpoints: поколения из памяти без переключения, Redis в потоке"""
+        tags = sorted(set(tags))
+        generations = self._get_local_generations(tags)
+        if generations is not None:
+            return self._build_key(route, params, generations)
+        return await asyncio.to_thread(self.make_key, route, params, tags)
+
+    async def aget(self, key: Optional[str]) -> Optional[CachedResponse]:
+        """get() для async endpoints: LRU без переключения, Redis в потоке"""
+        if key is None:
+            return None
+        return self._get_local(key) or await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: Optional[str], body: Any) -> CachedResponse:
+        """set() для async endpoints"""
+        return await asyncio.to_thread(self.set, key, body)
+
+    def _get_local(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._local.get(key)
+            if not item:
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _set_local(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, entry)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _get_local_generations(self, tags: List[str]) -> Optional[List[int]]:
+        """Поколения тегов из памяти процесса (None, если хотя бы одного нет или оно устарело)"""
+        now = time.monotonic()
+        generations = []
+        with self._lock:
+            for tag in tags:
+                item = self._local_generations.get(tag)
+                if not item or item[0] < now:
+                    return None
+                generations.append(item[1])
+        return generations
+
+    def _generations(self, tags: List[str]) -> Optional[List[int]]:
+        """Текущие поколения тегов из Redis (None, если Redis недоступен)"""
+        if not tags:
+            return []
+        try:
+            values = self.redis.mget([f"{self.KEY_PREFIX}:gen:{tag}" for tag in tags])
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Response cache unavailable: {e}")
+            return None
+
+        generations = [int(value or 0) for value in values]
+        expires_at = time.monotonic() + self.local_ttl
+        with self._lock:
+            for tag, generation in zip(tags, generations):
+                self._local_generations[tag] = (expires_at, generation)
+        return generations
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Совпадает ли ETag с заголовком If-None-Match запроса"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # Для GET сравнение слабое: префикс W/ не учитывается
+    candidates = {value.strip().removeprefix('W/') for value in header.split(',')}
+    return etag in candidates
+
+
+def cached_json_response(entry: CachedResponse, request: Optional[Request] = None) -> Response:
+    """
+    JSON ответ из записи кеша с заголовком ETag
+
+    Если передан request и клиент прислал совпадающий If-None-Match,
+    возвращается 304 Not Modified без тела.
+    """
+    if request is not None and etag_matches(request, entry.etag):
+        return Response(status_code=304, headers={'ETag': entry.etag})
+    return JSONResponse(content=entry.body, headers={'ETag': entry.etag})
+
+
+# Экземпляр кеша для использования
+response_cache = ResponseCache()
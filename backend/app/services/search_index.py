@@ -0,0 +1,467 @@
+"""
+Поисковый индекс Elasticsearch по собственному контенту
+
+Один индекс (алиас ELASTICSEARCH_INDEX) для новостей, статей, топиков и
+комментариев форума и податкових реквізитів. Документ: {type}-{id}.
+Полная переиндексация создает новый индекс и переключает алиас, точечные
+изменения приходят из Celery задач (см. app/tasks/search_tasks.py).
+"""
+import html
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from elasticsearch import Elasticsearch, helpers
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.models.article import Article
+from app.models.forum import ForumPost, ForumThread
+from app.models.news import News
+from app.models.tax_requisite import TaxRequisite
+
+logger = logging.getLogger(__name__)
+
+# Типы документов
+NEWS_DOC = 'news'
+ARTICLE_DOC = 'article'
+THREAD_DOC = 'thread'
+POST_DOC = 'post'
+TAX_REQUISITE_DOC = 'tax_requisite'
+
+# Фасеты ответа поиска: имя -> поле индекса
+FACET_FIELDS = {
+    'type': 'type',
+    'source': 'source',
+    'category': 'categories',
+    'region': 'region',
+}
+
+# Стоп-слова украинского языка (в Elasticsearch нет встроенного списка)
+UKRAINIAN_STOPWORDS = [
+    'а', 'аби', 'але', 'б', 'би', 'бо', 'в', 'вже', 'від', 'він', 'вона', 'вони', 'все', 'де', 'для',
+    'до', 'ж', 'же', 'з', 'за', 'зі', 'і', 'із', 'й', 'їх', 'к', 'коли', 'ми', 'на', 'не', 'ні', 'о',
+    'об', 'от', 'по', 'при', 'про', 'та', 'так', 'також', 'те', 'то', 'тобто', 'у', 'це', 'цей', 'ця',
+    'ці', 'чи', 'що', 'щоб', 'як', 'який', 'яка', 'які', 'якщо',
+]
+
+INDEX_SETTINGS = {
+    'number_of_shards': 1,
+    'analysis': {
+        'char_filter': {
+            # Разные варианты апострофа приводим к одному
+            'uk_apostrophe': {
+                'type': 'mapping',
+                'mappings': ["’ => '", "ʼ => '", "` => '"],
+            },
+        },
+        'filter': {
+            'uk_stop': {'type': 'stop', 'stopwords': UKRAINIAN_STOPWORDS},
+            'uk_edge_ngram': {'type': 'edge_ngram', 'min_gram': 3, 'max_gram': 15},
+        },
+        'analyzer': {
+            'uk_text': {
+                'type': 'custom',
+                'char_filter': ['uk_apostrophe'],
+                'tokenizer': 'standard',
+                'filter': ['lowercase', 'uk_stop'],
+            },
+            # Префиксы слов: частично заменяют стемминг (окончания не влияют на совпадение)
+            'uk_prefix': {
+                'type': 'custom',
+                'char_filter': ['uk_apostrophe'],
+                'tokenizer': 'standard',
+                'filter': ['lowercase', 'uk_stop', 'uk_edge_ngram'],
+            },
+        },
+    },
+}
+
+
+def _text_field(analyzer: str) -> Dict[str, Any]:
+    return {
+        'type': 'text',
+        'analyzer': analyzer,
+        'fields': {
+            'prefix': {'type': 'text', 'analyzer': 'uk_prefix', 'search_analyzer': analyzer},
+        },
+    }
+
+
+def index_mappings() -> Dict[str, Any]:
+    """
+    Маппинг индекса
+
+    С плагином analysis-ukrainian (ELASTICSEARCH_UKRAINIAN_PLUGIN) текст
+    анализируется морфологическим анализатором `ukrainian`.
+    """
+    analyzer = 'ukrainian' if settings.ELASTICSEARCH_UKRAINIAN_PLUGIN else 'uk_text'
+    return {
+        'properties': {
+            'type': {'type': 'keyword'},
+            'object_id': {'type': 'integer'},
+            'title': _text_field(analyzer),
+            'content': _text_field(analyzer),
+            'url': {'type': 'keyword', 'index': False},
+            'source': {'type': 'keyword'},
+            'categories': {'type': 'keyword'},
+            'region': {'type': 'keyword'},
+            'thread_id': {'type': 'integer'},
+            'published_at': {'type': 'date'},
+        },
+    }
+
+
+# ========== Документы ==========
+
+def news_document(news: News) -> Dict[str, Any]:
+    return {
+        'type': NEWS_DOC,
+        'object_id': news.id,
+        'title': news.title,
+        'content': ' '.join(filter(None, [news.summary, news.content])),
+        'url': news.url,
+        'source': news.source,
+        'categories': news.categories or [],
+        'published_at': news.published_at or news.created_at,
+    }
+
+
+def article_document(article: Article) -> Dict[str, Any]:
+    return {
+        'type': ARTICLE_DOC,
+        'object_id': article.id,
+        'title': article.title,
+        'content': ' '.join(filter(None, [article.excerpt, article.content])),
+        'url': f"/articles/{article.slug}",
+        'published_at': article.published_at or article.created_at,
+    }
+
+
+def thread_document(thread: ForumThread) -> Dict[str, Any]:
+    return {
+        'type': THREAD_DOC,
+        'object_id': thread.id,
+        'title': thread.title,
+        'content': thread.content,
+        'url': f"/forum/threads/{thread.id}",
+        'categories': [thread.category.name] if thread.category else [],
+        'thread_id': thread.id,
+        'published_at': thread.created_at,
+    }
+
+
+def post_document(post: ForumPost) -> Dict[str, Any]:
+    return {
+        'type': POST_DOC,
+        'object_id': post.id,
+        'title': post.thread.title if post.thread else None,
+        'content': post.content,
+        'url': f"/forum/threads/{post.thread_id}",
+        'thread_id': post.thread_id,
+        'published_at': post.created_at,
+    }
+
+
+def tax_requisite_document(requisite: TaxRequisite) -> Dict[str, Any]:
+    return {
+        'type': TAX_REQUISITE_DOC,
+        'object_id': requisite.id,
+        'title': requisite.recipient_name,
+        'content': ' '.join(filter(None, [
+            requisite.district, requisite.description, requisite.bank_name,
+            requisite.recipient_code, requisite.iban, requisite.classification_code,
+        ])),
+        'categories': [requisite.type],
+        'region': requisite.region,
+        'published_at': requisite.created_at,
+    }
+
+
+# Тип документа -> (модель, загрузка связей, построение документа, фильтр индексируемых строк)
+DOCUMENT_SOURCES = {
+    NEWS_DOC: (News, (), news_document, lambda: News.is_published == True),
+    ARTICLE_DOC: (Article, (), article_document, lambda: Article.is_published == True),
+    THREAD_DOC: (ForumThread, (ForumThread.category,), thread_document, None),
+    POST_DOC: (ForumPost, (ForumPost.thread,), post_document, None),
+    TAX_REQUISITE_DOC: (TaxRequisite, (), tax_requisite_document, None),
+}
+
+
+def _escape(value: Optional[str]) -> Optional[str]:
+    """HTML-экранирование поля без подсветки (как encoder=html у подсветки)"""
+    return html.escape(value) if value is not None else None
+
+
+class SearchIndex:
+    """Индексация и поиск в Elasticsearch"""
+
+    def __init__(self, url: str = None, alias: str = None):
+        self.url = url or settings.ELASTICSEARCH_URL
+        self.alias = alias or settings.ELASTICSEARCH_INDEX
+        self._client: Optional[Elasticsearch] = None
+
+    @property
+    def client(self) -> Elasticsearch:
+        if self._client is None:
+            self._client = Elasticsearch(self.url, request_timeout=settings.ELASTICSEARCH_TIMEOUT)
+        return self._client
+
+    @staticmethod
+    def doc_id(doc_type: str, object_id: int) -> str:
+        return f"{doc_type}-{object_id}"
+
+    # ========== Индекс ==========
+
+    def create_index(self) -> str:
+        """Создать новый индекс с настройками и маппингом, вернуть его имя"""
+        name = f"{self.alias}-{datetime.utcnow():%Y%m%d%H%M%S}"
+        self.client.indices.create(index=name, settings=INDEX_SETTINGS, mappings=index_mappings())
+        return name
+
+    def ensure_index(self) -> None:
+        """Создать индекс и алиас, если их еще нет"""
+        if not self.client.indices.exists_alias(name=self.alias):
+            name = self.create_index()
+            self.client.indices.put_alias(index=name, name=self.alias)
+            logger.info(f"🔎 Search index created: {name}")
+
+    def reindex_all(self, db: Session) -> Dict[str, int]:
+        """
+        Полная переиндексация без простоя
+
+        Документы загружаются в новый индекс, затем алиас атомарно
+        переключается, старые индексы удаляются.
+
+        Returns:
+            {тип документа: количество}
+        """
+        name = self.create_index()
+        counts = {}
+        for doc_type in DOCUMENT_SOURCES:
+            counts[doc_type] = self._bulk(self._index_actions(db, doc_type, index=name))
+
+        old = list(self.client.indices.get_alias(name=self.alias).keys()) if self.client.indices.exists_alias(name=self.alias) else []
+        actions = [{'remove': {'index': index, 'alias': self.alias}} for index in old]
+        actions.append({'add': {'index': name, 'alias': self.alias}})
+        self.client.indices.update_aliases(actions=actions)
+        for index in old:
+            self.client.indices.delete(index=index, ignore_unavailable=True)
+
+        logger.info(f"🔎 Search index rebuilt: {name} {counts}")
+        return counts
+
+    def reindex_type(self, db: Session, doc_type: str) -> int:
+        """Переиндексировать все документы одного типа (после массовых изменений)"""
+        self.ensure_index()
+        self.client.delete_by_query(index=self.alias, query={'term': {'type': doc_type}}, refresh=True)
+        return self._bulk(self._index_actions(db, doc_type))
+
+    # ========== Точечная синхронизация ==========
+
+    def index_objects(self, db: Session, doc_type: str, ids: Iterable[int]) -> int:
+        """
+        Проиндексировать объекты по id
+
+        Объекты, которых нет в БД или которые не должны быть в поиске
+        (неопубликованные), удаляются из индекса.
+        """
+        ids = set(ids)
+        if not ids:
+            return 0
+        self.ensure_index()
+
+        model, relations, build, criteria = DOCUMENT_SOURCES[doc_type]
+        query = db.query(model).options(*[joinedload(r) for r in relations]).filter(model.id.in_(ids))
+        if criteria is not None:
+            query = query.filter(criteria())
+
+        actions = []
+        for obj in query.all():
+            ids.discard(obj.id)
+            actions.append(self._index_action(doc_type, build(obj)))
+        actions.extend(self._delete_action(doc_type, object_id) for object_id in ids)
+        return self._bulk(actions)
+
+    def delete_objects(self, doc_type: str, ids: Iterable[int]) -> int:
+        """Удалить документы из индекса"""
+        return self._bulk(self._delete_action(doc_type, object_id) for object_id in set(ids))
+
+    def delete_thread(self, thread_id: int) -> None:
+        """Удалить топик и все его комментарии"""
+        self.delete_objects(THREAD_DOC, [thread_id])
+        self.client.delete_by_query(
+            index=self.alias,
+            query={'bool': {'filter': [{'term': {'type': POST_DOC}}, {'term': {'thread_id': thread_id}}]}},
+        )
+
+    # ========== Поиск ==========
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        size: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Ранжированный поиск с фасетами
+
+        Фильтры применяются через post_filter: каждый фасет считается с учетом
+        остальных фильтров, но не своего собственного.
+
+        Args:
+            query: Поисковый запрос
+            filters: {имя фасета: значения} (см. FACET_FIELDS)
+            size: Размер страницы
+            offset: Смещение
+
+        Returns:
+            {"total", "items", "facets"}
+        """
+        clauses = {
+            FACET_FIELDS[name]: {'terms': {FACET_FIELDS[name]: values}}
+            for name, values in (filters or {}).items()
+            if values
+        }
+
+        aggs = {}
+        for name, field in FACET_FIELDS.items():
+            others = [clause for clause_field, clause in clauses.items() if clause_field != field]
+            aggs[name] = {
+                'filter': {'bool': {'filter': others}},
+                'aggs': {'values': {'terms': {'field': field, 'size': 20}}},
+            }
+
+        response = self.client.search(
+            index=self.alias,
+            query={
+                'multi_match': {
+                    'query': query,
+                    'fields': ['title^3', 'content', 'title.prefix^1.5', 'content.prefix^0.5'],
+                    'type': 'most_fields',
+                },
+            },
+            post_filter={'bool': {'filter': list(clauses.values())}},
+            aggs=aggs,
+            highlight={
+                # Текст документа HTML-экранируется, разметка только <b>
+                'encoder': 'html',
+                'pre_tags': ['<b>'],
+                'post_tags': ['</b>'],
+                'fields': {
+                    'title': {'number_of_fragments': 0},
+                    'content': {'fragment_size': 160, 'number_of_fragments': 2},
+                },
+            },
+            source_excludes=['content'],
+            size=size,
+            from_=offset,
+        )
+
+        items = []
+        for hit in response['hits']['hits']:
+            source = hit['_source']
+            highlight = hit.get('highlight', {})
+            items.append({
+                'type': source['type'],
+                'id': source['object_id'],
+                'title': highlight['title'][0] if highlight.get('title') else _escape(source.get('title')),
+                'snippet': ' … '.join(highlight.get('content', [])) or None,
+                'url': source.get('url'),
+                'source': source.get('source'),
+                'categories': source.get('categories') or [],
+                'region': source.get('region'),
+                'thread_id': source.get('thread_id'),
+                'published_at': source.get('published_at'),
+                'score': hit['_score'],
+            })
+
+        facets = {
+            name: [
+                {'value': bucket['key'], 'count': bucket['doc_count']}
+                for bucket in response['aggregations'][name]['values']['buckets']
+            ]
+            for name in FACET_FIELDS
+        }
+
+        return {
+            'total': response['hits']['total']['value'],
+            'items': items,
+            'facets': facets,
+        }
+
+    # ========== Внутренние методы ==========
+
+    def _index_actions(self, db: Session, doc_type: str, index: str = None) -> Iterator[Dict[str, Any]]:
+        """Документы типа из БД потоком (yield_per)"""
+        model, relations, build, criteria = DOCUMENT_SOURCES[doc_type]
+        query = db.query(model).options(*[joinedload(r) for r in relations])
+        if criteria is not None:
+            query = query.filter(criteria())
+        for obj in query.yield_per(settings.ELASTICSEARCH_BULK_SIZE):
+            yield self._index_action(doc_type, build(obj), index)
+
+    def _index_action(self, doc_type: str, document: Dict[str, Any], index: str = None) -> Dict[str, Any]:
+        return {
+            '_op_type': 'index',
+            '_index': index or self.alias,
+            '_id': self.doc_id(doc_type, document['object_id']),
+            '_source': document,
+        }
+
+    def _delete_action(self, doc_type: str, object_id: int) -> Dict[str, Any]:
+        return {'_op_type': 'delete', '_index': self.alias, '_id': self.doc_id(doc_type, object_id)}
+
+    def _bulk(self, actions: Iterable[Dict[str, Any]]) -> int:
+        """helpers.bulk с пропуском удаления несуществующих документов"""
+        success, errors = helpers.bulk(
+            self.client,
+            actions,
+            chunk_size=settings.ELASTICSEARCH_BULK_SIZE,
+            raise_on_error=False,
+            stats_only=False,
+        )
+        real_errors = [e for e in errors if e.get('delete', {}).get('status') != 404]
+        if real_errors:
+            logger.error(f"❌ Search indexing errors: {len(real_errors)}, first: {real_errors[0]}")
+        return success
+
+
+def schedule_index(doc_type: str, ids: Iterable[int]) -> None:
+    """Поставить индексацию объектов в очередь Celery (после коммита)"""
+    ids = [object_id for object_id in ids if object_id is not None]
+    if not settings.SEARCH_INDEX_SYNC_ENABLED or not ids:
+        return
+    try:
+        from app.tasks.search_tasks import index_search_documents_task
+        index_search_documents_task.delay(doc_type, ids)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to schedule search indexing: {e}")
+
+
+def schedule_delete(doc_type: str, ids: Iterable[int]) -> None:
+    """Поставить удаление документов в очередь Celery"""
+    ids = [object_id for object_id in ids if object_id is not None]
+    if not settings.SEARCH_INDEX_SYNC_ENABLED or not ids:
+        return
+    try:
+        from app.tasks.search_tasks import delete_search_documents_task
+        delete_search_documents_task.delay(doc_type, ids)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to schedule search deletion: {e}")
+
+
+def schedule_reindex_type(doc_type: str) -> None:
+    """Поставить переиндексацию типа в очередь Celery (массовые изменения)"""
+    if not settings.SEARCH_INDEX_SYNC_ENABLED:
+        return
+    try:
+        from app.tasks.search_tasks import reindex_search_type_task
+        reindex_search_type_task.delay(doc_type)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to schedule search reindex: {e}")
+
+
+# Экземпляр индекса для использования
+search_index = SearchIndex()
@@ -0,0 +1,140 @@
+"""
+Буферизованные счетчики просмотров (топики форума, статьи)
+
+Просмотр - это INCR в Redis, а не UPDATE строки в PostgreSQL. Периодическая
+задача flush_view_counters_task переносит накопленные приращения в БД
+одним UPDATE на пачку объектов.
+"""
+import logging
+from typing import Dict
+
+import redis
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.article import Article
+from app.models.forum import ForumThread
+
+logger = logging.getLogger(__name__)
+
+# Типы объектов со счетчиком просмотров
+THREAD_VIEWS = 'thread'
+ARTICLE_VIEWS = 'article'
+
+VIEW_MODELS = {
+    THREAD_VIEWS: ForumThread,
+    ARTICLE_VIEWS: Article,
+}
+
+
+class ViewCounter:
+    """
+    Счетчики просмотров в Redis
+
+    views:{kind}:{id} - непереданные в БД просмотры,
+    views:dirty:{kind} - множество id с ненулевым счетчиком.
+    Ошибки Redis не ломают запрос - просмотр просто не учитывается.
+
+    Счетчик уменьшается на перенесенное значение только после коммита в БД:
+    при сбое между коммитом и DECRBY просмотры будут учтены повторно,
+    но не потеряны.
+    """
+
+    KEY_PREFIX = 'views'
+    FLUSH_BATCH_SIZE = 1000
+
+    # DECRBY и удаление обнулившегося счетчика одной операцией,
+    # чтобы не потерять INCR между ними
+    DECR_SCRIPT = """
+    for i, key in ipairs(KEYS) do
+        if redis.call('DECRBY', key, ARGV[i]) <= 0 then
+            redis.call('DEL', key)
+        end
+    end
+    return #KEYS
+    """
+
+    def __init__(self, redis_url: str = None):
+        self.redis = redis.from_url(redis_url or settings.REDIS_URL, decode_responses=True)
+        self._decr = self.redis.register_script(self.DECR_SCRIPT)
+
+    def hit(self, kind: str, obj_id: int) -> int:
+        """
+        Учесть просмотр
+
+        Returns:
+            Количество просмотров, еще не перенесенных в БД (включая этот)
+        """
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.incr(f"{self.KEY_PREFIX}:{kind}:{obj_id}")
+            pipe.sadd(f"{self.KEY_PREFIX}:dirty:{kind}", obj_id)
+            pending, _ = pipe.execute()
+            return int(pending)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ View counter unavailable: {e}")
+            return 0
+
+    def flush(self, db: Session) -> Dict[str, int]:
+        """
+        Перенести накопленные просмотры в БД
+
+        Returns:
+            {kind: количество обновленных объектов}
+        """
+        return {kind: self._flush_kind(db, kind, model) for kind, model in VIEW_MODELS.items()}
+
+    def _flush_kind(self, db: Session, kind: str, model) -> int:
+        dirty_key = f"{self.KEY_PREFIX}:dirty:{kind}"
+        flushing_key = f"{self.KEY_PREFIX}:flushing:{kind}"
+
+        # Новые просмотры во время переноса попадают в новое множество dirty.
+        # Если прошлый перенос прервался, сначала дорабатываем его множество.
+        if not self.redis.exists(flushing_key):
+            try:
+                self.redis.rename(dirty_key, flushing_key)
+            except redis.ResponseError:
+                return 0  # Нет новых просмотров
+
+        ids = list(self.redis.smembers(flushing_key))
+        updated = 0
+
+        for start in range(0, len(ids), self.FLUSH_BATCH_SIZE):
+            chunk = ids[start:start + self.FLUSH_BATCH_SIZE]
+
+            # Только читаем: до коммита просмотры остаются в Redis
+            # и учитываются в ответах API
+            values = self.redis.mget([f"{self.KEY_PREFIX}:{kind}:{obj_id}" for obj_id in chunk])
+            deltas = {int(obj_id): int(value) for obj_id, value in zip(chunk, values) if value and int(value) > 0}
+            if not deltas:
+                continue
+
+            try:
+                db.execute(
+                    update(model)
+                    .where(model.id.in_(deltas))
+                    .values(views=func.coalesce(model.views, 0) + case(deltas, value=model.id, else_=0))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+            except Exception:
+                # Счетчики не тронуты, множество flushing перенесется следующим запуском
+                db.rollback()
+                raise
+
+            # Просмотры, пришедшие после чтения, остаются в счетчике
+            self._decr(
+                keys=[f"{self.KEY_PREFIX}:{kind}:{obj_id}" for obj_id in deltas],
+                args=list(deltas.values()),
+            )
+            updated += len(deltas)
+
+        self.redis.delete(flushing_key)
+        if updated:
+            logger.info(f"👁 Flushed views for {updated} {kind} objects")
+        return updated
+
+
+# Экземпляр счетчика для использования
+view_counter = ViewCounter()
@@ -3,171 +3,86 @@ Celery tasks для автоматического парсинга новост
 """
 import logging
 import asyncio
+from typing import Dict, List
 from celery import shared_task
-from sqlalchemy.orm import Session
+from celery.signals import worker_process_shutdown
 
 from app.db.database import SessionLocal
-from app.services.minfin_crawler import MinfinCrawler
-from app.services.liga_net_crawler import LigaNetCrawler
-from app.services.buhgalter911_crawler import Buhgalter911Crawler
-from app.services.news_filter import NewsFilterService, filter_relevant_news
-from app.models.news import News
+from app.crawlers.browser_pool import browser_pool
+from app.services.news_ingestion import NEWS_SOURCE_ADAPTERS, ingest_news_source
+from app.services.news_service import news_service
 from app.core.config import settings
 from datetime import datetime
 
-# Новые Playwright парсеры
-from app.crawlers.tax_gov_ua_playwright import crawl_tax_gov_ua as crawl_tax_gov_ua_playwright
-from app.crawlers.diia_gov_ua_playwright import crawl_diia_gov_ua as crawl_diia_gov_ua_playwright
-from app.crawlers.dtkt_crawler import crawl_dtkt
-from app.crawlers.buhplatforma_crawler import crawl_buhplatforma
-from app.crawlers.seveneminar_crawler import crawl_7eminar
-
 logger = logging.getLogger(__name__)
 
+# Event loop процесса воркера: живет между задачами, чтобы общий
+# Playwright браузер (browser_pool) не запускался заново на каждую задачу
+_worker_loop = None
 
-@shared_task(name="crawl_minfin_news_task")
-def crawl_minfin_news_task():
-    """
-    Celery task для автоматического парсинга новостей с minfin.com.ua
-    """
-    logger.info("🕷️ Starting scheduled Minfin crawler task...")
-    
-    db: Session = SessionLocal()
-    
+
+def run_in_worker_loop(coro):
+    """Выполнить корутину в постоянном event loop процесса воркера"""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop.run_until_complete(coro)
+
+
+@worker_process_shutdown.connect
+def close_browser_pool(**kwargs):
+    """Остановить общий браузер при завершении процесса воркера"""
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        _worker_loop.run_until_complete(browser_pool.close())
+        _worker_loop.close()
+
+
+async def _ingest_with_session(source_key: str) -> Dict:
+    """Загрузить источник в собственной сессии БД"""
+    db = SessionLocal()
     try:
-        # Парсинг новостей
-        crawler = MinfinCrawler()
-        all_news = crawler.crawl_all()
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items")
-        
-        # Фильтрация через OpenAI
-        filter_service = NewsFilterService(api_key=settings.OPENAI_API_KEY)
-        filtered_news = filter_service.filter_relevant_news(all_news)
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article['source'],
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=article.get('categories', []),
-                target_audience=article.get('target_audience', []),
-                published_at=datetime.utcnow()
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled crawler task finished: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ Scheduled crawler task error: {str(e)}")
+        return await ingest_news_source(source_key, db)
+    except BaseException:
         db.rollback()
         raise
     finally:
         db.close()
 
 
-@shared_task(name="crawl_liga_net_news_task")
-def crawl_liga_net_news_task():
+def run_source_ingestion(source_key: str) -> Dict:
     """
-    Celery task для автоматического парсинга новостей с liga.net
-    """
-    logger.info("🕷️ Starting scheduled Liga.net crawler task...")
+    Синхронный запуск pipeline загрузки для одного источника
     
-    db: Session = SessionLocal()
+    Args:
+        source_key: Ключ из NEWS_SOURCE_ADAPTERS
+    """
+    source_name = NEWS_SOURCE_ADAPTERS[source_key].source
+    logger.info(f"🕷️ Starting scheduled {source_name} crawler task...")
     
     try:
-        # Парсинг новостей
-        crawler = LigaNetCrawler()
-        all_news = crawler.crawl_all()
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items from Liga.net")
-        
-        # Фильтрация через OpenAI
-        filter_service = NewsFilterService(api_key=settings.OPENAI_API_KEY)
-        filtered_news = filter_service.filter_relevant_news(all_news)
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article['source'],
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=article.get('categories', []),
-                target_audience=article.get('target_audience', []),
-                published_at=datetime.utcnow()
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'source': 'liga.net',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled Liga.net crawler task finished: {result}")
+        result = run_in_worker_loop(_ingest_with_session(source_key))
+        logger.info(f"✅ Scheduled {source_name} crawler task finished: {result}")
         return result
-        
     except Exception as e:
-        logger.error(f"❌ Scheduled Liga.net crawler task error: {str(e)}")
-        db.rollback()
+        logger.error(f"❌ Scheduled {source_name} crawler task error: {str(e)}")
         raise
-    finally:
-        db.close()
+
+
+@shared_task(name="crawl_minfin_news_task")
+def crawl_minfin_news_task():
+    """
+    Celery task для автоматического парсинга новостей с minfin.com.ua
+    """
+    return run_source_ingestion('minfin')
+
+
+@shared_task(name="crawl_liga_net_news_task")
+def crawl_liga_net_news_task():
+    """
+    Celery task для автоматического парсинга новостей с liga.net
+    """
+    return run_source_ingestion('liga_net')
 
 
 @shared_task(name="crawl_buhgalter911_news_task")
@@ -175,72 +90,7 @@ def crawl_buhgalter911_news_task():
     """
     Celery task для автоматического парсинга новостей с buhgalter911.com
     """
-    logger.info("🕷️ Starting scheduled Buhgalter911.com crawler task...")
-    
-    db: Session = SessionLocal()
-    
-    try:
-        # Парсинг новостей
-        crawler = Buhgalter911Crawler()
-        all_news = crawler.crawl_all()
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items from Buhgalter911.com")
-        
-        # Фильтрация через OpenAI
-        filter_service = NewsFilterService(api_key=settings.OPENAI_API_KEY)
-        filtered_news = filter_service.filter_relevant_news(all_news)
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article['source'],
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=article.get('categories', []),
-                target_audience=article.get('target_audience', []),
-                published_at=datetime.utcnow()
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'source': 'buhgalter911.com',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled Buhgalter911.com crawler task finished: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ Scheduled Buhgalter911.com crawler task error: {str(e)}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    return run_source_ingestion('buhgalter911')
 
 
 @shared_task(name="crawl_tax_gov_ua_playwright_task")
@@ -248,91 +98,7 @@ def crawl_tax_gov_ua_playwright_task():
     """
     Celery task для автоматического парсинга новостей с tax.gov.ua через Playwright
     """
-    logger.info("🕷️ Starting scheduled Tax.gov.ua Playwright crawler task...")
-    
-    db: Session = SessionLocal()
-    
-    try:
-        # Парсинг новостей через Playwright (async)
-        all_news = asyncio.run(crawl_tax_gov_ua_playwright())
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items from Tax.gov.ua")
-        
-        if not all_news:
-            return {
-                'status': 'warning',
-                'source': 'tax.gov.ua',
-                'parsed': 0,
-                'filtered': 0,
-                'saved': 0,
-                'skipped': 0
-            }
-        
-        # Фильтрация через OpenAI (async)
-        filtered_news = asyncio.run(filter_relevant_news(all_news))
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', 'tax.gov.ua'),
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'source': 'tax.gov.ua',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled Tax.gov.ua Playwright crawler task finished: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ Scheduled Tax.gov.ua Playwright crawler task error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    return run_source_ingestion('tax_gov_ua_playwright')
 
 
 @shared_task(name="crawl_diia_gov_ua_playwright_task")
@@ -340,91 +106,7 @@ def crawl_diia_gov_ua_playwright_task():
     """
     Celery task для автоматического парсинга новостей с diia.gov.ua через Playwright
     """
-    logger.info("🕷️ Starting scheduled Diia.gov.ua Playwright crawler task...")
-    
-    db: Session = SessionLocal()
-    
-    try:
-        # Парсинг новостей через Playwright (async)
-        all_news = asyncio.run(crawl_diia_gov_ua_playwright())
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items from Diia.gov.ua")
-        
-        if not all_news:
-            return {
-                'status': 'warning',
-                'source': 'diia.gov.ua',
-                'parsed': 0,
-                'filtered': 0,
-                'saved': 0,
-                'skipped': 0
-            }
-        
-        # Фильтрация через OpenAI (async)
-        filtered_news = asyncio.run(filter_relevant_news(all_news))
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', 'diia.gov.ua'),
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'source': 'diia.gov.ua',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled Diia.gov.ua Playwright crawler task finished: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ Scheduled Diia.gov.ua Playwright crawler task error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    return run_source_ingestion('diia_gov_ua_playwright')
 
 
 @shared_task(name="crawl_dtkt_task")
@@ -432,91 +114,7 @@ def crawl_dtkt_task():
     """
     Celery task для автоматического парсинга новостей с dtkt.ua
     """
-    logger.info("🕷️ Starting scheduled dtkt.ua crawler task...")
-    
-    db: Session = SessionLocal()
-    
-    try:
-        # Парсинг новостей (async)
-        all_news = asyncio.run(crawl_dtkt())
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items from dtkt.ua")
-        
-        if not all_news:
-            return {
-                'status': 'warning',
-                'source': 'dtkt.ua',
-                'parsed': 0,
-                'filtered': 0,
-                'saved': 0,
-                'skipped': 0
-            }
-        
-        # Фильтрация через OpenAI (async)
-        filtered_news = asyncio.run(filter_relevant_news(all_news))
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', 'dtkt.ua'),
-                content=article.get('summary', article['title']),
-                summary=article.get('summary', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'source': 'dtkt.ua',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled dtkt.ua crawler task finished: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ Scheduled dtkt.ua crawler task error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    return run_source_ingestion('dtkt')
 
 
 @shared_task(name="crawl_buhplatforma_task")
@@ -524,91 +122,7 @@ def crawl_buhplatforma_task():
     """
     Celery task для автоматического парсинга новостей с buhplatforma.com.ua
     """
-    logger.info("🕷️ Starting scheduled buhplatforma.com.ua crawler task...")
-    
-    db: Session = SessionLocal()
-    
-    try:
-        # Парсинг новостей (async)
-        all_news = asyncio.run(crawl_buhplatforma())
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items from buhplatforma.com.ua")
-        
-        if not all_news:
-            return {
-                'status': 'warning',
-                'source': 'buhplatforma.com.ua',
-                'parsed': 0,
-                'filtered': 0,
-                'saved': 0,
-                'skipped': 0
-            }
-        
-        # Фильтрация через OpenAI (async)
-        filtered_news = asyncio.run(filter_relevant_news(all_news))
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', 'buhplatforma.com.ua'),
-                content=article.get('description', article['title']),
-                summary=article.get('description', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'source': 'buhplatforma.com.ua',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled buhplatforma.com.ua crawler task finished: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ Scheduled buhplatforma.com.ua crawler task error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    return run_source_ingestion('buhplatforma')
 
 
 @shared_task(name="crawl_7eminar_task")
@@ -616,91 +130,55 @@ def crawl_7eminar_task():
     """
     Celery task для автоматического парсинга новостей с 7eminar.ua
     """
-    logger.info("🕷️ Starting scheduled 7eminar.ua crawler task...")
+    return run_source_ingestion('7eminar')
+
+
+# Источники для полного обхода (ключи NEWS_SOURCE_ADAPTERS)
+NEWS_SOURCES = [
+    'minfin',
+    'liga_net',
+    'buhgalter911',
+    'tax_gov_ua_playwright',
+    'diia_gov_ua_playwright',
+    'dtkt',
+    'buhplatforma',
+    '7eminar',
+]
+
+
+async def crawl_sources_concurrently(source_keys: List[str], timeout: int) -> List[Dict]:
+    """
+    Параллельная загрузка источников в одном event loop
     
-    db: Session = SessionLocal()
+    Каждый источник проходит свой pipeline в отдельной сессии БД, ожидание
+    ограничено timeout секундами. Ошибка или таймаут одного источника
+    не влияет на остальные.
     
-    try:
-        # Парсинг новостей (async)
-        all_news = asyncio.run(crawl_7eminar())
-        
-        logger.info(f"📰 Crawled {len(all_news)} news items from 7eminar.ua")
-        
-        if not all_news:
-            return {
-                'status': 'warning',
-                'source': '7eminar.ua',
-                'parsed': 0,
-                'filtered': 0,
-                'saved': 0,
-                'skipped': 0
-            }
-        
-        # Фильтрация через OpenAI (async)
-        filtered_news = asyncio.run(filter_relevant_news(all_news))
-        
-        logger.info(f"✅ OpenAI filtered: {len(filtered_news)}/{len(all_news)} relevant articles")
-        
-        # Сохранение в БД
-        saved_count = 0
-        skipped_count = 0
-        
-        for article in filtered_news:
-            # Проверка на дубликаты по URL
-            existing = db.query(News).filter(News.url == article['url']).first()
-            
-            if existing:
-                logger.info(f"  ⏭️ Skipping duplicate: {article['title'][:50]}...")
-                skipped_count += 1
-                continue
-            
-            # Парсим дату
-            try:
-                if 'published_date' in article and article['published_date']:
-                    published_at = datetime.fromisoformat(article['published_date'])
-                else:
-                    published_at = datetime.utcnow()
-            except:
-                published_at = datetime.utcnow()
-            
-            # Создание новой записи
-            news_item = News(
-                title=article['title'],
-                url=article['url'],
-                source=article.get('source', '7eminar.ua'),
-                content=article.get('description', article['title']),
-                summary=article.get('description', article['title']),
-                categories=[article.get('category', 'загальне')],
-                target_audience=article.get('target_audience', []),
-                published_at=published_at
-            )
-            
-            db.add(news_item)
-            saved_count += 1
-            logger.info(f"  💾 Saved: {article['title'][:50]}...")
-        
-        db.commit()
-        
-        result = {
-            'status': 'success',
-            'source': '7eminar.ua',
-            'parsed': len(all_news),
-            'filtered': len(filtered_news),
-            'saved': saved_count,
-            'skipped': skipped_count
-        }
-        
-        logger.info(f"✅ Scheduled 7eminar.ua crawler task finished: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ Scheduled 7eminar.ua crawler task error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    Args:
+        source_keys: Ключи из NEWS_SOURCE_ADAPTERS
+        timeout: Бюджет времени на один источник (секунды)
+    
+    Returns:
+        Список результатов в порядке source_keys
+    """
+    async def run_source(index: int, source_key: str) -> Dict:
+        source_name = NEWS_SOURCE_ADAPTERS[source_key].source
+        logger.info(f"📰 [{index}/{len(source_keys)}] Crawling {source_name}...")
+        try:
+            result = await asyncio.wait_for(_ingest_with_session(source_key), timeout=timeout)
+            logger.info(f"✅ {source_name}: {result}")
+            return result
+        except asyncio.TimeoutError:
+            logger.error(f"⏱️ {source_name} crawler timed out after {timeout}s")
+            return {'status': 'error', 'source': source_name, 'error': f'Timeout after {timeout}s'}
+        except Exception as e:
+            logger.error(f"❌ {source_name} crawler failed: {str(e)}")
+            return {'status': 'error', 'source': source_name, 'error': str(e)}
+    
+    return await asyncio.gather(*(
+        run_source(i, source_key)
+        for i, source_key in enumerate(source_keys, 1)
+    ))
 
 
 @shared_task(name="crawl_all_news_sources_task")
@@ -708,109 +186,35 @@ def crawl_all_news_sources_task():
     """
     Celery task для парсинга ВСЕХ источников новостей
     
-    Запускает все краулеры последовательно:
+    Запускает все краулеры из NEWS_SOURCES параллельно:
     1. Minfin.com.ua (BS4)
     2. Liga.net (BS4)
     3. Buhgalter911.com (BS4)
-    4. Tax.gov.ua (Playwright) ⭐ NEW
-    5. Diia.gov.ua (Playwright) ⭐ NEW
-    6. Dtkt.ua (BS4) ⭐ NEW
-    7. Buhplatforma.com.ua (BS4) ⭐ NEW
-    8. 7eminar.ua (BS4) ⭐ NEW
+    4. Tax.gov.ua (Playwright)
+    5. Diia.gov.ua (Playwright)
+    6. Dtkt.ua (BS4)
+    7. Buhplatforma.com.ua (BS4)
+    8. 7eminar.ua (BS4)
     
-    Для каждого источника:
+    Для каждого источника (см. NewsIngestionPipeline):
     - Парсит новости
     - Фильтрует через OpenAI
     - Сохраняет только новые релевантные новости в БД
+    
+    Время обхода определяется самым медленным источником, а не суммой всех.
+    Каждому источнику выделяется NEWS_CRAWL_SOURCE_TIMEOUT секунд.
     """
     logger.info("=" * 80)
     logger.info(f"🕷️ Starting FULL NEWS CRAWL at {datetime.utcnow().isoformat()}")
     logger.info("=" * 80)
     
-    results = []
-    
-    # 1. Minfin.com.ua
-    try:
-        logger.info("\n📰 [1/8] Crawling Minfin.com.ua...")
-        minfin_result = crawl_minfin_news_task()
-        results.append(minfin_result)
-        logger.info(f"✅ Minfin: {minfin_result}")
-    except Exception as e:
-        logger.error(f"❌ Minfin crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': 'minfin.com.ua', 'error': str(e)})
-    
-    # 2. Liga.net
-    try:
-        logger.info("\n📰 [2/8] Crawling Liga.net...")
-        liga_result = crawl_liga_net_news_task()
-        results.append(liga_result)
-        logger.info(f"✅ Liga.net: {liga_result}")
-    except Exception as e:
-        logger.error(f"❌ Liga.net crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': 'liga.net', 'error': str(e)})
-    
-    # 3. Buhgalter911.com
-    try:
-        logger.info("\n📰 [3/8] Crawling Buhgalter911.com...")
-        buhgalter_result = crawl_buhgalter911_news_task()
-        results.append(buhgalter_result)
-        logger.info(f"✅ Buhgalter911.com: {buhgalter_result}")
-    except Exception as e:
-        logger.error(f"❌ Buhgalter911.com crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': 'buhgalter911.com', 'error': str(e)})
-    
-    # 4. Tax.gov.ua (Playwright) ⭐ NEW
-    try:
-        logger.info("\n📰 [4/8] Crawling Tax.gov.ua (Playwright)...")
-        tax_result = crawl_tax_gov_ua_playwright_task()
-        results.append(tax_result)
-        logger.info(f"✅ Tax.gov.ua: {tax_result}")
-    except Exception as e:
-        logger.error(f"❌ Tax.gov.ua Playwright crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': 'tax.gov.ua', 'error': str(e)})
-    
-    # 5. Diia.gov.ua (Playwright) ⭐ NEW
-    try:
-        logger.info("\n📰 [5/8] Crawling Diia.gov.ua (Playwright)...")
-        diia_result = crawl_diia_gov_ua_playwright_task()
-        results.append(diia_result)
-        logger.info(f"✅ Diia.gov.ua: {diia_result}")
-    except Exception as e:
-        logger.error(f"❌ Diia.gov.ua Playwright crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': 'diia.gov.ua', 'error': str(e)})
-    
-    # 6. Dtkt.ua (BS4) ⭐ NEW
-    try:
-        logger.info("\n📰 [6/8] Crawling Dtkt.ua...")
-        dtkt_result = crawl_dtkt_task()
-        results.append(dtkt_result)
-        logger.info(f"✅ Dtkt.ua: {dtkt_result}")
-    except Exception as e:
-        logger.error(f"❌ Dtkt.ua crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': 'dtkt.ua', 'error': str(e)})
-    
-    # 7. Buhplatforma.com.ua (BS4) ⭐ NEW
-    try:
-        logger.info("\n📰 [7/8] Crawling Buhplatforma.com.ua...")
-        buhplatforma_result = crawl_buhplatforma_task()
-        results.append(buhplatforma_result)
-        logger.info(f"✅ Buhplatforma.com.ua: {buhplatforma_result}")
-    except Exception as e:
-        logger.error(f"❌ Buhplatforma.com.ua crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': 'buhplatforma.com.ua', 'error': str(e)})
-    
-    # 8. 7eminar.ua (BS4) ⭐ NEW
-    try:
-        logger.info("\n📰 [8/8] Crawling 7eminar.ua...")
-        eminar_result = crawl_7eminar_task()
-        results.append(eminar_result)
-        logger.info(f"✅ 7eminar.ua: {eminar_result}")
-    except Exception as e:
-        logger.error(f"❌ 7eminar.ua crawler failed: {str(e)}")
-        results.append({'status': 'error', 'source': '7eminar.ua', 'error': str(e)})
+    results = run_in_worker_loop(
+        crawl_sources_concurrently(NEWS_SOURCES, timeout=settings.NEWS_CRAWL_SOURCE_TIMEOUT)
+    )
     
     # Итоговая статистика
     total_parsed = sum(r.get('parsed', 0) for r in results)
+    total_already_known = sum(r.get('already_known', 0) for r in results)
     total_filtered = sum(r.get('filtered', 0) for r in results)
     total_saved = sum(r.get('saved', 0) for r in results)
     total_skipped = sum(r.get('skipped', 0) for r in results)
@@ -820,6 +224,7 @@ def crawl_all_news_sources_task():
         'timestamp': datetime.utcnow().isoformat(),
         'sources_crawled': len(results),
         'total_parsed': total_parsed,
+        'total_already_known': total_already_known,
         'total_filtered': total_filtered,
         'total_saved': total_saved,
         'total_skipped': total_skipped,
@@ -829,6 +234,7 @@ def crawl_all_news_sources_task():
     logger.info("=" * 80)
     logger.info(f"🎉 FULL NEWS CRAWL COMPLETED")
     logger.info(f"   Total parsed: {total_parsed}")
+    logger.info(f"   Already in DB (not sent to OpenAI): {total_already_known}")
     logger.info(f"   Total filtered by OpenAI: {total_filtered}")
     logger.info(f"   Total saved to DB: {total_saved}")
     logger.info(f"   Total skipped (duplicates): {total_skipped}")
@@ -837,6 +243,22 @@ def crawl_all_news_sources_task():
     return summary
 
 
+@shared_task(name="refresh_news_category_counts_task")
+def refresh_news_category_counts_task():
+    """
+    Celery task для полного пересчета счетчиков категорий новостей
+    
+    Счетчики обновляются инкрементально при загрузке, пересчет
+    исправляет возможные расхождения после ручных изменений в БД.
+    """
+    db = SessionLocal()
+    try:
+        categories = news_service.refresh_category_counts(db)
+        return {'status': 'success', 'categories': categories}
+    finally:
+        db.close()
+
+
 @shared_task(name="test_celery_task")
 def test_celery_task():
     """
@@ -0,0 +1,28 @@
+"""
+Celery tasks для обслуживания форума
+"""
+from celery import shared_task
+import logging
+
+from app.db.database import SessionLocal
+from app.services.forum_service import forum_service
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="refresh_forum_thread_counters_task")
+def refresh_forum_thread_counters_task():
+    """
+    Celery task для полного пересчета счетчиков топиков форума
+    
+    Счетчики обновляются при создании/удалении постов и лайков,
+    пересчет исправляет возможные расхождения после ручных изменений в БД.
+    """
+    db = SessionLocal()
+    try:
+        threads = forum_service.refresh_thread_counters(db)
+        db.commit()
+        logger.info(f"✅ Forum thread counters refreshed: {threads} threads")
+        return {'status': 'success', 'threads': threads}
+    finally:
+        db.close()
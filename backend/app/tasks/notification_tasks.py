@@ -2,50 +2,66 @@
 Celery tasks для отправки push-уведомлений
 """
 from celery import shared_task
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import json
-import os
+from typing import Any, Dict
 import logging
 import random
-import time
 
+from app.core.config import settings
 from app.db.database import SessionLocal
+from app.models.notification import NotificationSettings
 from app.models.user import User, UserType
 from app.models.news import News
 from app.services.push_notification import push_service
 from app.services.news_personalization import news_personalization_service
+from app.services.calendar_repository import calendar_repository
 
 logger = logging.getLogger(__name__)
 
+# Максимальная случайная задержка рассылки новостей (секунды)
+NEWS_NOTIFICATION_MAX_DELAY = 2 * 60 * 60
 
-def get_all_calendar_data() -> List[Dict[str, Any]]:
+# За сколько дней до дедлайна уведомлять (по умолчанию для настроек пользователя)
+DEADLINE_DAYS_BEFORE = (1, 3)
+
+
+def _days_text(days_before: int) -> str:
+    """Текст срока для уведомления о дедлайне"""
+    if days_before == 1:
+        return "завтра"
+    return f"через {days_before} дні" if days_before < 5 else f"через {days_before} днів"
+
+
+def _build_deadline_messages(today) -> Dict[int, Dict[str, Any]]:
     """
-    Получить все данные календаря из all.json
-    
+    Шаблоны уведомлений по группам (days_before, событие)
+
     Returns:
-        Список всех событий календаря
+        {days_before: {"title", "body", "data"}} для дат, на которые есть события
     """
-    try:
-        # Путь к файлу all.json
-        calendar_file = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "data",
-            "calendar",
-            "all.json"
-        )
-        
-        if not os.path.exists(calendar_file):
-            logger.warning(f"Calendar file not found: {calendar_file}")
-            return []
-        
-        with open(calendar_file, "r", encoding="utf-8") as f:
-            return json.load(f)
-            
-    except Exception as e:
-        logger.error(f"Error loading calendar data: {e}")
-        return []
+    messages = {}
+    for days_before in DEADLINE_DAYS_BEFORE:
+        check_date = today + timedelta(days=days_before)
+        events = calendar_repository.events_on(check_date)
+        if not events:
+            continue
+
+        # event - это уже сам отчет
+        report = events[0].model_dump()
+        deadline_date = check_date.strftime("%d.%m.%Y")
+        messages[days_before] = {
+            "title": "⏰ Нагадування про дедлайн",
+            "body": f"{report.get('title', 'Звіт')} - {_days_text(days_before)} ({deadline_date})",
+            "data": {
+                "type": "deadline",
+                "report": report,
+                "date": deadline_date,
+                "days_before": days_before
+            }
+        }
+    return messages
 
 
 @shared_task(name="send_deadline_notifications")
@@ -53,116 +69,80 @@ def send_deadline_notifications():
     """
     Отправить уведомления о приближающихся дедлайнах
     Запускается каждый день в 9:00
+
+    Пользователи читаются вместе с настройками батчами через серверный курсор,
+    уведомления уходят в Expo пачками по PUSH_CHUNK_SIZE, устаревшие токены
+    удаляются одним UPDATE в конце.
     """
     logger.info("Starting deadline notifications task")
     
     db = SessionLocal()
     try:
-        # Получаем текущую дату
-        today = datetime.now().date()
+        messages = _build_deadline_messages(datetime.now().date())
         
-        # Получаем даты для проверки (через 1 и 3 дня)
-        dates_to_check = {
-            1: today + timedelta(days=1),
-            3: today + timedelta(days=3)
-        }
-        
-        # Загружаем все данные календаря из all.json
-        all_calendar_data = get_all_calendar_data()
-        
-        # Ищем события на нужные даты
-        notifications_to_send = {}
-        
-        for days_before, check_date in dates_to_check.items():
-            # Ищем события на эту дату
-            for event in all_calendar_data:
-                try:
-                    # Парсим дату - поддерживаем оба формата: DD.MM.YY и DD.MM.YYYY
-                    event_date_str = event["date"]
-                    try:
-                        event_date = datetime.strptime(event_date_str, "%d.%m.%y").date()
-                    except ValueError:
-                        event_date = datetime.strptime(event_date_str, "%d.%m.%Y").date()
-                    
-                    if event_date == check_date:
-                        # event - это уже сам отчет
-                        notifications_to_send[days_before] = {
-                            "date": check_date,
-                            "report": event,
-                            "days_before": days_before
-                        }
-                        break
-                except (ValueError, KeyError) as e:
-                    logger.warning(f"Error parsing event date: {event.get('date')}, error: {e}")
-                    continue
-        
-        if not notifications_to_send:
+        if not messages:
             logger.info("No deadlines found for upcoming days")
             return {"status": "success", "notifications_sent": 0}
         
-        # Получаем пользователей с включенными уведомлениями о дедлайнах
-        users = db.query(User).filter(
-            User.is_active == True,
-            User.is_verified == True,
-            User.push_token.isnot(None)
-        ).all()
+        # Только нужные колонки пользователей с включенными уведомлениями о дедлайнах
+        stmt = (
+            select(User.id, User.push_token, NotificationSettings.deadline_days_before)
+            .join(NotificationSettings, NotificationSettings.user_id == User.id)
+            .where(
+                User.is_active == True,
+                User.is_verified == True,
+                User.push_token.isnot(None),
+                NotificationSettings.enable_deadline_notifications == True
+            )
+            .execution_options(yield_per=settings.PUSH_FANOUT_BATCH_SIZE)
+        )
         
         total_sent = 0
-        
-        for user in users:
-            # Проверяем настройки пользователя
-            if not user.notification_settings:
-                continue
-            
-            settings = user.notification_settings
-            if not settings.enable_deadline_notifications:
-                continue
-            
-            # Проверяем, за сколько дней пользователь хочет получать уведомления
-            days_before_list = settings.deadline_days_before or [1, 3]
-            
-            for days_before, notif_data in notifications_to_send.items():
-                if days_before not in days_before_list:
-                    continue
-                
-                # Формируем текст уведомления
-                report_name = notif_data["report"].get("title", "Звіт")
-                deadline_date = notif_data["date"].strftime("%d.%m.%Y")
-                
-                if days_before == 1:
-                    days_text = "завтра"
-                else:
-                    days_text = f"через {days_before} дні" if days_before < 5 else f"через {days_before} днів"
-                
-                title = f"⏰ Нагадування про дедлайн"
-                body = f"{report_name} - {days_text} ({deadline_date})"
-                
-                # Отправляем уведомление
-                result = push_service.send_push_notification(
-                    push_token=user.push_token,
-                    title=title,
-                    body=body,
-                    data={
-                        "type": "deadline",
-                        "report": notif_data["report"],
-                        "date": deadline_date,
-                        "days_before": days_before
-                    }
-                )
-                
-                if result["success"]:
+        total_failed = 0
+        tokens_to_remove = set()
+        pending = []
+        
+        def flush():
+            nonlocal total_sent, total_failed
+            results = push_service.send_push_notifications_batch(pending)
+            push_service.record_tickets(db, results)
+            for result in results:
+                if result.get("success"):
                     total_sent += 1
-                    logger.info(f"Deadline notification sent to user {user.id}")
                 else:
-                    logger.error(f"Failed to send notification to user {user.id}: {result.get('error')}")
-                    
-                    # Если токен устарел, удаляем его
+                    total_failed += 1
                     if result.get("should_remove_token"):
-                        user.push_token = None
-                        db.commit()
+                        tokens_to_remove.add(result["push_token"])
+            pending.clear()
+        
+        for rows in db.execute(stmt).partitions():
+            for user_id, push_token, days_before_list in rows:
+                # За сколько дней пользователь хочет получать уведомления
+                days_before_list = days_before_list or DEADLINE_DAYS_BEFORE
+                
+                for days_before, message in messages.items():
+                    if days_before not in days_before_list:
+                        continue
+                    pending.append({"push_token": push_token, **message})
+                    
+                    # Копим по чанку на каждый параллельный запрос к Expo
+                    if len(pending) >= settings.PUSH_CHUNK_SIZE * settings.PUSH_SEND_CONCURRENCY:
+                        flush()
+        
+        if pending:
+            flush()
         
-        logger.info(f"Deadline notifications task completed. Sent: {total_sent}")
-        return {"status": "success", "notifications_sent": total_sent}
+        # Устаревшие токены удаляем одним запросом, тикеты сохраняем для проверки квитанций
+        push_service.remove_tokens(db, tokens_to_remove)
+        db.commit()
+        
+        logger.info(f"Deadline notifications task completed. Sent: {total_sent}, failed: {total_failed}")
+        return {
+            "status": "success",
+            "notifications_sent": total_sent,
+            "notifications_failed": total_failed,
+            "tokens_removed": len(tokens_to_remove)
+        }
         
     except Exception as e:
         logger.error(f"Error in deadline notifications task: {e}")
@@ -172,23 +152,32 @@ def send_deadline_notifications():
         db.close()
 
 
+@shared_task(name="schedule_news_notifications")
+def schedule_news_notifications():
+    """
+    Запланировать рассылку новостей со случайной задержкой 0-120 минут
+    Запускается 2 раза в день: в 12:00 и 18:00
+
+    Задержка задается через countdown, поэтому воркер не простаивает в ожидании:
+    задача с ETA ждет в брокере/воркере, не занимая процесс пула.
+    """
+    delay_seconds = random.randint(0, NEWS_NOTIFICATION_MAX_DELAY)
+    send_at = datetime.now() + timedelta(seconds=delay_seconds)
+    
+    send_news_notifications.apply_async(countdown=delay_seconds)
+    
+    logger.info(f"News notifications scheduled in {delay_seconds / 60:.1f} minutes (at {send_at:%H:%M})")
+    return {"status": "scheduled", "delay_seconds": delay_seconds, "send_at": send_at.isoformat()}
+
+
 @shared_task(name="send_news_notifications")
 def send_news_notifications():
     """
     Отправить уведомления о новостях ВСЕМ пользователям (зарегистрированным + анонимным)
-    Запускается 2 раза в день: в 12:00 и 18:00 (с рандомной задержкой 0-120 минут)
+    Ставится в очередь задачей schedule_news_notifications
     """
     logger.info("Starting news notifications task")
     
-    # РАНДОМНАЯ ЗАДЕРЖКА: 0-120 минут (0-7200 секунд)
-    delay_seconds = random.randint(0, 7200)  # 2 часа = 7200 секунд
-    delay_minutes = delay_seconds / 60
-    
-    logger.info(f"Applying random delay: {delay_minutes:.1f} minutes ({delay_seconds} seconds)")
-    time.sleep(delay_seconds)
-    
-    logger.info(f"Delay completed. Sending news notifications now at {datetime.now()}")
-    
     db = SessionLocal()
     try:
         # Получаем свежие новости за последние 24 часа
@@ -233,8 +222,7 @@ def send_news_notifications():
             "notifications_sent": result['success'],
             "registered_users": result['registered_users'],
             "anonymous_users": result['anonymous_users'],
-            "news_title": news_item.title,
-            "delay_minutes": delay_minutes
+            "news_title": news_item.title
         }
         
     except Exception as e:
@@ -244,3 +232,24 @@ def send_news_notifications():
     finally:
         db.close()
 
+
+
+@shared_task(name="check_push_receipts")
+def check_push_receipts():
+    """
+    Проверить квитанции Expo по сохраненным тикетам и удалить недействительные токены
+    Запускается каждые 30 минут
+    """
+    logger.info("Starting push receipts check")
+    
+    db = SessionLocal()
+    try:
+        stats = push_service.check_receipts(db)
+        return {"status": "success", **stats}
+        
+    except Exception as e:
+        logger.error(f"Error in push receipts task: {e}")
+        return {"status": "error", "error": str(e)}
+        
+    finally:
+        db.close()
@@ -0,0 +1,74 @@
+"""
+Celery tasks для поискового индекса Elasticsearch
+"""
+from celery import shared_task
+import logging
+from typing import List
+
+from app.db.database import SessionLocal
+from app.services.search_index import search_index, THREAD_DOC
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="index_search_documents_task", autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def index_search_documents_task(doc_type: str, ids: List[int]):
+    """
+    Celery task для индексации измененных объектов
+
+    Вызывается из API после коммита. Объекты, которых уже нет в БД
+    или которые сняты с публикации, удаляются из индекса.
+    """
+    db = SessionLocal()
+    try:
+        indexed = search_index.index_objects(db, doc_type, ids)
+        return {'status': 'success', 'type': doc_type, 'indexed': indexed}
+    finally:
+        db.close()
+
+
+@shared_task(name="delete_search_documents_task", autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def delete_search_documents_task(doc_type: str, ids: List[int]):
+    """
+    Celery task для удаления объектов из индекса
+
+    Для топика форума удаляются и все его комментарии.
+    """
+    if doc_type == THREAD_DOC:
+        for thread_id in ids:
+            search_index.delete_thread(thread_id)
+    else:
+        search_index.delete_objects(doc_type, ids)
+    return {'status': 'success', 'type': doc_type, 'deleted': len(ids)}
+
+
+@shared_task(name="reindex_search_type_task")
+def reindex_search_type_task(doc_type: str):
+    """
+    Celery task для переиндексации одного типа документов
+
+    Используется после массовых изменений (загрузка реквизитов из Excel).
+    """
+    db = SessionLocal()
+    try:
+        indexed = search_index.reindex_type(db, doc_type)
+        logger.info(f"🔎 Search reindex {doc_type}: {indexed}")
+        return {'status': 'success', 'type': doc_type, 'indexed': indexed}
+    finally:
+        db.close()
+
+
+@shared_task(name="reindex_search_task")
+def reindex_search_task():
+    """
+    Celery task для полной переиндексации
+
+    Запускается каждый день в 5:00, строит новый индекс и переключает алиас.
+    Исправляет расхождения, если точечная синхронизация не сработала.
+    """
+    db = SessionLocal()
+    try:
+        counts = search_index.reindex_all(db)
+        return {'status': 'success', **counts}
+    finally:
+        db.close()
@@ -0,0 +1,25 @@
+"""
+Celery tasks для счетчиков просмотров
+"""
+from celery import shared_task
+import logging
+
+from app.db.database import SessionLocal
+from app.services.view_counter import view_counter
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="flush_view_counters_task")
+def flush_view_counters_task():
+    """
+    Celery task для переноса просмотров из Redis в PostgreSQL
+    
+    Запускается каждые 5 минут, обновляет views пачками одним UPDATE.
+    """
+    db = SessionLocal()
+    try:
+        flushed = view_counter.flush(db)
+        return {'status': 'success', **flushed}
+    finally:
+        db.close()
@@ -0,0 +1,43 @@
+"""add_news_category_counts
+
+Revision ID: 7c1e4b9a2f60
+Revises: 5a8f9c2d1e3b
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b9a2f60'
+down_revision = '5a8f9c2d1e3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create news_category_counts table
+    op.create_table(
+        'news_category_counts',
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('category')
+    )
+
+    # Backfill counts from existing published news
+    op.execute("""
+        INSERT INTO news_category_counts (category, count, updated_at)
+        SELECT category, COUNT(DISTINCT news.id), now()
+        FROM news
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(news.categories::jsonb) = 'array' THEN news.categories::jsonb ELSE '[]'::jsonb END
+        ) AS category
+        WHERE news.is_published IS TRUE
+        GROUP BY category
+    """)
+
+
+def downgrade():
+    # Drop table
+    op.drop_table('news_category_counts')
@@ -0,0 +1,58 @@
+"""news_jsonb_and_gin_indexes
+
+Revision ID: 9d3f6a1c8b47
+Revises: 7c1e4b9a2f60
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6a1c8b47'
+down_revision = '7c1e4b9a2f60'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = ('categories', 'tags', 'target_audience')
+
+
+def upgrade():
+    # Convert JSON columns to JSONB (supports @> and GIN indexes)
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'news', column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=sa.JSON(),
+            postgresql_using=f'{column}::jsonb',
+        )
+
+    # Create indexes
+    op.create_index(
+        'ix_news_categories_gin', 'news', ['categories'], unique=False,
+        postgresql_using='gin', postgresql_ops={'categories': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_news_target_audience_gin', 'news', ['target_audience'], unique=False,
+        postgresql_using='gin', postgresql_ops={'target_audience': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_news_published_published_at', 'news', ['is_published', sa.text('published_at DESC')], unique=False,
+    )
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index('ix_news_published_published_at', table_name='news')
+    op.drop_index('ix_news_target_audience_gin', table_name='news')
+    op.drop_index('ix_news_categories_gin', table_name='news')
+
+    # Convert JSONB columns back to JSON
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'news', column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f'{column}::json',
+        )
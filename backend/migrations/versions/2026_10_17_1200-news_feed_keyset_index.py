@@ -0,0 +1,31 @@
+"""news_feed_keyset_index
+
+Revision ID: 2b7e5d0f4a19
+Revises: 9d3f6a1c8b47
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2b7e5d0f4a19'
+down_revision = '9d3f6a1c8b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Recreate feed index with id as tie-breaker for keyset pagination
+    op.drop_index('ix_news_published_published_at', table_name='news')
+    op.create_index(
+        'ix_news_published_published_at', 'news',
+        ['is_published', sa.text('published_at DESC'), sa.text('id DESC')], unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_news_published_published_at', table_name='news')
+    op.create_index(
+        'ix_news_published_published_at', 'news', ['is_published', sa.text('published_at DESC')], unique=False,
+    )
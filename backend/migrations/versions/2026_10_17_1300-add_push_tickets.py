@@ -0,0 +1,37 @@
+"""add_push_tickets
+
+Revision ID: 4e8a2c6f1d35
+Revises: 2b7e5d0f4a19
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4e8a2c6f1d35'
+down_revision = '2b7e5d0f4a19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create push_tickets table (Expo tickets awaiting receipt check)
+    op.create_table(
+        'push_tickets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ticket_id', sa.String(), nullable=False),
+        sa.Column('push_token', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ticket_id')
+    )
+    op.create_index(op.f('ix_push_tickets_id'), 'push_tickets', ['id'], unique=False)
+    op.create_index(op.f('ix_push_tickets_created_at'), 'push_tickets', ['created_at'], unique=False)
+
+
+def downgrade():
+    # Drop table
+    op.drop_index(op.f('ix_push_tickets_created_at'), table_name='push_tickets')
+    op.drop_index(op.f('ix_push_tickets_id'), table_name='push_tickets')
+    op.drop_table('push_tickets')
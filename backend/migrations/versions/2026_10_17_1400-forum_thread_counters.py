@@ -0,0 +1,49 @@
+"""forum_thread_counters
+
+Revision ID: 6b1d9f3e7a28
+Revises: 4e8a2c6f1d35
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '6b1d9f3e7a28'
+down_revision = '4e8a2c6f1d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Add denormalized counters to forum_threads
+    op.add_column('forum_threads', sa.Column('posts_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('forum_threads', sa.Column('last_post_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('forum_threads', sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill counters from existing posts and likes
+    op.execute("""
+        UPDATE forum_threads SET
+            posts_count = (SELECT COUNT(*) FROM forum_posts WHERE forum_posts.thread_id = forum_threads.id),
+            last_post_at = (SELECT MAX(created_at) FROM forum_posts WHERE forum_posts.thread_id = forum_threads.id),
+            likes_count = (
+                SELECT COUNT(*) FROM forum_likes
+                JOIN forum_posts ON forum_posts.id = forum_likes.post_id
+                WHERE forum_posts.thread_id = forum_threads.id
+            )
+    """)
+
+    # Create indexes for HOT and UNANSWERED sorting
+    op.create_index('ix_forum_threads_hot', 'forum_threads', ['is_pinned', 'posts_count'], unique=False)
+    op.create_index('ix_forum_threads_posts_count_created', 'forum_threads', ['posts_count', 'created_at'], unique=False)
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index('ix_forum_threads_posts_count_created', table_name='forum_threads')
+    op.drop_index('ix_forum_threads_hot', table_name='forum_threads')
+
+    # Drop columns
+    op.drop_column('forum_threads', 'likes_count')
+    op.drop_column('forum_threads', 'last_post_at')
+    op.drop_column('forum_threads', 'posts_count')
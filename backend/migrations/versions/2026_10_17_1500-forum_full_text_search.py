@@ -0,0 +1,81 @@
+"""forum_full_text_search
+
+Revision ID: 8c4f2a7d9e13
+Revises: 6b1d9f3e7a28
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '8c4f2a7d9e13'
+down_revision = '6b1d9f3e7a28'
+branch_labels = None
+depends_on = None
+
+# Text search config, must match FORUM_SEARCH_CONFIG in app/api/forum.py
+THREADS_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}.content, '')), 'B')"
+)
+POSTS_VECTOR = "to_tsvector('simple', coalesce({row}.content, ''))"
+
+
+def upgrade():
+    # Add tsvector columns
+    op.add_column('forum_threads', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.add_column('forum_posts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Triggers keep search_vector in sync on insert/update
+    op.execute(f"""
+        CREATE FUNCTION forum_threads_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {THREADS_VECTOR.format(row='NEW')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER forum_threads_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, content ON forum_threads
+        FOR EACH ROW EXECUTE PROCEDURE forum_threads_search_vector_update()
+    """)
+    op.execute(f"""
+        CREATE FUNCTION forum_posts_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {POSTS_VECTOR.format(row='NEW')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER forum_posts_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF content ON forum_posts
+        FOR EACH ROW EXECUTE PROCEDURE forum_posts_search_vector_update()
+    """)
+
+    # Backfill existing rows
+    op.execute(f"UPDATE forum_threads SET search_vector = {THREADS_VECTOR.format(row='forum_threads')}")
+    op.execute(f"UPDATE forum_posts SET search_vector = {POSTS_VECTOR.format(row='forum_posts')}")
+
+    # Create GIN indexes
+    op.create_index('ix_forum_threads_search_vector', 'forum_threads', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_forum_posts_search_vector', 'forum_posts', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index('ix_forum_posts_search_vector', table_name='forum_posts')
+    op.drop_index('ix_forum_threads_search_vector', table_name='forum_threads')
+
+    # Drop triggers and functions
+    op.execute("DROP TRIGGER IF EXISTS forum_posts_search_vector_trigger ON forum_posts")
+    op.execute("DROP FUNCTION IF EXISTS forum_posts_search_vector_update()")
+    op.execute("DROP TRIGGER IF EXISTS forum_threads_search_vector_trigger ON forum_threads")
+    op.execute("DROP FUNCTION IF EXISTS forum_threads_search_vector_update()")
+
+    # Drop columns
+    op.drop_column('forum_posts', 'search_vector')
+    op.drop_column('forum_threads', 'search_vector')
@@ -0,0 +1,33 @@
+"""forum_thread_sort_tiebreaker
+
+Revision ID: 3a9e6c1f5b82
+Revises: 8c4f2a7d9e13
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3a9e6c1f5b82'
+down_revision = '8c4f2a7d9e13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Recreate thread sort indexes with id as unique tie-breaker for stable pagination
+    op.drop_index('ix_forum_threads_hot', table_name='forum_threads')
+    op.create_index('ix_forum_threads_hot', 'forum_threads', ['is_pinned', 'posts_count', 'id'], unique=False)
+    op.drop_index('ix_forum_threads_posts_count_created', table_name='forum_threads')
+    op.create_index(
+        'ix_forum_threads_posts_count_created', 'forum_threads', ['posts_count', 'created_at', 'id'], unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_forum_threads_posts_count_created', table_name='forum_threads')
+    op.create_index(
+        'ix_forum_threads_posts_count_created', 'forum_threads', ['posts_count', 'created_at'], unique=False,
+    )
+    op.drop_index('ix_forum_threads_hot', table_name='forum_threads')
+    op.create_index('ix_forum_threads_hot', 'forum_threads', ['is_pinned', 'posts_count'], unique=False)